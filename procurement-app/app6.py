@@ -1,23 +1,29 @@
 import streamlit as st
-import json
 import os
-import requests
+import json
 from datetime import datetime
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import socket
-from collections import defaultdict, Counter
-from ollama import Client
-import matplotlib.pyplot as plt
-import subprocess
-import sys
-# Install missing packages
-def install(package):
-    subprocess.check_call([sys.executable, "-m", "pip", "install", package])
-
-install("plotly==5.22.0")
-install("matplotlib==3.8.4")
+import threading
+# Scoring, storage and the question bank are the side-effect-free core package
+from procurement_core import instrumentation, recommendations, scoring
+from procurement_core.question_bank import get_catalogue
+from procurement_core.storage import get_storage
+from procurement_core.peer_benchmarks import get_peer_benchmarks
+from procurement_core.drafts import get_draft_store
+from procurement_core.instrumentation import span, timed
+from procurement_core.recommendations import holistic_prompt, role_actions_prompt, theme_prompt
+from llm_cache import cache_key, get_llm_cache
+from llm_client import get_ollama
+import generation
+from charts import MATURITY_LEVELS_CAPTION, gauge_chart_spec, radar_chart_spec
+# Streamlit internals behind st.plotly_chart (pinned streamlit==1.35.0), see show_chart_spec
+from streamlit.elements.form import current_form_id
+from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.runtime.state.common import compute_widget_id
+# Dependencies are verified once at deploy time with `python preflight.py`
+# (see preflight.py); the script itself never shells out to pip.
 
 # -----------------------------
 # Configuration
@@ -25,359 +31,67 @@ install("matplotlib==3.8.4")
 DATA_DIR = "procurement_data"
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# Response store (append-only JSONL log by default, see procurement_core/storage.py)
+STORAGE = get_storage(DATA_DIR)
+
+# Live score distributions across organisations (see procurement_core/peer_benchmarks.py)
+PEER_BENCHMARKS = get_peer_benchmarks(DATA_DIR)
+
+# Checkpoints of assessments in progress, so they survive lost sessions (see procurement_core/drafts.py)
+DRAFTS = get_draft_store(DATA_DIR)
+
+# Timing spans per stage and subsystem: JSON logs (PROCUREMENT_TIMING_LOG),
+# a Prometheus endpoint (PROCUREMENT_METRICS_PORT) and sampled cProfile
+# dumps (PROCUREMENT_PROFILE_RATE); see procurement_core/instrumentation.py
+instrumentation.configure_logging()
+instrumentation.start_metrics_server()
+
 # -----------------------------
 # Load Data
 # -----------------------------
-# Source-To-Pay Process Theme Data
-with open("Recommendations.json") as f:
-    RECOMMENDATIONS = json.load(f)
+# Questions, recommendations and benchmarks are loaded once per process by
+# question_bank; a rerun only pays for the (cached) catalogue lookup.
+CATALOGUE = get_catalogue()
 
-FOCUSED_AREAS = {
-    "Strategic Sourcing": [
-        {
-            "number": 1,
-            "question": "To what extent are preferred vendors documented and used in sourcing decisions?",
-            "responses": [
-                {"score": 5, "text": "Preferred vendors are maintained centrally, regularly updated, and integrated into sourcing strategy"},
-                {"score": 4, "text": "Preferred vendors are defined for key categories and referenced in sourcing events"},
-                {"score": 3, "text": "Some category-level vendor preferences exist, but usage is inconsistent"},
-                {"score": 2, "text": "Limited category planning, with ad-hoc supplier preference"},
-                {"score": 1, "text": "No defined preferred vendors used"}
-            ]
-        },
-        {
-            "number": 2,
-            "question": "How well-defined and consistently followed is your strategic sourcing process?",
-            "responses": [
-                {"score": 5, "text": "End-to-end strategic sourcing process is documented, digitized, and consistently followed"},
-                {"score": 4, "text": "Most sourcing events follow a structured and repeatable process"},
-                {"score": 3, "text": "Sourcing process is documented but applied selectively"},
-                {"score": 2, "text": "Ad-hoc sourcing with minimal process adherence"},
-                {"score": 1, "text": "No defined sourcing process or documentation"}
-            ]
-        },
-        {
-            "number": 3,
-            "question": "How comprehensive is your approach in evaluating suppliers during sourcing?",
-            "responses": [
-                {"score": 5, "text": "Supplier selection includes total cost of ownership, risk, sustainability, and performance history"},
-                {"score": 4, "text": "Evaluations include cost and quality, with limited use of additional criteria"},
-                {"score": 3, "text": "Evaluation focuses mainly on cost and delivery"},
-                {"score": 2, "text": "Evaluation is informal and varies by event"},
-                {"score": 1, "text": "No structured supplier evaluation"}
-            ]
-        },
-        {
-            "number": 4,
-            "question": "What tools or approaches are used to identify and engage new suppliers?",
-            "responses": [
-                {"score": 5, "text": "Dedicated tools or platforms (e.g., supplier discovery portals, AI scouting tools) used globally"},
-                {"score": 4, "text": "Category managers actively scout using databases or networks"},
-                {"score": 3, "text": "New supplier identification is done manually on a case-by-case basis"},
-                {"score": 2, "text": "Limited to existing supplier base with rare exploration"},
-                {"score": 1, "text": "No effort or process to identify new suppliers"}
-            ]
-        },
-        {
-            "number": 5,
-            "question": "How structured and efficient is your RFx (RFI/RFP/RFQ) process?",
-            "responses": [
-                {"score": 5, "text": "Fully automated and standardized RFx process with clear scoring and audit trail"},
-                {"score": 4, "text": "RFx templates and evaluation criteria are used consistently"},
-                {"score": 3, "text": "RFx processes are in place but vary by category or manager"},
-                {"score": 2, "text": "RFx events are run manually with limited structure"},
-                {"score": 1, "text": "No formal RFx process in place"}
-            ]
-        },
-        {
-            "number": 6,
-            "question": "How structured is your approach to preparing for and conducting negotiations with suppliers?",
-            "responses": [
-                {"score": 5, "text": "Highly Structured & Institutionalized"},
-                {"score": 4, "text": "Structured"},
-                {"score": 3, "text": "Moderately Structured"},
-                {"score": 2, "text": "Somewhat Unstructured"},
-                {"score": 1, "text": "Very Unstructured"}
-            ]
-        }
-    ],
-    "Procurement Process": [
-        {
-            "number": 1,
-            "question": "How standardized and compliant is your requisition process across the organization?",
-            "responses": [
-                {"score": 5, "text": "Fully standardized and automated requisition process across all units; high compliance monitored and enforced via tools"},
-                {"score": 4, "text": "Well-documented, consistently followed process with automated compliance validation in most areas"},
-                {"score": 3, "text": "Standardized requisition process exists in most departments; basic compliance checks are in place"},
-                {"score": 2, "text": "Some standard templates exist, but processes are loosely followed; compliance is ad hoc and not enforced"},
-                {"score": 1, "text": "Requisition processes are manual, inconsistent, and vary across departments; no compliance checks in place"}
-            ]
-        },
-        {
-            "number": 2,
-            "question": "How mature is your PO management in terms of accuracy, control, and compliance?",
-            "responses": [
-                {"score": 5, "text": "Advanced PO automation with full audit trails, real-time validation, and strong control mechanisms"},
-                {"score": 4, "text": "PO system is integrated with procurement tools, ensuring high accuracy and compliance tracking"},
-                {"score": 3, "text": "PO process is largely digitized with some accuracy and approval controls in place"},
-                {"score": 2, "text": "Basic PO system in place, but accuracy is inconsistent and control measures are minimal"},
-                {"score": 1, "text": "PO creation is mostly manual with frequent errors and lack of oversight or control"}
-            ]
-        },
-        {
-            "number": 3,
-            "question": "How effectively do you leverage technology in your procurement process?",
-            "responses": [
-                {"score": 5, "text": "Fully digitized and automated procurement using advanced tools (e-sourcing, AI, analytics)"},
-                {"score": 4, "text": "Good use of integrated tools (e.g., ERP, e-procurement platforms); moderate automation"},
-                {"score": 3, "text": "Use of basic procurement systems for POs or requisitions; partial process automation"},
-                {"score": 2, "text": "Limited use of technology (e.g., Excel, email); no integrated procurement platform"},
-                {"score": 1, "text": "Procurement is primarily manual with minimal use of digital tools or technology"}
-            ]
-        },
-        {
-            "number": 4,
-            "question": "How well-defined are your procurement governance and risk mitigation frameworks?",
-            "responses": [
-                {"score": 5, "text": "Robust governance structure with real-time risk monitoring and mitigation strategies embedded in processes"},
-                {"score": 4, "text": "Governance frameworks and risk registers are well-defined and regularly reviewed"},
-                {"score": 3, "text": "Some policies exist; basic risk assessments are conducted periodically"},
-                {"score": 2, "text": "Ad hoc risk handling; limited policies or governance documentation"},
-                {"score": 1, "text": "No formal governance or risk mitigation practices in procurement"}
-            ]
-        },
-        {
-            "number": 5,
-            "question": "How do you track and measure procurement performance?",
-            "responses": [
-                {"score": 5, "text": "Advanced analytics and dashboards provide real-time performance visibility; continuous improvement is data-driven"},
-                {"score": 4, "text": "Comprehensive KPIs regularly tracked and reported with insights for decision-making"},
-                {"score": 3, "text": "Basic KPIs (e.g., savings, supplier count) tracked; reports generated periodically"},
-                {"score": 2, "text": "Some metrics (e.g., spend) tracked manually; limited insight into performance"},
-                {"score": 1, "text": "No performance metrics tracked; lack of visibility into procurement outcome"}
-            ]
-        },
-        {
-            "number": 6,
-            "question": "How embedded are sustainability and ethical practices in your procurement process?",
-            "responses": [
-                {"score": 5, "text": "Sustainability and ethical sourcing are core procurement principles with enforced compliance and transparent tracking"},
-                {"score": 4, "text": "Formal sustainability policies in place; supplier assessments are conducted"},
-                {"score": 3, "text": "Basic sustainability/ethics criteria applied in some sourcing decisions"},
-                {"score": 2, "text": "Some awareness, but no formal practices or criteria in place"},
-                {"score": 1, "text": "No consideration of sustainability or ethics in procurement decisions"}
-            ]
-        }
-    ],
-    "Category Management": [
-        {
-            "number": 1,
-            "question": "How frequently do you perform spend analysis?",
-            "responses": [
-                {"score": 5, "text": "Real-time or monthly"},
-                {"score": 4, "text": "Quarterly"},
-                {"score": 3, "text": "Annually"},
-                {"score": 2, "text": "Ad-hoc or only when requested"},
-                {"score": 1, "text": "Rarely or not at all"}
-            ]
-        },
-        {
-            "number": 2,
-            "question": "How systematic is your spend analysis process?",
-            "responses": [
-                {"score": 5, "text": "Fully automated with dashboards and coverage across all categories"},
-                {"score": 4, "text": "Partially automated with good visibility and structured templates"},
-                {"score": 3, "text": "Mostly manual with basic categorization"},
-                {"score": 2, "text": "Inconsistent methods; depends on team/initiative"},
-                {"score": 1, "text": "No standardized process; lacks repeatability"}
-            ]
-        },
-        {
-            "number": 3,
-            "question": "To what extent are category strategies documented and action-oriented?",
-            "responses": [
-                {"score": 5, "text": "Documented for all categories with KPIs, reviews, and alignment to business strategy"},
-                {"score": 4, "text": "Documented for key categories with basic objectives"},
-                {"score": 3, "text": "Some informal strategies without measurable goals"},
-                {"score": 2, "text": "Very limited strategy documents; mostly reactive"},
-                {"score": 1, "text": "No documented category strategies"}
-            ]
-        },
-        {
-            "number": 4,
-            "question": "How are sourcing savings tracked and validated?",
-            "responses": [
-                {"score": 5, "text": "Centralized system with real-time tracking, finance-aligned validation, and reporting"},
-                {"score": 4, "text": "System-based tracking, with periodic finance review"},
-                {"score": 3, "text": "Spreadsheet-based tracking with irregular validation"},
-                {"score": 2, "text": "Only tracked during sourcing events"},
-                {"score": 1, "text": "No standard methodology or tracking"}
-            ]
-        },
-        {
-            "number": 5,
-            "question": "How do you monitor and manage supplier performance?",
-            "responses": [
-                {"score": 5, "text": "Formal process with KPIs, scorecards, reviews, and improvement plans"},
-                {"score": 4, "text": "KPIs tracked for key suppliers, but no formal reviews"},
-                {"score": 3, "text": "Informal evaluations without clear KPIs"},
-                {"score": 2, "text": "Evaluations based on issues/escalations only"},
-                {"score": 1, "text": "No structured supplier performance evaluation"}
-            ]
-        },
-        {
-            "number": 6,
-            "question": "How do you manage supplier and market risks?",
-            "responses": [
-                {"score": 5, "text": "Formal framework with real-time risk dashboards and proactive mitigation"},
-                {"score": 4, "text": "Risk register and monitoring in place, with periodic assessments"},
-                {"score": 3, "text": "Basic risk identification, reactive handling only"},
-                {"score": 2, "text": "Limited visibility into supplier risks"},
-                {"score": 1, "text": "No structured risk management"}
-            ]
-        }
-    ],
-    "Payment Process": [
-        {
-            "number": 1,
-            "question": "How efficient and automated is your invoice receipt and processing workflow?",
-            "responses": [
-                {"score": 5, "text": "Fully automated invoice capture, 3-way match, touchless processing"},
-                {"score": 4, "text": "Mostly system-based with minimal manual effort and 2/3-way match"},
-                {"score": 3, "text": "Mix of manual and digital steps; partial automation"},
-                {"score": 2, "text": "Mostly manual; email and spreadsheet-based tracking"},
-                {"score": 1, "text": "Entirely manual, paper-based invoice handling"}
-            ]
-        },
-        {
-            "number": 2,
-            "question": "What level of visibility do suppliers have into their invoice and payment status?",
-            "responses": [
-                {"score": 5, "text": "Supplier portal with real-time invoice/payment tracking and support tools"},
-                {"score": 4, "text": "Automated email updates and self-service options"},
-                {"score": 3, "text": "Basic visibility through AP responses or manual reports"},
-                {"score": 2, "text": "Suppliers must frequently follow up for updates"},
-                {"score": 1, "text": "No structured visibility or support mechanisms for suppliers"}
-            ]
-        },
-        {
-            "number": 3,
-            "question": "How are payments reviewed, approved, and controlled?",
-            "responses": [
-                {"score": 5, "text": "Fully digital, role-based approval workflows with audit trails"},
-                {"score": 4, "text": "Mostly digital approvals with some manual oversight"},
-                {"score": 3, "text": "Manual approvals supported by standard templates"},
-                {"score": 2, "text": "Ad-hoc approval methods; inconsistent documentation"},
-                {"score": 1, "text": "No formal approval process; payments made without structured review"}
-            ]
-        },
-        {
-            "number": 4,
-            "question": "How well does your organization ensure payments are made on time and accurately?",
-            "responses": [
-                {"score": 5, "text": "Payments are made on time >95% of the time, with automated scheduling"},
-                {"score": 4, "text": "Mostly on-time with minimal delays and errors"},
-                {"score": 3, "text": "Occasional delays or duplicate/incorrect payments"},
-                {"score": 2, "text": "Frequent issues in timing or mismatched amounts"},
-                {"score": 1, "text": "Regular payment delays, errors, and supplier escalations"}
-            ]
-        },
-        {
-            "number": 5,
-            "question": "How optimized and digitized are your payment methods?",
-            "responses": [
-                {"score": 5, "text": "Majority of payments via secure digital methods (ACH, virtual cards, etc.)"},
-                {"score": 4, "text": "High usage of ACH/digital methods; checks rarely used"},
-                {"score": 3, "text": "Balanced mix of digital and manual payment methods"},
-                {"score": 2, "text": "Predominantly check/wire based, with limited digital adoption"},
-                {"score": 1, "text": "Manual, paper-based payment handling only"}
-            ]
-        },
-        {
-            "number": 6,
-            "question": "What controls are in place to ensure compliance and prevent fraud in payments?",
-            "responses": [
-                {"score": 5, "text": "Proactive risk controls, segregation of duties, automated fraud detection"},
-                {"score": 4, "text": "Strong approval controls and periodic audits"},
-                {"score": 3, "text": "Basic compliance checks during processing"},
-                {"score": 2, "text": "Minimal compliance processes; relies on trust"},
-                {"score": 1, "text": "No formal compliance or anti-fraud mechanisms"}
-            ]
-        }
-    ]
-}
+# Source-To-Pay Process Theme Data
+RECOMMENDATIONS = CATALOGUE.recommendations
+FOCUSED_AREAS = CATALOGUE.focused_areas
 
 # Procurement Performance Theme Data
-with open("slas_kpis_questions_final.json") as f:
-    performance_questions = json.load(f)["questions"]
-
-with open("deepseek_json_20250720_551af9.json") as f:
-    deepseek_data = json.load(f)["questions"]
+performance_questions = CATALOGUE.performance_questions
+deepseek_data = CATALOGUE.deepseek_data
 
 # Industry Benchmarks
-INDUSTRY_STANDARDS = {
-    "Source-To-Pay Process": {
-        "Strategic Sourcing": 3.7,
-        "Procurement Process": 3.5,
-        "Category Management": 3.6,
-        "Payment Process": 3.8
-    },
-    "Procurement Performance": {
-        "Performance Review": 3,
-        "Savings Tracking": 4,
-        "Procurement KPIs": 3,
-        "Compliance KPIs": 4,
-        "Reporting": 5
-    }
-}
+INDUSTRY_STANDARDS = CATALOGUE.industry_standards
 
 # Theme benchmarks (for combined view)
-THEME_BENCHMARKS = {
-    "Source-To-Pay Process": 3.6,
-    "Procurement Performance": 3.8,
-    "Strategy and Vision": 3.5,
-    "People and Organization": 3.4,
-    "Technology and Enablers": 3.7
-}
+THEME_BENCHMARKS = CATALOGUE.theme_benchmarks
 
 # Source for Industry Standards
-INDUSTRY_STANDARD_SOURCES = [
-    "Deloitte Global Chief Procurement Officer Survey 2024",
-    "Kearney Procurement Study 2023",
-    "Gartner Magic Quadrant for Strategic Sourcing Suites 2023",
-    "IBM Institute for Business Value: The CPO Study 2023"
-]
+INDUSTRY_STANDARD_SOURCES = CATALOGUE.industry_standard_sources
 
 # Theme definitions
-THEMES = {
-    "Strategy and Vision": {
-        "status": "under_development",
-        "description": "Strategic planning, governance, and procurement alignment with business objectives"
-    },
-    "Technology and Enablers": {
-        "status": "under_development",
-        "description": "Digital tools, automation, and technology infrastructure supporting procurement"
-    },
-    "People and Organization": {
-        "status": "under_development",
-        "description": "Organizational structure, skills development, and talent management"
-    },
-    "Source-To-Pay Process": {
-        "status": "active",
-        "description": "End-to-end procurement process from sourcing to payment",
-        "focused_areas": FOCUSED_AREAS
-    },
-    "Procurement Performance": {
-        "status": "active",
-        "description": "Performance measurement, analytics, and continuous improvement",
-        "questions": performance_questions
-    }
-}
+THEMES = CATALOGUE.themes
 
 # -----------------------------
 # Ollama Connection
 # -----------------------------
-ollama_available = False
+# One pooled client per process; a background probe keeps `available` current
+# and a circuit breaker makes generations fail fast while the server is down
+client = get_ollama()
+ollama_available = client.available
+LLM_MODEL = recommendations.LLM_MODEL
+LLM_OPTIONS = recommendations.LLM_OPTIONS
+# Stream tokens into the results page as they are generated (LLM_STREAMING=0 to disable)
+LLM_STREAMING = os.environ.get("LLM_STREAMING", "1") != "0"
+
+# Combined assessments ask one focused area per form; COMBINED_LAYOUT=question
+# asks one question per page instead (two script runs per answer)
+COMBINED_LAYOUT = os.environ.get("COMBINED_LAYOUT", "section")
+
+# Generated recommendations are cached by (model, prompt, options) in memory
+# and on disk, so reruns and other users with the same scores reuse them
+LLM_CACHE = get_llm_cache(os.path.join(DATA_DIR, "llm_cache.db"))
 # -----------------------------
 # Utility Functions
 # -----------------------------
@@ -385,69 +99,21 @@ ollama_available = False
 # Add this function in the Utility Functions section
 def calculate_org_maturity(org_data, theme):
     """Calculate maturity for an organization for a specific theme"""
-    if not org_data or "users" not in org_data:
-        return None
-    
-    # Collect all responses for this theme
-    all_responses = []
-    for user in org_data["users"]:
-        if user.get("theme") == theme:
-            all_responses.extend(user["responses"])
-    
-    if not all_responses:
+    # Grouped, vectorised computation over all users' responses (procurement_core/scoring.py)
+    if theme not in ("Source-To-Pay Process", "Procurement Performance"):
         return None
-    
-    # For Source-To-Pay Process
-    if theme == "Source-To-Pay Process":
-        # Group by focused area
-        area_scores = defaultdict(list)
-        for resp in all_responses:
-            area_scores[resp["focused_area"]].append(resp["score"])
-        
-        # Calculate average per area
-        by_area = {}
-        for area, scores in area_scores.items():
-            by_area[area] = round(sum(scores) / len(scores), 1)
-        
-        # Overall is average of all responses
-        overall = round(sum(resp["score"] for resp in all_responses) / len(all_responses), 1)
-        
-        return {
-            "overall": overall,
-            "by_area": by_area
-        }
-    
-    # For Procurement Performance
-    elif theme == "Procurement Performance":
-        # Group by focus area
-        area_scores = defaultdict(list)
-        for resp in all_responses:
-            area_scores[resp["focus_area"]].append(resp["score"])
-        
-        by_area = {}
-        for area, scores in area_scores.items():
-            by_area[area] = round(sum(scores) / len(scores), 1)
-        
-        overall = round(sum(resp["score"] for resp in all_responses) / len(all_responses), 1)
-        
-        return {
-            "overall": overall,
-            "by_area": by_area
-        }
-    
-    return None
-
-def save_response(user_data):
-    """Save user response to organization-specific JSON file"""
-    org_name = user_data["organization"].replace(" ", "_").replace("/", "-")
-    org_file = os.path.join(DATA_DIR, f"{org_name}.json")
+    return scoring.org_maturity(org_data, theme)
 
-    if os.path.exists(org_file):
-        with open(org_file, "r") as f:
-            data = json.load(f)
-    else:
-        data = {"organization": user_data["organization"], "users": []}
+@timed("org_maturity")
+def get_org_maturity(org_data, theme):
+    """Organization maturity for a theme, read from the store's running aggregates when available"""
+    if STORAGE.supports_aggregates and org_data:
+        return STORAGE.org_maturity(org_data["organization"], theme)
+    return calculate_org_maturity(org_data, theme)
 
+@timed("save_response")
+def save_response(user_data):
+    """Save user response to the organization's response store"""
     # Create a complete user record
     user_record = {
         "name": user_data["name"],
@@ -462,30 +128,91 @@ def save_response(user_data):
     if "user_info" in user_data:
         user_record["user_info"] = user_data["user_info"]
     
-    # Remove existing response from same user if exists
-    data["users"] = [user for user in data["users"] if user["email"] != user_data["email"]]
-    data["users"].append(user_record)  # Append the complete user record
+    # Upsert by email: replaces any existing response from the same user
+    STORAGE.save_user(user_data["organization"], user_record)
+
+    # Move the organisation's scores in the peer distributions; the response
+    # is already saved, and `python rebuild_benchmarks.py` repairs a miss
+    try:
+        with span("peer_benchmarks"):
+            PEER_BENCHMARKS.refresh_org(STORAGE, user_data["organization"])
+    except Exception as e:
+        st.warning(f"Peer benchmarks could not be updated: {str(e)}")
+
+    # The submitted assessment no longer needs its draft
+    checkpoint(DRAFTS.discard)
+
+def draft_state():
+    """Session fields a draft restores besides its answers"""
+    return {
+        "stage": st.session_state.stage,
+        "selected_themes": st.session_state.selected_themes,
+        "combined_mode": st.session_state.combined_mode,
+        "selected_focused_areas": st.session_state.selected_focused_areas
+    }
 
-    with open(org_file, "w") as f:
-        json.dump(data, f, indent=2)
+def checkpoint(write, *args):
+    """Apply a draft write for the current user; a failure only warns"""
+    user_info = st.session_state.get("user_info")
+    if not user_info:
+        return
+    try:
+        write(user_info["organization"], user_info["email"], *args)
+    except Exception as e:
+        st.warning(f"Your progress could not be saved: {str(e)}")
+
+def resume_draft(draft):
+    """Restore an assessment in progress from its draft"""
+    state = draft.state
+    st.session_state.selected_themes = state["selected_themes"]
+    st.session_state.combined_mode = state["combined_mode"]
+    st.session_state.selected_focused_areas = state["selected_focused_areas"]
+    # Questions are answered in order, so the answers give the current question
+    if state["combined_mode"]:
+        st.session_state.combined_responses = [answer for _, answer in draft.answers]
+        st.session_state.current_question_index = len(draft.answers)
+    else:
+        st.session_state.performance_responses = dict(draft.answers)
+        st.session_state.performance_current_question = len(draft.answers)
+    st.session_state.stage = state["stage"]
 
+def record_combined_answers(section, start, selected):
+    """Record answers to a section's questions from assessment index `start` on"""
+    responses = [{
+        "theme": section.theme,
+        "focused_area": section.area,
+        "question": question.text,
+        "selected_text": text,
+        "score": question.scores[text]
+    } for question, text in zip(section.questions[start - section.start:], selected)]
+    st.session_state.combined_responses = st.session_state.combined_responses[:start] + responses
+    st.session_state.current_question_index = start + len(responses)
+    checkpoint(DRAFTS.put_answers, start,
+               [(str(start + offset), response) for offset, response in enumerate(responses)])
+
+def submit_combined_section(section):
+    """Form callback: record a combined-assessment section's answers before the script reruns"""
+    selected = [st.session_state.get(f"combined_q{section.start + offset}") for offset in range(len(section.questions))]
+    st.session_state.section_incomplete = None in selected
+    if not st.session_state.section_incomplete:
+        record_combined_answers(section, section.start, selected)
+
+def peer_rank_text(theme, area, score):
+    """One-line peer comparison for a score, or None without enough organisations"""
+    peer = PEER_BENCHMARKS.rank(theme, area, score)
+    if peer is None:
+        return None
+    return (f"percentile {peer.percentile:.0f} of {peer.organizations} organizations "
+            f"(peer median {peer.median:.1f}, middle half {peer.p25:.1f}-{peer.p75:.1f})")
+
+@timed("org_data")
 def get_org_data(org_name):
     """Retrieve all user responses for an organization"""
-    org_name_clean = org_name.replace(" ", "_").replace("/", "-")
-    org_file = os.path.join(DATA_DIR, f"{org_name_clean}.json")
-    
-    if os.path.exists(org_file):
-        with open(org_file, "r") as f:
-            return json.load(f)
-    return None
+    return STORAGE.get_org_data(org_name)
 
 def calculate_theme_score(responses, theme):
     """Calculate average score for a specific theme"""
-    theme_responses = [r for r in responses if r["theme"] == theme]
-    if not theme_responses:
-        return 0.0
-    total_score = sum(response["score"] for response in theme_responses)
-    return round(total_score / len(theme_responses), 1)
+    return scoring.theme_scores(responses, [theme]).get(theme, 0.0)
 
 def get_industry_benchmarks(theme):
     """Get industry benchmarks for a specific theme"""
@@ -502,21 +229,41 @@ def get_recommendations(theme, score):
     else:
         return "Focus on strategic alignment and digital transformation initiatives"
 
-def get_maturity_label(level):
-    """Get text label for maturity level for the gauge chart."""
-    if 0 <= level < 1: return "Latent"
-    elif 1 <= level < 2: return "Discovery"
-    elif 2 <= level < 3: return "Reactive"
-    elif 3 <= level < 4: return "Proactive"
-    elif 4 <= level <= 5: return "Strategic Value"
-    else: return "Unknown"
-
 def get_participants_count(org_data):
     """Get number of participants in an organization"""
     if not org_data or not org_data.get("users"):
         return 0
     return len(org_data["users"])
 
+def show_chart_spec(spec):
+    """Full-width Plotly chart from an already-serialised figure (charts.py memoises the specs).
+
+    st.plotly_chart rebuilds, validates and serialises a Figure on every
+    rerun; this enqueues the same PlotlyChart element it would, from the
+    cached JSON.
+    """
+    proto = PlotlyChartProto()
+    proto.use_container_width = True
+    proto.theme = "streamlit"
+    proto.form_id = current_form_id(st._main)
+    proto.spec = spec
+    proto.config = json.dumps({"showLink": False, "linkText": False})
+    ctx = get_script_run_ctx()
+    proto.id = compute_widget_id(
+        "plotly_chart",
+        user_key=None,
+        key=None,
+        plotly_spec=proto.spec,
+        plotly_config=proto.config,
+        selection_mode=("points", "box", "lasso"),
+        is_selection_activated=False,
+        theme="streamlit",
+        form_id=proto.form_id,
+        use_container_width=True,
+        page=ctx.page_script_hash if ctx else None,
+    )
+    st._main._enqueue("plotly_chart", proto)
+
 def show_theme_tiles():
     """Display theme selection tiles"""
     st.header(":notebook: Select Procurement Themes to Assess")
@@ -544,173 +291,141 @@ def show_theme_tiles():
                 st.session_state.selected_themes[theme] = False
 
 # --- AI Functions ---
-def generate_ai_recommendations(prompt, context=""):
-    """Generate AI recommendations using Ollama"""
-    try:
-        # Create the full prompt with context
-        full_prompt = f"{context}\n\n{prompt}"
-        
-        # Generate response using the correct model name
+AI_UNAVAILABLE_MESSAGE = "AI recommendations are currently unavailable. Please check your Ollama installation and server status."
+
+def request_ai_recommendations(prompt, context=""):
+    """Generate AI recommendations using Ollama, raising on failure (safe to call from worker threads)"""
+    # Create the full prompt with context
+    full_prompt = recommendations.full_prompt(prompt, context)
+    
+    cached = LLM_CACHE.get(LLM_MODEL, full_prompt, LLM_OPTIONS)
+    if cached is not None:
+        return cached
+    
+    # Generate response using the correct model name
+    with span("llm_call", mode="request"):
         response = client.generate(
-            model="llama3.2:latest",
+            model=LLM_MODEL,
             prompt=full_prompt,
-            options={"temperature": 0.6}
+            options=LLM_OPTIONS
         )
-        return response['response'].strip()
+    text = response['response'].strip()
+    LLM_CACHE.put(LLM_MODEL, full_prompt, text, LLM_OPTIONS)
+    return text
+
+def stream_ai_recommendations(prompt, context="", cancel=None):
+    """Yield AI recommendation text as Ollama produces it (safe to call from worker threads)"""
+    full_prompt = recommendations.full_prompt(prompt, context)
+    
+    cached = LLM_CACHE.get(LLM_MODEL, full_prompt, LLM_OPTIONS)
+    if cached is not None:
+        yield cached
+        return
+    
+    parts = []
+    done = False
+    stream = client.generate(
+        model=LLM_MODEL,
+        prompt=full_prompt,
+        options=LLM_OPTIONS,
+        stream=True,
+        cancel=cancel
+    )
+    try:
+        # Spans the whole stream, including time the consumer spends between tokens
+        with span("llm_call", mode="stream"):
+            for chunk in stream:
+                if cancel is not None and cancel.is_set():
+                    return
+                parts.append(chunk['response'])
+                done = chunk.get('done', False)
+                yield chunk['response']
+    finally:
+        # Closing the stream drops the connection, so the server stops generating
+        if hasattr(stream, "close"):
+            stream.close()
+    # Only a stream that reached Ollama's final chunk is a whole answer;
+    # a cancelled or cut-off one must not be served to later requests
+    if done and not (cancel is not None and cancel.is_set()):
+        LLM_CACHE.put(LLM_MODEL, full_prompt, "".join(parts).strip(), LLM_OPTIONS)
+
+def generate_ai_recommendations(prompt, context=""):
+    """Generate AI recommendations using Ollama"""
+    try:
+        return request_ai_recommendations(prompt, context)
     except Exception as e:
         st.error(f"AI recommendation generation failed: {str(e)}")
-        return f"AI recommendations are currently unavailable. Please check your Ollama installation and server status."
+        return AI_UNAVAILABLE_MESSAGE
 
 def generate_holistic_recommendations(overall_score, maturity_gap):
     """Generate holistic organization-level recommendations"""
-    prompt = f"""
-    As a procurement consultant, provide holistic recommendations for an organization 
-    with overall procurement maturity at {overall_score}/5.0. 
-    
-    The organization is {abs(maturity_gap):.1f} points below industry standard.
-    Focus on strategic priorities that would have the most significant impact on 
-    improving overall procurement maturity. Include both short-term quick wins and 
-    long-term transformation initiatives.
-    """
-    return generate_ai_recommendations(prompt)
+    return generate_ai_recommendations(holistic_prompt(overall_score, maturity_gap))
 
 def generate_role_specific_actions(designations, maturity_gap):
     """Generate role-specific action items"""
-    prompt = f"""
-    Generate specific action items for different roles in procurement to improve 
-    procurement maturity. Current maturity gap: {maturity_gap:.1f} below industry standard.
-    
-    Roles: {', '.join(designations)}
-    
-    For each role, provide 2-3 concrete, executable action items that align with 
-    their responsibilities and will contribute to improving overall procurement maturity.
-    """
-    return generate_ai_recommendations(prompt)
+    return generate_ai_recommendations(role_actions_prompt(designations, maturity_gap))
 
 def generate_theme_recommendation(theme, score, benchmark):
     """Generate theme-level recommendations"""
-    prompt = f"""
-    As a procurement consultant, provide recommendations for improving the {theme} capability.
-    The organization's current maturity level is {score}/5.0 (industry benchmark: {benchmark}/5.0).
-    Focus on strategic priorities that would have the most significant impact.
-    Provide 2-3 actionable recommendations.
-    """
-    return generate_ai_recommendations(prompt)
+    return generate_ai_recommendations(theme_prompt(theme, score, benchmark))
 
-# --- Plotly Chart Functions ---
-def create_gauge_chart(value, title, max_value=5.0):
-    """Creates a Plotly Gauge Chart for overall maturity."""
-    # Define ranges and colors
-    ranges = {
-        "Latent": [0, 1],
-        "Discovery": [1, 2],
-        "Reactive": [2, 3],
-        "Proactive": [3, 4],
-        "Strategic Value": [4, 5]
-    }
-    colors = {
-        "Latent": "#FF4B4B",       # Red
-        "Discovery": "#FFA500",    # Orange
-        "Reactive": "#FFD700",     # Gold
-        "Proactive": "#90EE90",    # Light Green
-        "Strategic Value": "#20B2AA" # Light Sea Green
-    }
-    
-    # Determine current stage and color
-    current_stage = get_maturity_label(value)
-    current_color = colors.get(current_stage, "#CCCCCC") # Default to grey if not found
-
-    fig = go.Figure(go.Indicator(
-        mode = "gauge+number+delta",
-        value = value,
-        domain = {'x': [0, 1], 'y': [0, 1]},
-        title = {'text': f"<span style='font-size:1.2em'>{title}</span><br><span style='font-size:0.9em;color:gray'>{current_stage}</span>"},
-        delta = {'reference': max_value / 2, 'decreasing': {'color': 'red'}, 'increasing': {'color': 'green'}},
-        gauge = {
-            'axis': {'range': [None, max_value], 'tickwidth': 1, 'tickcolor': "darkblue"},
-            'bar': {'color': current_color},
-            'bgcolor': "white",
-            'borderwidth': 2,
-            'bordercolor': "gray",
-            'steps': [
-                {'range': ranges["Latent"], 'color': colors["Latent"], 'name': 'Latent'},
-                {'range': ranges["Discovery"], 'color': colors["Discovery"], 'name': 'Discovery'},
-                {'range': ranges["Reactive"], 'color': colors["Reactive"], 'name': 'Reactive'},
-                {'range': ranges["Proactive"], 'color': colors["Proactive"], 'name': 'Proactive'},
-                {'range': ranges["Strategic Value"], 'color': colors["Strategic Value"], 'name': 'Strategic Value'}
-            ],
-            'threshold': {
-                'line': {'color': "red", 'width': 4},
-                'thickness': 0.75,
-                'value': value
-            }}
-    ))
-
-    fig.update_layout(height=250, margin=dict(l=10, r=10, t=50, b=10))
-    return fig
+# Queue order when the model is busy: holistic first, then roles, then per theme / area
+AI_SECTION_PRIORITIES = {"holistic": generation.PRIORITY_HOLISTIC, "roles": generation.PRIORITY_ROLES}
 
-def create_radar_chart(theme_scores, theme_benchmarks):
-    """Creates a Plotly Radar Chart for theme-wise comparison."""
-    themes = list(theme_scores.keys())
-    
-    # Add the first point again to close the loop in the radar chart
-    r_org = [theme_scores[theme] for theme in themes] + [theme_scores[themes[0]]]
-    r_industry = [theme_benchmarks.get(theme, 0) for theme in themes] + [theme_benchmarks.get(themes[0], 0)]
-    theta_labels = themes + [themes[0]] # Labels for theta axis
+def ai_job(fn, key, prompt):
+    """Queue job for a section; identical prompts from any session share one generation"""
+    return (fn, (prompt,), {
+        "model": LLM_MODEL,
+        "priority": AI_SECTION_PRIORITIES.get(key, generation.PRIORITY_AREA),
+        "flight_key": cache_key(LLM_MODEL, prompt, LLM_OPTIONS)
+    })
 
-    fig = go.Figure()
+def add_ai_section(ai_sections, key, prompt, waiting_message, heading=None, pack=None, theme=None):
+    """Reserve a placeholder for a generation that will run concurrently with the others"""
+    slot = st.empty()
+    # Precomputed recommendation packs (build_packs.py) already hold the text
+    text = recommendations.section_text(pack, theme, key, prompt, LLM_MODEL, LLM_OPTIONS)
+    if text is not None:
+        show_ai_result(slot, heading, text)
+        return
+    slot.info(f":hourglass_flowing_sand: {waiting_message}")
+    ai_sections[key] = (prompt, slot, heading)
 
-    fig.add_trace(go.Scatterpolar(
-          r=r_org,
-          theta=theta_labels,
-          fill='toself',
-          name='Your Organization',
-          line_color='blue',
-          opacity=0.7,
-          hoverinfo='text+name+r',
-          mode='lines+markers'
-    ))
-    fig.add_trace(go.Scatterpolar(
-          r=r_industry,
-          theta=theta_labels,
-          fill='toself',
-          name='Industry Standard',
-          line_color='orange',
-          opacity=0.4,
-          hoverinfo='text+name+r',
-          mode='lines+markers'
-    ))
+def show_ai_result(slot, heading, text, error=None, streaming=False):
+    """Render a (possibly partial) generation into its placeholder"""
+    with slot.container():
+        if error is not None:
+            st.error(f"AI recommendation generation failed: {str(error)}")
+            st.markdown(AI_UNAVAILABLE_MESSAGE)
+        elif text and text.strip():
+            if heading:
+                st.markdown(heading)
+            st.markdown(text + " ▌" if streaming else text.strip())
 
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 5],
-                tickvals=[0, 1, 2, 3, 4, 5],
-                ticktext=['0', '1', '2', '3', '4', '5']  # Simplified labels
-            )),
-        showlegend=True,
-        title="Maturity Comparison by Theme",
-        height=550,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.2,
-            xanchor="center",
-            x=0.5
-        )
-    )
+def render_ai_sections(ai_sections):
+    """Run all reserved generations concurrently, filling each placeholder as it finishes"""
+    if not ai_sections:
+        return
     
-    # Add maturity level explanation below the chart
-    st.caption("""
-    **Maturity Levels:**  
-    • 1-2: Latent (Initial/Ad-hoc)  
-    • 2-3: Discovery (Developing)  
-    • 3-4: Reactive (Defined)  
-    • 4-5: Proactive (Managed/Optimized)
-    """)
+    if not LLM_STREAMING:
+        jobs = {key: ai_job(request_ai_recommendations, key, prompt) for key, (prompt, _, _) in ai_sections.items()}
+        for key, text, error in generation.run_concurrently(jobs):
+            _, slot, heading = ai_sections[key]
+            show_ai_result(slot, heading, text, error)
+        return
     
-    return fig
+    # Tokens are written into the page as they arrive. If the user leaves the
+    # results stage, Streamlit abandons this loop and the generations are told
+    # to stop (see also the check at the top of main()).
+    cancel = threading.Event()
+    st.session_state.ai_cancel = cancel
+    jobs = {key: ai_job(stream_ai_recommendations, key, prompt) for key, (prompt, _, _) in ai_sections.items()}
+    try:
+        for key, text, finished, error in generation.stream_concurrently(jobs, cancel=cancel):
+            _, slot, heading = ai_sections[key]
+            show_ai_result(slot, heading, text, error, streaming=not finished)
+    finally:
+        cancel.set()
 
 # Main app
 def main():
@@ -732,6 +447,10 @@ def main():
         st.session_state.combined_mode = False
         st.session_state.theme_scores = {}
 
+    # Stop AI generations still streaming for a results page the user has left
+    if st.session_state.stage != "results" and st.session_state.get("ai_cancel") is not None:
+        st.session_state.ai_cancel.set()
+
     # User information stage
     if st.session_state.stage == "user_info":
         with st.form("user_info_form"):
@@ -752,11 +471,34 @@ def main():
                         "designation": designation,
                         "organization": organization
                     }
-                    st.session_state.stage = "theme_selection"
+                    # Offer to pick up an unfinished assessment
+                    st.session_state.pending_draft = DRAFTS.load(organization, email)
+                    st.session_state.stage = "resume" if st.session_state.pending_draft else "theme_selection"
                     st.rerun()
                 else:
                     st.warning("Please fill all required fields (Name, Email, Organization)")
 
+    # Resume stage: an unfinished assessment was found for this user
+    elif st.session_state.stage == "resume":
+        draft = st.session_state.pending_draft
+        themes = [theme for theme, selected in draft.state["selected_themes"].items() if selected]
+        saved = datetime.fromtimestamp(draft.updated).strftime("%Y-%m-%d %H:%M")
+        st.header(":floppy_disk: Resume Your Assessment")
+        st.info(f"You have an unfinished assessment of **{', '.join(themes)}** saved on {saved} "
+                f"with {len(draft.answers)} answered question(s).")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Resume Assessment", type="primary", use_container_width=True):
+                resume_draft(draft)
+                st.session_state.pending_draft = None
+                st.rerun()
+        with col2:
+            if st.button("Start Over", use_container_width=True):
+                checkpoint(DRAFTS.discard)
+                st.session_state.pending_draft = None
+                st.session_state.stage = "theme_selection"
+                st.rerun()
+
     # Theme selection stage
     elif st.session_state.stage == "theme_selection":
         st.header(":clipboard: Assessment Themes")
@@ -776,11 +518,11 @@ def main():
                 # For Source-To-Pay Process, we need focused area selection
                 if "Source-To-Pay Process" in selected_themes and not st.session_state.combined_mode:
                     st.session_state.stage = "focused_area_selection"
-                    st.rerun()
                 else:
                     # Start assessment
                     st.session_state.stage = "assessment"
-                    st.rerun()
+                checkpoint(DRAFTS.start, draft_state())
+                st.rerun()
 
     # Focused area selection stage (only for Source-To-Pay Process in single mode)
     elif st.session_state.stage == "focused_area_selection":
@@ -805,6 +547,7 @@ def main():
             if st.form_submit_button("Continue to Assessment"):
                 if len(st.session_state.selected_focused_areas) > 0:
                     st.session_state.stage = "assessment"
+                    checkpoint(DRAFTS.update, draft_state())
                     st.rerun()
                 else:
                     st.warning("Please select at least one focused area to assess")
@@ -816,94 +559,58 @@ def main():
         # Combined mode assessment
         if st.session_state.combined_mode:
             st.header(":clipboard: Combined Assessment")
-            st.info("You are assessing multiple themes. Please answer questions for all selected themes.")
+            st.info("You are assessing multiple themes. Please answer the questions of each focused area and continue to the next.")
             
-            # Get all questions for all themes
-            all_questions = []
-            
-            # Add Source-To-Pay Process questions
-            if "Source-To-Pay Process" in selected_themes:
-                theme_data = THEMES["Source-To-Pay Process"]
-                for focused_area in theme_data["focused_areas"]:
-                    for question in theme_data["focused_areas"][focused_area]:
-                        all_questions.append({
-                            "theme": "Source-To-Pay Process",
-                            "focused_area": focused_area,
-                            "question": question,
-                            "type": "stp"
-                        })
-            
-            # Add Procurement Performance questions
-            if "Procurement Performance" in selected_themes:
-                theme_data = THEMES["Procurement Performance"]
-                for qid, q in theme_data["questions"].items():
-                    all_questions.append({
-                        "theme": "Procurement Performance",
-                        "focused_area": q["focus_area"],
-                        "question": q,
-                        "type": "perf",
-                        "qid": qid
-                    })
+            # Precomputed focused-area sections of the selected themes (see question_bank)
+            sections = CATALOGUE.assessment_sections(selected_themes)
             
             # Initialize question index
             if "current_question_index" not in st.session_state:
                 st.session_state.current_question_index = 0
                 st.session_state.combined_responses = []
             
-            # Show current question
-            if st.session_state.current_question_index < len(all_questions):
-                q_data = all_questions[st.session_state.current_question_index]
-                q = q_data["question"]
-                
-                st.subheader(f"{q_data['theme']} - {q_data['focused_area']}")
-                st.markdown(f"**{q['question'] if 'question' in q else q['question']}**")
+            # Show the section holding the next unanswered question, as one form:
+            # answering it costs a single rerun instead of two per question
+            answered = st.session_state.current_question_index
+            section = next((s for s in sections if answered < s.start + len(s.questions)), None)
+            if section is not None and COMBINED_LAYOUT == "question":
+                total = sections[-1].start + len(sections[-1].questions)
+                st.progress(answered / total, text=f"Question {answered + 1} of {total}")
+                question = section.questions[answered - section.start]
                 
-                if q_data["type"] == "stp":
-                    options = [resp["text"] for resp in q["responses"]]
-                    scores = [resp["score"] for resp in q["responses"]]
-                    option_score_map = {text: score for text, score in zip(options, scores)}
-                    
-                    selected = st.radio(
-                        label="Select your response:",
-                        options=options,
-                        index=None,
-                        key=f"combined_q{st.session_state.current_question_index}",
-                        label_visibility="collapsed"
-                    )
-                    
-                    if selected:
-                        score = option_score_map[selected]
-                        st.session_state.combined_responses.append({
-                            "theme": q_data["theme"],
-                            "focused_area": q_data["focused_area"],
-                            "question": q["question"],
-                            "selected_text": selected,
-                            "score": score
-                        })
-                        st.session_state.current_question_index += 1
-                        st.rerun()
+                st.subheader(f"{section.theme} - {section.area}")
+                st.markdown(f"**{question.text}**")
+                selected = st.radio(
+                    label="Select your response:",
+                    options=question.labels,
+                    index=None,
+                    key=f"combined_q{answered}",
+                    label_visibility="collapsed"
+                )
+                if selected:
+                    record_combined_answers(section, answered, [selected])
+                    st.rerun()
+            
+            elif section is not None:
+                total = sections[-1].start + len(sections[-1].questions)
+                st.progress(section.start / total, text=f"Section {sections.index(section) + 1} of {len(sections)}")
                 
-                else:  # perf
-                    options = q["options"]
-                    selected = st.radio(
-                        label="Select your response:",
-                        options=options,
-                        index=None,
-                        key=f"combined_q{st.session_state.current_question_index}",
-                        label_visibility="collapsed"
-                    )
+                with st.form(f"combined_section_{section.start}"):
+                    st.subheader(f"{section.theme} - {section.area}")
+                    for offset, question in enumerate(section.questions):
+                        st.markdown(f"**{question.text}**")
+                        st.radio(
+                            label="Select your response:",
+                            options=question.labels,
+                            index=None,
+                            key=f"combined_q{section.start + offset}",
+                            label_visibility="collapsed"
+                        )
                     
-                    if selected:
-                        score = options.index(selected) + 1
-                        st.session_state.combined_responses.append({
-                            "theme": q_data["theme"],
-                            "focused_area": q_data["focused_area"],
-                            "question": q["question"],
-                            "selected_text": selected,
-                            "score": score
-                        })
-                        st.session_state.current_question_index += 1
-                        st.rerun()
+                    st.form_submit_button("Submit Assessment" if section is sections[-1] else "Next Section",
+                                          type="primary", on_click=submit_combined_section, args=(section,))
+                if st.session_state.get("section_incomplete"):
+                    st.warning("Please answer all questions in this section before continuing.")
             
             else:  # All questions answered
                 # Save responses
@@ -925,12 +632,7 @@ def main():
                 st.session_state.org_data = org_data_all_users
                 
                 # Calculate theme scores
-                theme_scores = {}
-                for theme in selected_themes:
-                    theme_responses = [r for r in st.session_state.combined_responses if r["theme"] == theme]
-                    if theme_responses:
-                        theme_score = sum(r["score"] for r in theme_responses) / len(theme_responses)
-                        theme_scores[theme] = round(theme_score, 1)
+                theme_scores = scoring.theme_scores(st.session_state.combined_responses, selected_themes)
                 
                 st.session_state.theme_scores = theme_scores
                 st.session_state.stage = "confirmation"
@@ -1006,7 +708,7 @@ def main():
                                 st.session_state.org_data = org_data_all_users
 
                                 # Calculate organizational maturity for this theme
-                                org_maturity = calculate_org_maturity(org_data_all_users, theme)
+                                org_maturity = get_org_maturity(org_data_all_users, theme)
                                 st.session_state.org_maturity = org_maturity
                                 
                                 st.session_state.stage = "confirmation"
@@ -1039,6 +741,8 @@ def main():
                             "score": score,
                             "focus_area": q["focus_area"]
                         }
+                        checkpoint(DRAFTS.put_answer, st.session_state.performance_current_question, qid,
+                                   st.session_state.performance_responses[qid])
                         st.session_state.performance_current_question += 1
                         st.rerun()
                 else:
@@ -1059,7 +763,7 @@ def main():
                     st.session_state.org_data = org_data_all_users
 
                     # Calculate organizational maturity for this theme
-                    org_maturity = calculate_org_maturity(org_data_all_users, theme)
+                    org_maturity = get_org_maturity(org_data_all_users, theme)
                     st.session_state.org_maturity = org_maturity
                     
                     st.session_state.stage = "confirmation"
@@ -1114,6 +818,10 @@ def main():
         org_data = st.session_state.org_data
         
         st.header(f":trophy: Assessment Results")
+        
+        # AI sections reserve a placeholder while the page is laid out and are
+        # generated concurrently once everything else has been rendered
+        ai_sections = {}
                 
         # Combined mode results
         if st.session_state.combined_mode:
@@ -1128,7 +836,7 @@ def main():
             overall_industry_avg = round(np.mean(list(industry_benchmarks.values())), 1)
             
             # Display overall gauge chart
-            st.plotly_chart(create_gauge_chart(overall_maturity, "Organization's Overall Maturity"), use_container_width=True)
+            show_chart_spec(gauge_chart_spec(overall_maturity, "Organization's Overall Maturity"))
             
             st.divider()
             st.subheader(":office: Organization Benchmarking")
@@ -1144,7 +852,8 @@ def main():
                 st.markdown(f"- {source}")
             
             # Display the radar chart
-            st.plotly_chart(create_radar_chart(theme_scores, industry_benchmarks), use_container_width=True)
+            st.caption(MATURITY_LEVELS_CAPTION)
+            show_chart_spec(radar_chart_spec(theme_scores, industry_benchmarks))
             
             # NEW: Holistic recommendations section
             st.divider()
@@ -1154,53 +863,25 @@ def main():
             maturity_gap = overall_maturity - overall_industry_avg
             
             # Generate holistic recommendations
-            with st.spinner("Generating strategic recommendations..."):
-                holistic_rec = generate_holistic_recommendations(
-                    overall_maturity,
-                    maturity_gap
-                )
-                st.markdown(holistic_rec)
+            add_ai_section(ai_sections, "holistic", holistic_prompt(overall_maturity, maturity_gap),
+                           "Generating strategic recommendations...")
             
             # NEW: Role-specific action items
             st.subheader(":busts_in_silhouette: Role-Specific Action Items")
             
             # Get unique designations from ALL organization users
-            designations = set()
-            if st.session_state.org_data and "users" in st.session_state.org_data:
-                for user in st.session_state.org_data["users"]:
-                     # Check multiple possible locations for designation
-                     designation = ""
-                     
-                     # Check direct field
-                     if user.get("designation"):
-                         designation = user["designation"]
-
-                     # Check user_info dictionary   
-                     elif user.get("user_info") and user["user_info"].get("designation"):
-                         designation = user["user_info"]["designation"]
-
-                     # Check top-level fields
-                     elif "designation" in user:
-                        designation = user["designation"]
-
-                     # Clean and add if valid
-                     if designation and designation.strip():
-                        designations.add(designation.strip().title())           
+            designations = recommendations.org_designations(st.session_state.org_data)
             if designations:
-                with st.spinner("Generating role-specific actions..."):
-                    # Calculate gap magnitude
-                    gap_magnitude = abs(maturity_gap) if maturity_gap < 0 else 0.5
-                    
-                    # Generate role-specific actions
-                    role_actions = generate_role_specific_actions(
-                        list(designations),
-                        gap_magnitude
-                    )
-                    st.markdown(role_actions)
-                    # Add expandable section with raw designation data
-                    with st.expander("View participant roles"):
-                         st.write(f"**{len(designations)} unique roles identified:**")
-                         st.write(", ".join(sorted(designations)))
+                # Calculate gap magnitude
+                gap_magnitude = recommendations.role_gap(maturity_gap)
+                
+                # Generate role-specific actions
+                add_ai_section(ai_sections, "roles", role_actions_prompt(list(designations), gap_magnitude),
+                               "Generating role-specific actions...")
+                # Add expandable section with raw designation data
+                with st.expander("View participant roles"):
+                     st.write(f"**{len(designations)} unique roles identified:**")
+                     st.write(", ".join(sorted(designations)))
             else:
                 st.info("No role information available for action item generation. Designations weren't collected from participants.")
             
@@ -1218,13 +899,9 @@ def main():
                     
                     # Generate AI-complemented recommendations
                     if ollama_available:
-                        with st.spinner(f"Generating complementary recommendations for {theme}..."):
-                            ai_recommendation = generate_theme_recommendation(
-                                theme, score, industry_benchmark
-                            )
-                            if ai_recommendation:
-                                st.markdown("**AI-Enhanced Suggestions:**")
-                                st.markdown(ai_recommendation)
+                        add_ai_section(ai_sections, ("theme", theme), theme_prompt(theme, score, industry_benchmark),
+                                       f"Generating complementary recommendations for {theme}...",
+                                       heading="**AI-Enhanced Suggestions:**")
                     else:
                         st.info("Connect Ollama for AI-powered recommendations.")
         
@@ -1241,19 +918,24 @@ def main():
             
             # --- Only show organization-level results ---
             if org_maturity:
+                # Offline-built recommendations for this organisation, if any
+                pack = recommendations.load_pack(DATA_DIR, user_data["organization"])
                 st.markdown(f"**Organization:** {user_data['organization']}")
                 
                 # Display the gauge chart for the ORGANIZATION'S overall maturity
                 overall_maturity = org_maturity['overall']
-                st.plotly_chart(create_gauge_chart(overall_maturity, "Organization's Overall Maturity"), use_container_width=True)
+                show_chart_spec(gauge_chart_spec(overall_maturity, "Organization's Overall Maturity"))
                 
                 st.divider()
                 st.subheader(":office: Organization Benchmarking")
                 
                 # Overall comparison
-                overall_industry_avg = np.mean(list(industry_benchmarks.values())) if industry_benchmarks else 0
+                overall_industry_avg = recommendations.industry_average(industry_benchmarks)
                 st.markdown(f"**Organization's Overall Maturity for {theme}:** {overall_maturity:.1f}/5.0")
                 st.markdown(f"**Industry Standard Average for {theme}:** {overall_industry_avg:.1f}/5.0")
+                peer_text = peer_rank_text(theme, None, overall_maturity)
+                if peer_text:
+                    st.markdown(f"**Peer Benchmark:** {peer_text}")
                 
                 # Area-wise comparison using Radar Chart
                 st.subheader(":bar_chart: Focused Area Comparison with Industry Standards")
@@ -1267,7 +949,8 @@ def main():
                 industry_area_scores = industry_benchmarks
                 
                 # Display the radar chart
-                st.plotly_chart(create_radar_chart(org_area_scores, industry_area_scores), use_container_width=True)
+                st.caption(MATURITY_LEVELS_CAPTION)
+                show_chart_spec(radar_chart_spec(org_area_scores, industry_area_scores))
                 
                 # --- NEW: Add organization-level recommendations and role-specific actions ---
                 st.divider()
@@ -1277,44 +960,24 @@ def main():
                 maturity_gap = overall_maturity - overall_industry_avg
 
                 # Generate holistic recommendations
-                with st.spinner("Generating strategic recommendations..."):
-                    holistic_rec = generate_holistic_recommendations(
-                        overall_maturity,
-                        maturity_gap
-                    )
-                    st.markdown(holistic_rec)
+                add_ai_section(ai_sections, "holistic", holistic_prompt(overall_maturity, maturity_gap),
+                               "Generating strategic recommendations...", pack=pack, theme=theme)
                 st.subheader(":busts_in_silhouette: Role-Specific Action Items")
 
                 # Get unique designations from ALL organization users
-                designations = set()
-                if st.session_state.org_data and "users" in st.session_state.org_data:
-                    for user in st.session_state.org_data["users"]:
-                         # Check multiple possible locations for designation
-                         designation = ""
-                         if user.get("designation"):
-                              designation = user["designation"]
-                         elif user.get("user_info") and user["user_info"].get("designation"):
-                              designation = user["user_info"]["designation"]
-                         elif "designation" in user:
-                              designation = user["designation"]
-                         if designation and designation.strip():
-                              designations.add(designation.strip().title())
+                designations = recommendations.org_designations(st.session_state.org_data)
                 
                 if designations:
-                    with st.spinner("Generating role-specific actions..."):
-                         # Calculate gap magnitude
-                         gap_magnitude = abs(maturity_gap) if maturity_gap < 0 else 0.5
+                    # Calculate gap magnitude
+                    gap_magnitude = recommendations.role_gap(maturity_gap)
                     
-                         # Generate role-specific actions
-                         role_actions = generate_role_specific_actions(
-                              list(designations),
-                              gap_magnitude
-                         )
-                         st.markdown(role_actions)
-                         # Add expandable section with raw designation data
-                         with st.expander("View participant roles"):
-                              st.write(f"**{len(designations)} unique roles identified:**")
-                              st.write(", ".join(sorted(designations)))
+                    # Generate role-specific actions
+                    add_ai_section(ai_sections, "roles", role_actions_prompt(list(designations), gap_magnitude),
+                                   "Generating role-specific actions...", pack=pack, theme=theme)
+                    # Add expandable section with raw designation data
+                    with st.expander("View participant roles"):
+                         st.write(f"**{len(designations)} unique roles identified:**")
+                         st.write(", ".join(sorted(designations)))
                 else:
                     st.info("No role information available for action item generation. Designations weren't collected from participants.")
 
@@ -1326,40 +989,27 @@ def main():
                     org_score = org_maturity["by_area"][area]
                     industry_score = industry_benchmarks.get(area, 3.0)
                     
-                    if theme == "Source-To-Pay Process":
-                        # Convert score to integer for recommendation levels
-                        score_level = str(min(5, max(1, int(round(org_score)))))
-                        static_recommendation = RECOMMENDATIONS.get(area, {}).get(score_level, "No recommendation available")
-                    else:  # Procurement Performance
-                        # Find matching question for this focus area
-                        matched_question_id = None
-                        for qid, q in performance_questions.items():
-                            if q["focus_area"] == area:
-                                matched_question_id = qid
-                                break
-                        
-                        static_recommendation = "No recommendation available"
-                        if matched_question_id:
-                            # Find recommendations in deepseek data
-                            for key, val in deepseek_data.items():
-                                if val["question"].strip().lower() == performance_questions[matched_question_id]["question"].strip().lower():
-                                    rounded_score = str(int(round(org_score)))
-                                    static_recommendation = val["recommendations"].get(rounded_score, "No recommendation available")
-                                    break
+                    # Convert score to a recommendation level
+                    score_level = recommendations.area_score_level(theme, org_score)
+                    static_recommendation = recommendations.static_recommendation(pack, theme, area, score_level)
+                    if static_recommendation is None:
+                        # Precomputed focus area -> recommendations-by-level index
+                        static_recommendation = CATALOGUE.area_recommendations(theme, area).get(score_level, "No recommendation available")
+                    area_prompt = theme_prompt(area, org_score, industry_score)
                     
                     with st.expander(f"{area} (Your Org: {org_score:.1f} vs Industry: {industry_score:.1f})"):
                         # Display static recommendation
                         st.markdown(f"**Recommendation:** {static_recommendation}")
+                        peer_text = peer_rank_text(theme, area, org_score)
+                        if peer_text:
+                            st.caption(f"Peers: {peer_text}")
                         
                         # Generate AI-complemented recommendations
-                        if ollama_available:
-                            with st.spinner(f"Generating complementary recommendations for {area}..."):
-                                ai_recommendation = generate_theme_recommendation(
-                                    area, org_score, industry_score
-                                )
-                                if ai_recommendation:
-                                    st.markdown("**AI-Enhanced Suggestions:**")
-                                    st.markdown(ai_recommendation)
+                        if ollama_available or recommendations.section_text(pack, theme, ("area", area), area_prompt,
+                                                                            LLM_MODEL, LLM_OPTIONS):
+                            add_ai_section(ai_sections, ("area", area), area_prompt,
+                                           f"Generating complementary recommendations for {area}...",
+                                           heading="**AI-Enhanced Suggestions:**", pack=pack, theme=theme)
                         else:
                             st.info("Connect Ollama for AI-powered recommendations.")
             else:
@@ -1413,6 +1063,11 @@ def main():
             if st.button(":house: Back to Home", use_container_width=True):
                 st.session_state.stage = "user_info"
                 st.rerun()
+        
+        # Fill the AI placeholders as their generations complete
+        render_ai_sections(ai_sections)
 
 if __name__ == "__main__":
-    main()
+    # One timing span (and, when sampled, one profile) per script run, by starting stage
+    with instrumentation.script_run(st.session_state.get("stage", "user_info")):
+        main()
@@ -0,0 +1,165 @@
+"""Rerun-count benchmark: script executions per completed combined assessment.
+
+Every Streamlit interaction re-executes app6.py, and `st.rerun()` executes
+it again.  This benchmark drives complete combined (Source-To-Pay +
+Procurement Performance) assessments through streamlit.testing's AppTest,
+from the first question to the confirmation page, once per layout of the
+combined assessment (COMBINED_LAYOUT in app6.py):
+
+  * question - one question per page, the original flow: every answer
+               costs the radio change plus st.rerun()
+  * section  - one form per focused area, submitted once
+
+and reports per assessment:
+
+  * executions - script runs (counted via st.set_page_config, which main()
+                 calls once per run)
+  * script cpu - CPU time of the script-runner threads, i.e. what a server
+                 pays, without AppTest's own overhead.  AppTest recompiles
+                 the script for every run where a server compiles it once
+                 per process, so the script is compiled once before
+                 measuring and its bytecode shared across runs
+  * wall       - elapsed time, including AppTest
+
+The driver answers whatever is on screen: all radios of a form and its
+submit button, or a single radio that reruns on its own.  Runs in a
+temporary data directory.
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/bench_assessment.py --assessments 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(APP_DIR, "app6.py")
+sys.path.insert(0, APP_DIR)
+
+import streamlit as st  # noqa: E402
+from streamlit.runtime.scriptrunner import ScriptRunner  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from procurement_core.question_bank import PERFORMANCE_THEME, STP_THEME, get_catalogue  # noqa: E402
+
+SUBMIT_LABELS = ("Next Section", "Submit Assessment")
+LAYOUTS = ("question", "section")
+
+# Compiled app script, shared by every probe like a server's script cache
+_bytecode = {}
+
+
+class ScriptProbe:
+    """Counts script executions (st.set_page_config calls) and the CPU time
+    of the threads running them"""
+
+    def __init__(self):
+        self.executions = 0
+        self.cpu = 0.0
+        self._page_config = st.set_page_config
+        self._thread_main = ScriptRunner._run_script_thread
+        self._get_bytecode = ScriptCache.get_bytecode
+
+    def __enter__(self):
+        probe = self
+
+        def counting(*args, **kwargs):
+            probe.executions += 1
+            return probe._page_config(*args, **kwargs)
+
+        def timed(runner):
+            start = time.thread_time()
+            try:
+                probe._thread_main(runner)
+            finally:
+                probe.cpu += time.thread_time() - start
+
+        def shared_bytecode(cache, script_path):
+            if script_path not in _bytecode:
+                _bytecode[script_path] = probe._get_bytecode(cache, script_path)
+            return _bytecode[script_path]
+
+        st.set_page_config = counting
+        ScriptRunner._run_script_thread = timed
+        ScriptCache.get_bytecode = shared_bytecode
+        return self
+
+    def __exit__(self, *exc):
+        st.set_page_config = self._page_config
+        ScriptRunner._run_script_thread = self._thread_main
+        ScriptCache.get_bytecode = self._get_bytecode
+
+
+def start_assessment(email):
+    """AppTest positioned at the first question of a combined assessment"""
+    at = AppTest.from_file(APP_SCRIPT, default_timeout=120).run()
+    at.session_state.user_info = {"name": "Bench", "email": email, "designation": "Buyer",
+                                  "organization": "Bench Org"}
+    at.session_state.selected_themes = {theme: theme in (STP_THEME, PERFORMANCE_THEME)
+                                        for theme in get_catalogue().themes}
+    at.session_state.combined_mode = True
+    at.session_state.stage = "assessment"
+    return at.run()
+
+
+def complete_assessment(at, max_steps=200):
+    """Answer questions until the confirmation page"""
+    answered = 0
+    for _ in range(max_steps):
+        if at.session_state.stage != "assessment":
+            break
+        submit = [button for button in at.button if button.label in SUBMIT_LABELS]
+        if submit:
+            for radio in at.radio:
+                radio.set_value(radio.options[answered % len(radio.options)])
+                answered += 1
+            submit[0].click().run()
+        else:
+            radio = at.radio[0]
+            radio.set_value(radio.options[answered % len(radio.options)]).run()
+            answered += 1
+        if at.exception:
+            raise RuntimeError(at.exception)
+    if at.session_state.stage != "confirmation":
+        raise RuntimeError(f"assessment did not complete (stage {at.session_state.stage})")
+    return answered
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--assessments", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    os.chdir(tempfile.mkdtemp(prefix="bench_assessment_"))
+    _bytecode[APP_SCRIPT] = ScriptCache().get_bytecode(APP_SCRIPT)
+    medians = {}
+    for layout in LAYOUTS:
+        os.environ["COMBINED_LAYOUT"] = layout
+        executions, cpu, wall = [], [], []
+        for i in range(args.assessments):
+            at = start_assessment(f"bench-{layout}{i}@example.com")
+            with ScriptProbe() as probe:
+                wall_start = time.perf_counter()
+                answered = complete_assessment(at)
+                wall.append(time.perf_counter() - wall_start)
+            executions.append(probe.executions)
+            cpu.append(probe.cpu)
+        medians[layout] = statistics.median(cpu)
+
+        print(f"combined assessment, {layout} layout, {answered} questions, {args.assessments} assessment(s)")
+        print(f"    executions  median={statistics.median(executions):6.0f}")
+        print(f"    script cpu  median={statistics.median(cpu) * 1000:8.1f} ms  "
+              f"per execution={statistics.median(cpu) * 1000 / statistics.median(executions):6.1f} ms")
+        print(f"    wall        median={statistics.median(wall) * 1000:8.1f} ms")
+
+    print(f"script cpu question/section: {medians['question'] / medians['section']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""Chart construction benchmark: memoised Plotly JSON specs vs rebuilt figures.
+
+Replays `--sessions` results-page renders, each drawing one gauge and one
+radar chart for a score profile picked from `--profiles` distinct ones
+(scores are rounded to one decimal, so real sessions repeat profiles
+often).  Reports per-render cost of
+
+  * rebuilt figures  - built and serialised on every render (the original
+                       st.plotly_chart behaviour)
+  * memoised figures - built once, serialised on every render
+  * memoised specs   - the charts.py spec caches the results page renders
+                       from (app6.show_chart_spec), serialised once
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/bench_charts.py --sessions 500 --profiles 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from functools import lru_cache
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+import plotly.io as pio  # noqa: E402
+
+import charts  # noqa: E402
+
+AREAS = ["Strategic Sourcing", "Contract Management", "Supplier Management",
+         "Purchase Requisition", "Purchase Order", "Payment Process"]
+
+
+def profiles(count, seed=7):
+    """Distinct rounded score profiles shaped like a Source-To-Pay results page"""
+    rng = random.Random(seed)
+    benchmarks = {area: 3.5 for area in AREAS}
+    result = []
+    for _ in range(count):
+        scores = {area: round(rng.uniform(1, 5), 1) for area in AREAS}
+        result.append((round(sum(scores.values()) / len(scores), 1), scores, benchmarks))
+    return result
+
+
+def serialised(build):
+    """Chart function returning the JSON st.plotly_chart would serialise `build`'s figure to"""
+    return lambda *args: pio.to_json(build(*args), validate=False)
+
+
+@lru_cache(maxsize=charts.CHART_CACHE_SIZE)
+def memoised_gauge(value, title):
+    return charts.create_gauge_chart(value, title)
+
+
+@lru_cache(maxsize=charts.CHART_CACHE_SIZE)
+def memoised_radar(themes, scores, benchmarks):
+    return charts.create_radar_chart(dict(zip(themes, scores)), dict(zip(themes, benchmarks)))
+
+
+def memoised_radar_figure(scores, benchmarks):
+    themes = tuple(scores)
+    return memoised_radar(themes, tuple(scores.values()), tuple(benchmarks.get(t, 0) for t in themes))
+
+
+def replay(sessions, gauge, radar):
+    """ms per render of one gauge and one radar chart, as the JSON sent to the browser"""
+    start = time.perf_counter()
+    for overall, scores, benchmarks in sessions:
+        gauge(overall, "Organization's Overall Maturity")
+        radar(scores, benchmarks)
+    return (time.perf_counter() - start) * 1000 / len(sessions)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--profiles", type=int, default=20, help="distinct score profiles")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(1)
+    pool = profiles(args.profiles)
+    sessions = [rng.choice(pool) for _ in range(args.sessions)]
+
+    rebuilt = replay(sessions, serialised(charts.create_gauge_chart), serialised(charts.create_radar_chart))
+    figures = replay(sessions, serialised(memoised_gauge), serialised(memoised_radar_figure))
+    charts.clear_cache()
+    specs = replay(sessions, charts.gauge_chart_spec, charts.radar_chart_spec)
+    info = charts.cache_info()
+    hits = info["gauge"].hits + info["radar"].hits
+    lookups = hits + info["gauge"].misses + info["radar"].misses
+
+    print(f"{args.sessions} renders, {args.profiles} distinct profiles (gauge + radar per render)")
+    print(f"  rebuilt figures   {rebuilt:6.2f} ms/render")
+    print(f"  memoised figures  {figures:6.2f} ms/render  ({rebuilt / figures:.1f}x faster)")
+    print(f"  memoised specs    {specs:6.2f} ms/render  (hit rate {hits / lookups:.0%}, "
+          f"{rebuilt / specs:.1f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Import-time benchmark and side-effect check for the procurement_core package.
+
+Each target is imported `--runs` times, every time in a fresh interpreter
+with an empty working directory, and reported as
+
+  * import   - time spent in the import statement (median)
+  * process  - interpreter start to exit, as a worker pays it (median)
+  * loaded   - heavy libraries present afterwards (numpy, pandas, plotly,
+               matplotlib, ollama, streamlit, httpx)
+
+Targets are the package, each of its modules, two "worker" jobs scoring a
+stored organisation (from the JSONL backend's running aggregates, which
+must not need pandas, and from a responses frame, which does), and the
+app-side modules that own the heavy libraries, for comparison.
+
+The package promises imports without side effects, so a core target that
+loads a heavy library, creates files in the working directory or starts a
+thread is reported as a VIOLATION and the benchmark exits 1.
+`--top N` also lists each target's N slowest imports (`python -X importtime`).
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/bench_imports.py --runs 10
+    python benchmarks/bench_imports.py --runs 3 --top 8
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from procurement_core import SUBMODULES  # noqa: E402
+from procurement_core.storage import get_storage  # noqa: E402
+from synthetic import realistic_org, write_org  # noqa: E402
+
+HEAVY = ("numpy", "pandas", "plotly", "matplotlib", "ollama", "streamlit", "httpx")
+WORKER_USERS = 200
+
+# Runs `statement` and reports its cost and footprint as JSON on stdout
+CHILD = """
+import json, os, sys, threading, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "threads": threading.active_count(), "files": sorted(os.listdir(".")),
+                  "loaded": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+# (label, statement, core): core targets must have no side effects
+TARGETS = [("procurement_core", "import procurement_core", True)] + [
+    (f"procurement_core.{name}", f"import procurement_core.{name}", True) for name in SUBMODULES
+] + [
+    ("worker: maturity from aggregates",
+     "import procurement_core as core\n"
+     "storage = core.get_storage({data_dir!r}, 'jsonl')\n"
+     "core.peer_benchmarks.org_scores(storage, 'Bench Org')", True),
+    ("worker: maturity from frames",
+     "import procurement_core as core\n"
+     "org_data = core.get_storage({data_dir!r}, 'jsonl').get_org_data('Bench Org')\n"
+     "core.scoring.org_maturity(org_data, core.STP_THEME)", False),
+    ("charts (plotly)", "import charts", False),
+    ("chart_images (matplotlib)", "import chart_images", False),
+    ("llm_client (ollama)", "import llm_client", False),
+]
+
+
+def run_child(code, env, extra_args=()):
+    """(report dict, process seconds, stderr) of one fresh interpreter in an empty directory"""
+    workdir = tempfile.mkdtemp(prefix="bench_imports_")
+    try:
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, *extra_args, "-c", code], cwd=workdir, env=env,
+                              capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if proc.returncode:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        return json.loads(proc.stdout.strip().splitlines()[-1]), elapsed, proc.stderr
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def slowest_imports(importtime, top):
+    """[(cumulative ms, module)] of the slowest imports in `python -X importtime` output,
+    leaving out interpreter startup (everything up to `site`)"""
+    rows = []
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == "site":
+            rows = []
+        elif cumulative.strip().isdigit():
+            rows.append((int(cumulative) / 1000, name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per target")
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest imports of each target")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [APP_DIR, os.environ.get("PYTHONPATH")])))
+    data_dir = tempfile.mkdtemp(prefix="bench_imports_data_")
+    violations = []
+    try:
+        write_org(get_storage(data_dir, "jsonl"), realistic_org(WORKER_USERS))
+        baseline = statistics.median(run_child("print('{}')", env)[1] for _ in range(args.runs))
+        print(f"{args.runs} fresh interpreter(s) per target; empty interpreter {baseline * 1000:.1f} ms")
+        print(f"{'target':<38} {'import':>10} {'process':>11}  loaded")
+        for label, statement, core in TARGETS:
+            code = CHILD.format(statement=statement.format(data_dir=data_dir), heavy=HEAVY)
+            runs = [run_child(code, env) for _ in range(args.runs)]
+            report = runs[-1][0]
+            problems = []
+            if core:
+                problems += [f"loads {name}" for name in report["loaded"]]
+                problems += [f"creates {name}" for name in report["files"]]
+                if report["threads"] > 1:
+                    problems.append(f"starts {report['threads'] - 1} thread(s)")
+            print(f"{label:<38} {statistics.median(r[0]['ms'] for r in runs):7.1f} ms "
+                  f"{statistics.median(r[1] for r in runs) * 1000:8.1f} ms  {', '.join(report['loaded']) or '-'}"
+                  + (f"  VIOLATION: {'; '.join(problems)}" if problems else ""))
+            violations += [f"{label}: {problem}" for problem in problems]
+            if args.top:
+                _, _, importtime = run_child(code, env, ["-X", "importtime"])
+                for cumulative, name in slowest_imports(importtime, args.top):
+                    print(f"    {cumulative:8.1f} ms  {name.strip()}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    if violations:
+        print(f"{len(violations)} side-effect violation(s) in procurement_core")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""LLM client benchmark against the fake Ollama server.
+
+Measures, for the shared pooled client versus a fresh client per call:
+
+  * healthy   - latency of sequential and concurrent generations
+  * outage    - how long a page's worth of sections takes to fail when the
+                server returns errors, with and without the circuit breaker
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/bench_llm.py --calls 40 --sections 8
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ollama import Client  # noqa: E402
+
+from fake_ollama import start_server  # noqa: E402
+from llm_client import CircuitBreaker, CircuitOpenError, OllamaService  # noqa: E402
+
+MODEL = "llama3.2:latest"
+
+
+def timed_calls(generate, calls, workers):
+    """Per-call latencies (ms) and total wall time (s) of `calls` generations"""
+    def one(_):
+        start = time.perf_counter()
+        try:
+            generate(model=MODEL, prompt="bench")
+        except Exception:
+            pass
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        latencies = list(pool.map(one, range(calls)))
+    return latencies, time.perf_counter() - start
+
+
+def report(label, latencies, wall):
+    print(f"  {label:<28} p50={statistics.median(latencies):7.1f} ms  "
+          f"max={max(latencies):7.1f} ms  total={wall:6.2f} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--sections", type=int, default=8, help="generations per results page")
+    parser.add_argument("--first-token", type=float, default=0.05)
+    parser.add_argument("--error-latency", type=float, default=1.0,
+                        help="seconds the failing server takes to answer")
+    args = parser.parse_args(argv)
+
+    server, url, config = start_server(first_token=args.first_token, token_delay=0.0, tokens=20)
+
+    print(f"healthy server ({args.calls} calls, first token {args.first_token * 1000:.0f} ms)")
+    shared = OllamaService(url)
+    for workers in (1, args.workers):
+        report(f"fresh client, {workers} worker(s)",
+               *timed_calls(lambda **kw: Client(host=url).generate(**kw), args.calls, workers))
+        report(f"shared client, {workers} worker(s)", *timed_calls(shared.generate, args.calls, workers))
+
+    # A struggling server: every request errors after a delay
+    config.down = True
+    config.error_delay = args.error_latency
+    print(f"failing server ({args.sections} sections, errors after {args.error_latency:.1f} s)")
+    report("no breaker", *timed_calls(Client(host=url).generate, args.sections, 1))
+    guarded = OllamaService(url, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60))
+    report("circuit breaker", *timed_calls(guarded.generate, args.sections, 1))
+    try:
+        guarded.generate(model=MODEL, prompt="bench")
+    except CircuitOpenError:
+        print(f"  circuit opened after {guarded.breaker.failure_threshold} failures; "
+              f"later calls fail immediately")
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""Load test: concurrent assessors walking the whole app against the fake Ollama server.
+
+Starts `--users` virtual users at once.  Each one completes `--assessments`
+assessments through streamlit.testing's AppTest, one after another:
+user_info -> theme_selection -> (focused_area_selection) -> assessment
+-> confirmation -> results.  Every assessment uses a random organisation
+from a pool of `--orgs`, a fresh email, a random mode (Source-To-Pay with
+random focused areas, Procurement Performance, or combined) and random
+answers.  Results pages stream their AI sections from a fake Ollama server
+(benchmarks/fake_ollama.py) started here.
+
+AppTest keeps process-global runtime state, so each virtual user runs in
+its own process.  All users share one data directory, so saves to the same
+organisation contend for the same storage locks, just as sessions of one
+server do.
+
+Reported:
+
+  * latency per stage - time for each interaction, from the click to the
+    page being rendered, by the stage it lands on (user_info is the first
+    page load); p50 / p95 / p99, plus the server-side script_run time
+  * throughput - completed assessments and interactions per second, and
+    the script runs and script-runner CPU each assessment costs (compiled
+    bytecode is shared across runs, as on a server; see bench_assessment.py)
+  * storage contention - save_response time and the storage_lock_wait
+    spans (per-org locks, SQLite write lock) recorded during saves
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/bench_load.py --users 8 --assessments 3 --orgs 4
+    python benchmarks/bench_load.py --users 4 --storage sqlite --json load.json
+"""
+import argparse
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(APP_DIR, "app6.py")
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_ollama import start_server  # noqa: E402
+from procurement_core.question_bank import PERFORMANCE_THEME, STP_THEME  # noqa: E402
+
+MODES = ("stp", "perf", "combined")
+SUBMIT_LABELS = ("Next Section", "Submit Assessment")
+STAGES = ("user_info", "theme_selection", "focused_area_selection", "assessment", "confirmation", "results")
+
+
+def percentile(samples, q):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class SpanCollector(logging.Handler):
+    """Keeps the durations (ms) of the app's timing spans, from its JSON timing log"""
+
+    def __init__(self):
+        super().__init__()
+        self.samples = defaultdict(list)
+
+    def emit(self, record):
+        entry = json.loads(record.getMessage())
+        name = entry["span"]
+        if name == "script_run":
+            name = f"script_run:{entry['stage']}"
+        elif name == "storage_lock_wait":
+            name = f"storage_lock_wait:{entry['lock']}"
+        self.samples[name].append(entry["ms"])
+
+
+# -----------------------------
+# Virtual user
+# -----------------------------
+class VirtualUser:
+    """Drives one AppTest session at a time through complete assessments"""
+
+    def __init__(self, index, options):
+        self.index = index
+        self.options = options
+        self.rng = random.Random(options["seed"] * 100003 + index)
+        self.stages = defaultdict(list)
+        self.assessments = []
+
+    def _step(self, at, action=None):
+        """Run one interaction and time it against the stage it lands on"""
+        start = time.perf_counter()
+        (action() if action else at).run()
+        elapsed = (time.perf_counter() - start) * 1000
+        if at.exception:
+            raise RuntimeError(f"app exception: {at.exception}")
+        # Widgets of a run cut short by st.rerun() stay in AppTest's tree
+        # without state; give them one so the next interaction can be sent
+        for checkbox in at.checkbox:
+            try:
+                checkbox.value
+            except KeyError:
+                checkbox.set_value(False)
+        self.stages[at.session_state.stage].append(elapsed)
+        return at
+
+    def _click(self, at, label):
+        button = next(button for button in at.button if label in button.label)
+        return self._step(at, button.click)
+
+    def assessment(self, number):
+        from streamlit.testing.v1 import AppTest
+
+        rng = self.rng
+        mode = rng.choice(MODES)
+        start = time.perf_counter()
+        at = AppTest.from_file(APP_SCRIPT, default_timeout=self.options["timeout"])
+        self._step(at)
+
+        values = ("Load User", f"user{self.index}-{number}@load.test", rng.choice(("Buyer", "CPO", "Analyst")),
+                  f"Load Org {rng.randrange(self.options['orgs'])}")
+        for text_input, value in zip(at.text_input, values):
+            text_input.input(value)
+        self._click(at, "Continue to Theme Selection")
+
+        themes = {"stp": [STP_THEME], "perf": [PERFORMANCE_THEME], "combined": [STP_THEME, PERFORMANCE_THEME]}[mode]
+        for theme in themes:
+            at.session_state[f"select_{theme}"] = True
+        self._click(at, "Start Assessment")
+
+        if at.session_state.stage == "focused_area_selection":
+            areas = [checkbox.key[len("select_"):] for checkbox in at.checkbox if checkbox.key.startswith("select_")]
+            for area in rng.sample(areas, rng.randint(1, len(areas))):
+                at.session_state[f"select_{area}"] = True
+            self._click(at, "Continue to Assessment")
+
+        for _ in range(200):
+            if at.session_state.stage != "assessment":
+                break
+            submit = [button for button in at.button if button.label in SUBMIT_LABELS]
+            if submit:
+                for radio in at.radio:
+                    radio.set_value(rng.choice(radio.options))
+                self._step(at, submit[0].click)
+            else:
+                radio = at.radio[0]
+                self._step(at, lambda: radio.set_value(rng.choice(radio.options)))
+        if at.session_state.stage != "confirmation":
+            raise RuntimeError(f"assessment did not complete (stage {at.session_state.stage})")
+
+        self._click(at, "View Results")
+        self.assessments.append((time.perf_counter() - start) * 1000)
+
+
+def run_user(index, options, barrier, results):
+    """Process entry point: warm up, wait for every user, then run assessments"""
+    os.chdir(options["workdir"])
+    from procurement_core import instrumentation
+    from bench_assessment import ScriptProbe
+    from llm_client import get_ollama
+    from streamlit.testing.v1 import AppTest
+
+    collector = SpanCollector()
+    instrumentation.logger.addHandler(collector)
+    instrumentation.logger.setLevel(logging.INFO)
+    instrumentation.logger.propagate = False
+
+    # Import the app's modules and mark the fake server healthy before the clock starts
+    get_ollama().probe()
+    # Compiles the script once, as a server does, and measures the server's share of the work
+    with ScriptProbe() as probe:
+        AppTest.from_file(APP_SCRIPT, default_timeout=options["timeout"]).run()
+        collector.samples.clear()
+        probe.executions, probe.cpu = 0, 0.0
+
+        user = VirtualUser(index, options)
+        errors = []
+        barrier.wait()
+        start = time.perf_counter()
+        for number in range(options["assessments"]):
+            try:
+                user.assessment(number)
+            except Exception as e:
+                errors.append(repr(e))
+    results.put({
+        "elapsed": time.perf_counter() - start,
+        "executions": probe.executions,
+        "script_cpu": probe.cpu,
+        "stages": dict(user.stages),
+        "assessments": user.assessments,
+        "spans": dict(collector.samples),
+        "errors": errors,
+    })
+
+
+# -----------------------------
+# Report
+# -----------------------------
+def summary(samples):
+    if not samples:
+        return None
+    return {"n": len(samples), "p50": percentile(samples, 0.5), "p95": percentile(samples, 0.95),
+            "p99": percentile(samples, 0.99), "max": max(samples)}
+
+
+def report(results, wall, llm_requests):
+    stages, spans = defaultdict(list), defaultdict(list)
+    assessments, errors = [], []
+    for result in results:
+        for stage, samples in result["stages"].items():
+            stages[stage].extend(samples)
+        for name, samples in result["spans"].items():
+            spans[name].extend(samples)
+        assessments.extend(result["assessments"])
+        errors.extend(result["errors"])
+
+    interactions = sum(len(samples) for samples in stages.values())
+    completed = max(1, len(assessments))
+    lock_waits = [ms for name, samples in spans.items() if name.startswith("storage_lock_wait") for ms in samples]
+    return {
+        "wall_seconds": wall,
+        "assessments": len(assessments),
+        "errors": errors,
+        "throughput": {"assessments_per_s": len(assessments) / wall, "interactions_per_s": interactions / wall},
+        "assessment_ms": summary(assessments),
+        "per_assessment": {"executions": sum(r["executions"] for r in results) / completed,
+                           "script_cpu_ms": 1000 * sum(r["script_cpu"] for r in results) / completed},
+        "stages_ms": {stage: summary(stages[stage]) for stage in STAGES if stages[stage]},
+        "server_ms": {stage: summary(spans[f"script_run:{stage}"]) for stage in STAGES
+                      if spans.get(f"script_run:{stage}")},
+        "save_response_ms": summary(spans.get("save_response", [])),
+        "lock_wait_ms": {name.split(":", 1)[1]: summary(samples) for name, samples in sorted(spans.items())
+                         if name.startswith("storage_lock_wait:")},
+        "contended_saves": sum(ms > 1.0 for ms in lock_waits),
+        "llm_requests": llm_requests,
+    }
+
+
+def print_report(result, args):
+    print(f"{args.users} user(s) x {args.assessments} assessment(s), {args.orgs} org(s), "
+          f"storage={args.storage}: {result['assessments']} completed in {result['wall_seconds']:.1f}s")
+    print(f"    throughput   {result['throughput']['assessments_per_s']:.2f} assessments/s  "
+          f"{result['throughput']['interactions_per_s']:.1f} interactions/s")
+
+    def line(label, stats):
+        print(f"    {label:<26} n={stats['n']:<5} p50={stats['p50']:8.1f}  p95={stats['p95']:8.1f}  "
+              f"p99={stats['p99']:8.1f}  max={stats['max']:8.1f} ms")
+
+    print(f"    per assessment  {result['per_assessment']['executions']:.1f} script runs, "
+          f"{result['per_assessment']['script_cpu_ms']:.1f} ms script CPU")
+    if result["assessment_ms"]:
+        line("whole assessment", result["assessment_ms"])
+    print("  latency by stage (client):")
+    for stage, stats in result["stages_ms"].items():
+        line(stage, stats)
+    print("  script run by starting stage (server):")
+    for stage, stats in result["server_ms"].items():
+        line(stage, stats)
+    print("  storage:")
+    if result["save_response_ms"]:
+        line("save_response", result["save_response_ms"])
+    for lock, stats in result["lock_wait_ms"].items():
+        line(f"lock wait ({lock})", stats)
+    print(f"    saves waiting > 1 ms for a lock: {result['contended_saves']}")
+    print(f"  fake LLM requests: {result['llm_requests']}")
+    for error in result["errors"][:5]:
+        print(f"  error: {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=4, help="concurrent virtual users (processes)")
+    parser.add_argument("--assessments", type=int, default=2, help="assessments per user")
+    parser.add_argument("--orgs", type=int, default=3, help="organisations the users are spread over")
+    parser.add_argument("--storage", default="jsonl", help="storage backend (jsonl, json or sqlite)")
+    parser.add_argument("--first-token", type=float, default=0.05, help="fake LLM seconds to first token")
+    parser.add_argument("--token-delay", type=float, default=0.002, help="fake LLM seconds between tokens")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per interaction")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="working directory (default: a fresh temporary one)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    workdir = args.data_dir or tempfile.mkdtemp(prefix="bench_load_")
+    server, url, config = start_server(first_token=args.first_token, token_delay=args.token_delay)
+    os.environ["OLLAMA_HOST"] = url
+    os.environ["PROCUREMENT_STORAGE"] = args.storage
+
+    options = {"workdir": workdir, "assessments": args.assessments, "orgs": args.orgs,
+               "timeout": args.timeout, "seed": args.seed}
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(args.users + 1)
+    results = context.Queue()
+    processes = [context.Process(target=run_user, args=(index, options, barrier, results))
+                 for index in range(args.users)]
+    try:
+        for process in processes:
+            process.start()
+        barrier.wait()
+        config.requests = 0
+        start = time.perf_counter()
+        collected = [results.get() for _ in processes]
+        wall = max(result["elapsed"] for result in collected) if collected else time.perf_counter() - start
+        for process in processes:
+            process.join()
+    finally:
+        server.shutdown()
+        if not args.data_dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    result = report(collected, wall, config.requests)
+    print_report(result, args)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Generation queue benchmark: a burst of results pages against the fake Ollama server.
+
+Simulates `--sessions` people from one organisation opening the results
+page at once.  Each page queues a holistic, a role-specific and
+`--areas` per-area generations; people in the same organisation mostly get
+identical prompts, and `--distinct` controls how many different score
+profiles there are.  Runs the burst twice:
+
+  * no coalescing - every job calls the model
+  * single-flight - identical prompts share one call
+
+and reports model requests, time until each page's holistic section is
+ready, page completion time and the queue's wait-time metrics.
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/bench_queue.py --sessions 40 --distinct 3 --concurrency 4
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import generation  # noqa: E402
+from fake_ollama import start_server  # noqa: E402
+from llm_client import OllamaService  # noqa: E402
+
+MODEL = "llama3.2:latest"
+# Same ordering as app6.AI_SECTION_PRIORITIES
+PRIORITIES = {"holistic": generation.PRIORITY_HOLISTIC, "roles": generation.PRIORITY_ROLES}
+
+
+def page_jobs(service, session, profile, areas, coalesce):
+    """Queue jobs shaped like one results page"""
+    def generate(prompt):
+        return service.generate(model=MODEL, prompt=prompt)["response"]
+
+    prompts = {"holistic": f"holistic {profile}", "roles": f"roles {profile}"}
+    prompts.update({("area", a): f"area {a} {profile}" for a in range(areas)})
+    return {
+        key: (generate, (prompt,), {
+            "model": MODEL,
+            "priority": PRIORITIES.get(key, generation.PRIORITY_AREA),
+            "flight_key": prompt if coalesce else (session, prompt)
+        })
+        for key, prompt in prompts.items()
+    }
+
+
+def burst(url, config, args, coalesce):
+    generation._queue = generation.GenerationQueue(args.concurrency)
+    service = OllamaService(url)
+    config.requests = 0
+    holistic, complete = [], []
+    lock = threading.Lock()
+
+    def session(i):
+        start = time.perf_counter()
+        jobs = page_jobs(service, i, i % args.distinct, args.areas, coalesce)
+        for key, _, _ in generation.run_concurrently(jobs):
+            if key == "holistic":
+                with lock:
+                    holistic.append(time.perf_counter() - start)
+        with lock:
+            complete.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(args.sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    def p(values, q):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    metrics = generation.get_queue().metrics()
+    label = "single-flight" if coalesce else "no coalescing"
+    print(f"  {label:<14} model requests={config.requests:4d}  coalesced={metrics['coalesced']:4d}  "
+          f"holistic p50/p95={statistics.median(holistic):5.2f}/{p(holistic, 0.95):5.2f} s  "
+          f"page p50/p95={statistics.median(complete):5.2f}/{p(complete, 0.95):5.2f} s  "
+          f"queue wait p95={metrics['wait_ms']['p95']:7.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--areas", type=int, default=6)
+    parser.add_argument("--distinct", type=int, default=3, help="distinct score profiles in the burst")
+    parser.add_argument("--concurrency", type=int, default=4, help="model concurrency limit")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds per generation")
+    args = parser.parse_args(argv)
+
+    server, url, config = start_server(first_token=args.latency, token_delay=0.0, tokens=20)
+    print(f"{args.sessions} sessions x {args.areas + 2} generations, {args.distinct} score profile(s), "
+          f"concurrency {args.concurrency}, {args.latency * 1000:.0f} ms per generation")
+    for coalesce in (False, True):
+        burst(url, config, args, coalesce)
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Record format benchmark: version 1 dicts vs compact version 2 records.
+
+Writes one synthetic organisation (`--users` respondents per theme) as a
+JSONL log in the original free-form dict format and in the compact
+procurement_core/records.py format, then reports the file sizes, the time
+to parse each log into the records the app works with, and the memory
+those records hold.
+
+"v1 dicts" is the original cost (json.loads only, the dicts are the
+records); "v1 -> records" is reading an unmigrated log with the new code;
+"v2 -> records" is a migrated log.
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/bench_records.py --users 1000 10000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from procurement_core.records import get_codec  # noqa: E402
+from synthetic import as_records, synthetic_org  # noqa: E402
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def held_bytes(fn):
+    """Bytes still allocated by fn's result"""
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000], help="respondents per theme")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    codec = get_codec()
+    for users in args.users:
+        org = synthetic_org(users)
+        v1 = [json.dumps(user) for user in org["users"]]
+        v2 = [json.dumps(codec.encode_user(user), separators=(",", ":")) for user in as_records(org)["users"]]
+        v1_bytes = sum(len(line) + 1 for line in v1)
+        v2_bytes = sum(len(line) + 1 for line in v2)
+
+        def v1_dicts():
+            return [json.loads(line) for line in v1]
+
+        def v1_records():
+            return [codec.decode_user(json.loads(line)) for line in v1]
+
+        def v2_records():
+            return [codec.decode_user(json.loads(line)) for line in v2]
+
+        print(f"{users:>7} users/theme ({len(v1)} records)")
+        print(f"    size    v1={v1_bytes / 1e6:8.2f} MB  v2={v2_bytes / 1e6:8.2f} MB  "
+              f"({100 * (1 - v2_bytes / v1_bytes):.0f}% smaller)")
+        print(f"    parse   v1 dicts={best_of(v1_dicts, args.repeat):8.1f} ms  "
+              f"v1 -> records={best_of(v1_records, args.repeat):8.1f} ms  "
+              f"v2 -> records={best_of(v2_records, args.repeat):8.1f} ms")
+        print(f"    memory  v1 dicts={held_bytes(v1_dicts) / 1e6:8.2f} MB  "
+              f"v2 records={held_bytes(v2_records) / 1e6:8.2f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Scoring benchmark: Python-loop maturity vs the vectorised scoring engine.
+
+Builds a synthetic organisation with N respondents per theme and times the
+original dict/list-comprehension implementation of calculate_org_maturity
+against scoring.org_maturity, and a loop computing full statistics against a
+scoring.summarize pass (means, medians, dispersion and participation for
+every theme and area).  "cold" includes flattening the org into a frame
+with nothing cached; "after save" is the first view after one respondent
+re-submitted (what every submission costs); "cached frame" is a repeat
+view of an unchanged org.  Both engines must agree, also on responses to
+questions since removed from the bank, or the benchmark exits 1.
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/bench_scoring.py --users 10000 50000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from procurement_core import scoring  # noqa: E402
+from procurement_core.question_bank import PERFORMANCE_THEME, STP_THEME  # noqa: E402
+from procurement_core.records import get_codec  # noqa: E402
+from synthetic import as_records, synthetic_org  # noqa: E402
+
+
+def legacy_org_maturity(org_data, theme):
+    """The original loop-based calculate_org_maturity"""
+    all_responses = []
+    for user in org_data["users"]:
+        if user.get("theme") == theme:
+            all_responses.extend(user["responses"])
+    key = "focused_area" if theme == STP_THEME else "focus_area"
+    area_scores = defaultdict(list)
+    for resp in all_responses:
+        area_scores[resp[key]].append(resp["score"])
+    by_area = {area: round(sum(scores) / len(scores), 1) for area, scores in area_scores.items()}
+    overall = round(sum(resp["score"] for resp in all_responses) / len(all_responses), 1)
+    return {"overall": overall, "by_area": by_area}
+
+
+def legacy_full_stats(org_data):
+    """Means, medians, dispersion and participation per (theme, area) with plain loops"""
+    scores = defaultdict(list)
+    participants = defaultdict(set)
+    for user in org_data["users"]:
+        for resp in user["responses"]:
+            key = (user.get("theme"), resp.get("focused_area", resp.get("focus_area")))
+            scores[key].append(resp["score"])
+            participants[key].add(user["email"])
+    return {
+        key: (statistics.fmean(values), statistics.median(values),
+              statistics.stdev(values) if len(values) > 1 else 0.0, len(values), len(participants[key]))
+        for key, values in scores.items()
+    }
+
+
+def removed_question_orgs():
+    """(app dicts, stored records) of an org with answers to questions no longer in the bank"""
+    org = synthetic_org(3)
+    codec = get_codec()
+    stored = [codec.encode_user(codec.user_record(user)) for user in org["users"]]
+    for user, entry in zip(org["users"], stored):
+        key = "focused_area" if user["theme"] == STP_THEME else "focus_area"
+        user["responses"].append({"question": "removed_question", key: None, "score": 4})
+        entry["r"].append(["removed_question", 0, 4])
+    return org, {"organization": org["organization"], "users": stored}
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="respondents per theme")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    themes = (STP_THEME, PERFORMANCE_THEME)
+    org, stored = removed_question_orgs()
+    for theme in themes:
+        expected = legacy_org_maturity(org, theme)
+        if not expected == scoring.org_maturity(org, theme) == scoring.org_maturity(stored, theme):
+            print(f"MISMATCH on a removed question ({theme}): {expected} vs {scoring.org_maturity(stored, theme)}")
+            return 1
+    scoring.clear_cache()
+
+    print("maturity = overall + per-area means for both themes; "
+          "full stats = mean/median/std/responses/participants per theme and area")
+    for users in args.users:
+        org = synthetic_org(users)
+        stored = as_records(org)
+        for theme in themes:
+            assert legacy_org_maturity(org, theme) == scoring.org_maturity(stored, theme) \
+                == scoring.org_maturity(org, theme)
+
+        def cold_maturity():
+            scoring.clear_cache()
+            return [scoring.org_maturity(stored, theme) for theme in themes]
+
+        def cold_summary():
+            scoring.clear_cache()
+            return scoring.summarize(scoring.org_frame(stored), by="user_theme")
+
+        saves = iter(range(sys.maxsize))
+
+        def resubmit():
+            # The first user submits again: a fresh record moved to the end
+            i = next(saves)
+            user = dict(org["users"][0], timestamp=f"2025-02-01T00:00:00.{i:06d}")
+            stored["users"] = stored["users"][1:] + [get_codec().user_record(user)]
+
+        def saved_maturity():
+            resubmit()
+            return [scoring.org_maturity(stored, theme) for theme in themes]
+
+        def saved_summary():
+            resubmit()
+            return scoring.summarize(scoring.org_frame(stored), by="user_theme")
+
+        responses = len(scoring.org_frame(stored))
+        print(f"{users:>7} users/theme ({responses} responses)")
+        print(f"    maturity    loop={best_of(lambda: [legacy_org_maturity(org, t) for t in themes], args.repeat):8.1f} ms"
+              f"  vectorised cold={best_of(cold_maturity, args.repeat):8.1f} ms"
+              f"  after save={best_of(saved_maturity, args.repeat):8.1f} ms"
+              f"  cached frame={best_of(lambda: [scoring.org_maturity(stored, t) for t in themes], args.repeat):8.1f} ms")
+        print(f"    full stats  loop={best_of(lambda: legacy_full_stats(org), args.repeat):8.1f} ms"
+              f"  vectorised cold={best_of(cold_summary, args.repeat):8.1f} ms"
+              f"  after save={best_of(saved_summary, args.repeat):8.1f} ms"
+              f"  cached frame={best_of(lambda: scoring.summarize(scoring.org_frame(stored), by='user_theme'), args.repeat):8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
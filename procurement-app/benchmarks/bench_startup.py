@@ -0,0 +1,90 @@
+"""Startup / rerun latency benchmark for app6.py.
+
+Streamlit re-executes the whole script on every widget interaction, so the
+module-level work is paid on every click.  This benchmark measures:
+
+  * cold start  - a fresh interpreter executing the script body
+  * warm rerun  - re-executing the script body in an already warm process,
+                  which is what each Streamlit rerun costs
+  * legacy pip  - (opt-in, --legacy) the two `pip install` subprocesses the
+                  script used to run on every rerun, for the "before" figure
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/bench_startup.py --runs 10
+    python benchmarks/bench_startup.py --runs 3 --legacy
+"""
+import argparse
+import os
+import runpy
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(APP_DIR, "app6.py")
+LEGACY_INSTALLS = ["plotly==5.22.0", "matplotlib==3.8.4"]
+
+
+def _summary(label, samples):
+    samples_ms = [s * 1000 for s in samples]
+    print(f"{label:<28} n={len(samples_ms):<4} "
+          f"median={statistics.median(samples_ms):9.1f} ms  "
+          f"min={min(samples_ms):9.1f} ms  max={max(samples_ms):9.1f} ms")
+
+
+def time_cold_start(runs):
+    """Execute the script body in a fresh interpreter each run"""
+    code = f"import runpy; runpy.run_path({APP_SCRIPT!r}, run_name='bench')"
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.check_call([sys.executable, "-c", code], cwd=APP_DIR)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def time_warm_rerun(runs):
+    """Re-execute the script body in this process, as a Streamlit rerun does"""
+    runpy.run_path(APP_SCRIPT, run_name="bench")  # warm imports
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        runpy.run_path(APP_SCRIPT, run_name="bench")
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def time_legacy_pip(runs):
+    """Cost of the per-rerun `pip install` calls the script used to make"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for package in LEGACY_INSTALLS:
+            subprocess.check_call([sys.executable, "-m", "pip", "install", "-q", package])
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--legacy", action="store_true",
+                        help="also time the old per-rerun pip installs (hits the package index)")
+    args = parser.parse_args(argv)
+
+    os.chdir(APP_DIR)
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+
+    _summary("cold start", time_cold_start(args.runs))
+    _summary("warm rerun", time_warm_rerun(args.runs))
+    if args.legacy:
+        legacy = time_legacy_pip(args.runs)
+        _summary("legacy pip installs (before)", legacy)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Concurrent submission benchmark for the response stores.
+
+Simulates many people from one organisation submitting at the same time
+(e.g. at the end of a workshop) and reports throughput, per-save latency and
+how many submissions were lost.  Backends:
+
+  * legacy - the original unlocked read-modify-write of `<org>.json`
+  * json   - JsonFileBackend (whole-file rewrite, per-org lock)
+  * jsonl  - JsonlLogBackend (append-only log, per-org lock)
+
+For jsonl it also checks that a long-lived reader (another app process, or
+a running migrate_records.py) stays correct while a second instance
+compacts the log twice under it, and exits 1 if it does not.
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/bench_storage.py --submitters 300 --workers 32 --existing 1000
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from procurement_core.storage import COMPACT_MIN_RECORDS, JsonlLogBackend, get_storage, org_key  # noqa: E402
+from synthetic import realistic_org  # noqa: E402
+
+ORGANIZATION = "Bench Org"
+
+
+def make_user(i):
+    """Synthetic user record shaped like a Source-To-Pay submission"""
+    return {
+        "name": f"User {i}",
+        "email": f"user{i}@bench.example",
+        "designation": "Procurement Manager",
+        "theme": "Source-To-Pay Process",
+        "responses": [
+            {
+                "question": f"Question {q}",
+                "focused_area": "Strategic Sourcing",
+                "selected_text": "Preferred vendors are defined for key categories",
+                "score": 1 + (i + q) % 5
+            }
+            for q in range(6)
+        ],
+        "timestamp": "2025-01-01T00:00:00"
+    }
+
+
+def legacy_save(data_dir, user_record):
+    """The pre-backend save_response: unlocked read-modify-write"""
+    org_file = os.path.join(data_dir, f"{org_key(ORGANIZATION)}.json")
+    if os.path.exists(org_file):
+        with open(org_file, "r") as f:
+            data = json.load(f)
+    else:
+        data = {"organization": ORGANIZATION, "users": []}
+    data["users"] = [user for user in data["users"] if user["email"] != user_record["email"]]
+    data["users"].append(user_record)
+    with open(org_file, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def submit(args):
+    backend, data_dir, i = args
+    user_record = make_user(i)
+    start = time.perf_counter()
+    if backend == "legacy":
+        try:
+            legacy_save(data_dir, user_record)
+        except json.JSONDecodeError:
+            # A concurrent writer truncated the file under us
+            return None
+    else:
+        get_storage(data_dir, backend).save_user(ORGANIZATION, user_record)
+    return time.perf_counter() - start
+
+
+def stored_users(backend, data_dir):
+    if backend == "legacy":
+        backend = "json"
+    try:
+        data = get_storage(data_dir, backend).get_org_data(ORGANIZATION)
+    except json.JSONDecodeError:
+        return 0
+    return len(data["users"]) if data else 0
+
+
+def run(backend, submitters, workers, existing):
+    data_dir = tempfile.mkdtemp(prefix=f"bench_{backend}_")
+    try:
+        seed_backend = "json" if backend == "legacy" else backend
+        seed = get_storage(data_dir, seed_backend)
+        for i in range(existing):
+            seed.save_user(ORGANIZATION, make_user(-1 - i))
+
+        jobs = [(backend, data_dir, i) for i in range(submitters)]
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            latencies = list(pool.map(submit, jobs))
+        elapsed = time.perf_counter() - start
+
+        failed = sum(1 for latency in latencies if latency is None)
+        latencies = sorted(latency * 1000 for latency in latencies if latency is not None)
+        lost = existing + submitters - stored_users(backend, data_dir)
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+        print(f"{backend:<7} {submitters / elapsed:9.1f} saves/s  "
+              f"p50={statistics.median(latencies) if latencies else 0:8.2f} ms  p95={p95:8.2f} ms  "
+              f"errors={failed:<4} lost={lost}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def check_reader_across_compactions():
+    """True if a reader instance's view matches a fresh one's after another instance
+    compacted the log twice and appended past where the reader stopped"""
+    data_dir = tempfile.mkdtemp(prefix="bench_jsonl_reader_")
+    try:
+        # Separate instances, as in separate processes (get_storage shares one per process)
+        reader, writer = JsonlLogBackend(data_dir), JsonlLogBackend(data_dir)
+        users = realistic_org(COMPACT_MIN_RECORDS, organization=ORGANIZATION)["users"]
+        writer.save_users(ORGANIZATION, users)
+        writer.save_users(ORGANIZATION, users[:COMPACT_MIN_RECORDS // 2])
+        reader.get_org_data(ORGANIZATION)
+        read_size = os.path.getsize(log_path(data_dir))
+        snapshots = {log_snapshot(data_dir)}
+        saves = 0
+        while len(snapshots) < 3 or os.path.getsize(log_path(data_dir)) <= read_size:
+            saves += 1
+            writer.save_user(ORGANIZATION, dict(users[saves % len(users)], timestamp=f"2025-01-02T{saves:08d}"))
+            snapshots.add(log_snapshot(data_dir))
+        expected = JsonlLogBackend(data_dir).get_org_data(ORGANIZATION)["users"]
+        try:
+            ok = reader.get_org_data(ORGANIZATION)["users"] == expected
+        except json.JSONDecodeError:
+            ok = False
+        print(f"jsonl   reader across 2 compactions by another instance ({saves} saves): {'ok' if ok else 'MISMATCH'}")
+        return ok
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def log_path(data_dir):
+    return os.path.join(data_dir, f"{org_key(ORGANIZATION)}.jsonl")
+
+
+def log_snapshot(data_dir):
+    with open(log_path(data_dir)) as f:
+        return json.loads(f.readline())["_meta"]["snapshot"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submitters", type=int, default=300, help="concurrent submissions to one org")
+    parser.add_argument("--workers", type=int, default=32, help="worker processes")
+    parser.add_argument("--existing", type=int, default=500, help="users already stored for the org")
+    parser.add_argument("--backends", default="legacy,json,jsonl")
+    args = parser.parse_args(argv)
+
+    print(f"{args.submitters} submitters, {args.workers} workers, {args.existing} existing users")
+    for backend in args.backends.split(","):
+        run(backend.strip(), args.submitters, args.workers, args.existing)
+    if "jsonl" in args.backends.split(",") and not check_reader_across_compactions():
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
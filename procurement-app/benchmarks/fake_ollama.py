@@ -0,0 +1,131 @@
+"""Minimal fake Ollama HTTP server for offline latency and failure benchmarks.
+
+Implements just enough of the API for the app: GET /api/tags and
+POST /api/generate (streamed NDJSON or a single JSON object).  Latency and
+failures are configurable:
+
+    python benchmarks/fake_ollama.py --port 11434 --first-token 0.5 --token-delay 0.02 --fail-rate 0.1
+
+then point the app at it with OLLAMA_HOST=http://127.0.0.1:11434.  Other
+benchmarks start it in-process with `start_server()`.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = ("Prioritise supplier segmentation, automate purchase-to-pay approvals, "
+         "track savings against baseline, and review contract compliance quarterly.").split()
+
+
+class FakeOllamaConfig:
+    """Behaviour of the fake server; mutable while it runs"""
+
+    def __init__(self, first_token=0.2, token_delay=0.01, tokens=60, fail_rate=0.0, down=False, error_delay=0.0):
+        self.first_token = first_token
+        self.token_delay = token_delay
+        self.tokens = tokens
+        self.fail_rate = fail_rate
+        self.down = down
+        self.error_delay = error_delay
+        self.requests = 0
+        self.lock = threading.Lock()
+
+
+def _handler(config):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _failing(self):
+            if config.down or random.random() < config.fail_rate:
+                time.sleep(config.error_delay)
+                self._json(500, {"error": "fake server failure"})
+                return True
+            return False
+
+        def do_GET(self):
+            if self.path != "/api/tags":
+                return self._json(404, {"error": "not found"})
+            if not self._failing():
+                self._json(200, {"models": [{"name": "llama3.2:latest"}]})
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            with config.lock:
+                config.requests += 1
+            if self.path != "/api/generate":
+                return self._json(404, {"error": "not found"})
+            if self._failing():
+                return
+
+            time.sleep(config.first_token)
+            words = [WORDS[i % len(WORDS)] + " " for i in range(config.tokens)]
+            if not body.get("stream", True):
+                time.sleep(config.token_delay * config.tokens)
+                return self._json(200, {"model": body.get("model"), "response": "".join(words), "done": True})
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for word in words:
+                    self._chunk({"model": body.get("model"), "response": word, "done": False})
+                    time.sleep(config.token_delay)
+                self._chunk({"model": body.get("model"), "response": "", "done": True})
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # Client cancelled the stream
+                self.close_connection = True
+
+        def _chunk(self, payload):
+            data = json.dumps(payload).encode() + b"\n"
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def start_server(port=0, **options):
+    """Run a fake server on a background thread; returns (server, url, config)"""
+    config = FakeOllamaConfig(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-ollama", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--first-token", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="seconds between tokens")
+    parser.add_argument("--tokens", type=int, default=60)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+    parser.add_argument("--error-delay", type=float, default=0.0, help="seconds before a failure is answered")
+    args = parser.parse_args(argv)
+
+    server, url, _ = start_server(args.port, first_token=args.first_token, token_delay=args.token_delay,
+                                  tokens=args.tokens, fail_rate=args.fail_rate, error_delay=args.error_delay)
+    print(f"Fake Ollama listening on {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
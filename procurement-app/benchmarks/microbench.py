@@ -0,0 +1,350 @@
+"""Microbenchmark suite for the non-UI hot paths, with stored results and regression flags.
+
+Cases, by `name[parameters]`:
+
+  * scoring.org_maturity      calculate_org_maturity's engine for both themes at
+                              10 / 1k / 100k respondents: cold (responses frame
+                              built) and cached (a rerun on unchanged data)
+  * storage.save_user         one respondent re-submitting to an organisation of
+                              10 / 1k / 10k respondents, per backend
+  * storage.get_org_data      reading that organisation with nothing cached
+                              (cold) and again with the process state (warm)
+  * storage.org_maturity      the results page's maturity: running aggregates
+                              where the backend keeps them
+  * charts.get_maturity_label labels for every score 0.0 .. 5.0
+  * recommendations.area      score level and static recommendation of every
+                              focus area of both themes (one results page)
+  * recommendations.question  recommendation table of every question
+  * charts.gauge / .radar     the Plotly JSON sent to the browser: figure built
+                              and serialised (rebuilt) and the memoised spec
+
+Organisations come from synthetic.realistic_org and are written through the
+backends (synthetic.write_org), so they have the files the app produces.
+
+Each case is timed like timeit: the loop count grows until one repeat
+takes `--min-time`, then `--repeat` repeats are timed and reported as time
+per call (median and min).  Results are written to
+benchmarks/results/<UTC time>-<commit>.json and compared with the newest
+earlier file there (or `--baseline`).  A case is flagged REGRESSION when
+both its median and its min are more than `--threshold` slower than the
+baseline's, and "faster" when both improved by as much;
+`--fail-on-regression` then exits 1.  Compare runs from the same machine.
+
+Usage (from the procurement-app directory):
+
+    python benchmarks/microbench.py                   # all cases, compared with the last run
+    python benchmarks/microbench.py --quick           # without the largest sizes
+    python benchmarks/microbench.py -k storage --storage sqlite
+    python benchmarks/microbench.py --baseline benchmarks/results/<file>.json --fail-on-regression
+"""
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from functools import lru_cache
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+import plotly.io as pio  # noqa: E402
+
+import charts  # noqa: E402
+from procurement_core import recommendations, scoring  # noqa: E402
+from procurement_core.question_bank import PERFORMANCE_THEME, STP_THEME, get_catalogue  # noqa: E402
+from procurement_core.storage import BACKENDS, get_storage  # noqa: E402
+from synthetic import as_records, realistic_org, write_org  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+RESULTS_VERSION = 1
+SCORING_USERS = (10, 1000, 100000)
+STORAGE_USERS = (10, 1000, 10000)
+MAX_LOOPS = 1000000
+THEMES = (STP_THEME, PERFORMANCE_THEME)
+
+# make() prepares the case's data and returns the function timed per call
+Case = namedtuple("Case", "name params make")
+
+
+def case_id(name, params):
+    if not params:
+        return name
+    return f"{name}[{','.join(f'{key}={value}' for key, value in params.items())}]"
+
+
+def lazy(build):
+    """Zero-argument function returning build(), computed on first call"""
+    return lru_cache(maxsize=None)(build)
+
+
+# -----------------------------
+# Cases
+# -----------------------------
+def scoring_cases(sizes):
+    for users in sizes:
+        org = lazy(lambda users=users: as_records(realistic_org(users, seed=users)))
+
+        def cold(org=org):
+            stored = org()
+
+            def run():
+                scoring.clear_cache()
+                return [scoring.org_maturity(stored, theme) for theme in THEMES]
+            return run
+
+        def cached(org=org):
+            stored = org()
+            scoring.org_maturity(stored, STP_THEME)
+            return lambda: [scoring.org_maturity(stored, theme) for theme in THEMES]
+
+        yield Case("scoring.org_maturity", {"users": users, "frame": "cold"}, cold)
+        yield Case("scoring.org_maturity", {"users": users, "frame": "cached"}, cached)
+
+
+def storage_cases(sizes, kinds, root):
+    for kind in kinds:
+        for users in sizes:
+            def setup(kind=kind, users=users):
+                org = realistic_org(users, seed=users)
+                storage = get_storage(tempfile.mkdtemp(prefix=f"{kind}_{users}_", dir=root), kind)
+                write_org(storage, org)
+                return storage, org
+
+            env = lazy(setup)
+
+            def save_user(env=env):
+                storage, org = env()
+                resubmissions = iter(range(sys.maxsize))
+
+                def run():
+                    # Re-submissions keep the organisation at its size
+                    i = next(resubmissions)
+                    user = dict(org["users"][i % len(org["users"])], timestamp=f"2025-07-01T00:00:{i % 60:02d}")
+                    storage.save_user(org["organization"], user)
+                return run
+
+            def cold_read(env=env):
+                storage, org = env()
+
+                def run():
+                    storage.release(org["organization"])
+                    return storage.get_org_data(org["organization"])
+                return run
+
+            def warm_read(env=env):
+                storage, org = env()
+                storage.get_org_data(org["organization"])
+                return lambda: storage.get_org_data(org["organization"])
+
+            def maturity(env=env):
+                storage, org = env()
+                org_data = storage.get_org_data(org["organization"])
+                return lambda: [scoring.stored_org_maturity(storage, org_data, theme) for theme in THEMES]
+
+            params = {"backend": kind, "users": users}
+            yield Case("storage.save_user", params, save_user)
+            yield Case("storage.get_org_data", dict(params, state="cold"), cold_read)
+            yield Case("storage.get_org_data", dict(params, state="warm"), warm_read)
+            yield Case("storage.org_maturity", params, maturity)
+
+
+def lookup_cases():
+    catalogue = get_catalogue()
+    areas = [(theme, area) for theme in THEMES for area in catalogue.focus_areas(theme)]
+    question_ids = [catalogue.question_id(theme, area, question["question"])
+                    for theme, area in areas for question in catalogue.questions(theme, area)]
+    scores = [round(i / 10, 1) for i in range(51)]
+
+    def labels():
+        return lambda: [charts.get_maturity_label(score) for score in scores]
+
+    def area_recommendations():
+        def run():
+            return [catalogue.area_recommendations(theme, area).get(recommendations.area_score_level(theme, 3.4),
+                                                                    "No recommendation available")
+                    for theme, area in areas]
+        return run
+
+    def question_recommendations():
+        return lambda: [catalogue.question_recommendations(question_id).get("3") for question_id in question_ids]
+
+    yield Case("charts.get_maturity_label", {"scores": len(scores)}, labels)
+    yield Case("recommendations.area", {"areas": len(areas)}, area_recommendations)
+    yield Case("recommendations.question", {"questions": len(question_ids)}, question_recommendations)
+
+
+def chart_cases():
+    catalogue = get_catalogue()
+    benchmarks = catalogue.industry_standards[STP_THEME]
+    scores = {area: round(2.1 + 0.4 * i, 1) for i, area in enumerate(benchmarks)}
+    title = "Organization's Overall Maturity"
+
+    def rebuilt_gauge():
+        return pio.to_json(charts.create_gauge_chart(3.4, title), validate=False)
+
+    def rebuilt_radar():
+        return pio.to_json(charts.create_radar_chart(scores, benchmarks), validate=False)
+
+    yield Case("charts.gauge", {"build": "rebuilt"}, lambda: rebuilt_gauge)
+    yield Case("charts.gauge", {"build": "memoised"}, lambda: lambda: charts.gauge_chart_spec(3.4, title))
+    yield Case("charts.radar", {"build": "rebuilt"}, lambda: rebuilt_radar)
+    yield Case("charts.radar", {"build": "memoised"}, lambda: lambda: charts.radar_chart_spec(scores, benchmarks))
+
+
+# -----------------------------
+# Timing
+# -----------------------------
+def _time_loops(fn, loops):
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        return time.perf_counter() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def measure(fn, repeat, min_time):
+    """{"median", "min", "max"} seconds per call, with the loops and repeats used"""
+    loops = 1
+    while True:
+        elapsed = _time_loops(fn, loops)
+        if elapsed >= min_time or loops >= MAX_LOOPS:
+            break
+        loops = min(MAX_LOOPS, loops * (10 if elapsed < min_time / 10 else 2))
+    samples = [_time_loops(fn, loops) / loops for _ in range(repeat)]
+    return {"median": statistics.median(samples), "min": min(samples), "max": max(samples),
+            "loops": loops, "repeat": repeat}
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit:<2}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+# -----------------------------
+# Results
+# -----------------------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def display_path(path):
+    relative = os.path.relpath(path)
+    return path if relative.startswith("..") else relative
+
+
+def latest_results(directory):
+    files = sorted(glob.glob(os.path.join(directory, "*.json")))
+    return files[-1] if files else None
+
+
+def compare(result, baseline, threshold):
+    """("REGRESSION" | "faster" | "", median ratio) of a case against its baseline"""
+    ratio = result["median"] / baseline["median"]
+    min_ratio = result["min"] / baseline["min"]
+    if ratio > 1 + threshold and min_ratio > 1 + threshold:
+        return "REGRESSION", ratio
+    if ratio < 1 / (1 + threshold) and min_ratio < 1 / (1 + threshold):
+        return "faster", ratio
+    return "", ratio
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="filters", action="append", default=[],
+                        help="only cases whose id contains this text (repeatable)")
+    parser.add_argument("--list", action="store_true", help="list the case ids and exit")
+    parser.add_argument("--quick", action="store_true", help="skip the largest organisation sizes")
+    parser.add_argument("--users", type=int, nargs="+", default=None,
+                        help=f"respondents for scoring cases (default {' '.join(map(str, SCORING_USERS))})")
+    parser.add_argument("--org-users", type=int, nargs="+", default=None,
+                        help=f"respondents for storage cases (default {' '.join(map(str, STORAGE_USERS))})")
+    parser.add_argument("--storage", nargs="+", choices=sorted(BACKENDS), default=sorted(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per repeat")
+    parser.add_argument("--results-dir", default=RESULTS_DIR)
+    parser.add_argument("--baseline", default=None, help="results file to compare with (default: the latest)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown flagged as a regression")
+    parser.add_argument("--no-save", action="store_true", help="do not write a results file")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if a case regressed")
+    args = parser.parse_args(argv)
+
+    scoring_users = args.users or (SCORING_USERS[:-1] if args.quick else SCORING_USERS)
+    storage_users = args.org_users or (STORAGE_USERS[:-1] if args.quick else STORAGE_USERS)
+
+    baseline_path = args.baseline or latest_results(args.results_dir)
+    baseline = {}
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline_run = json.load(f)
+        baseline = baseline_run["results"]
+        if (baseline_run.get("python"), baseline_run.get("machine")) != (platform.python_version(), platform.machine()):
+            print(f"note: baseline ran on Python {baseline_run.get('python')} / {baseline_run.get('machine')}")
+
+    def selected(case):
+        return not args.filters or any(text in case_id(case.name, case.params) for text in args.filters)
+
+    root = tempfile.mkdtemp(prefix="microbench_")
+    results, flagged = {}, []
+    try:
+        groups = (scoring_cases(scoring_users), storage_cases(storage_users, args.storage, root),
+                  lookup_cases(), chart_cases())
+        if baseline_path and not args.list:
+            print(f"baseline: {display_path(baseline_path)}")
+        for group in groups:
+            for case in filter(selected, group):
+                name = case_id(case.name, case.params)
+                if args.list:
+                    print(name)
+                    continue
+                result = measure(case.make(), args.repeat, args.min_time)
+                results[name] = result
+                line = f"{name:<62} median {format_time(result['median'])}  min {format_time(result['min'])}"
+                if name in baseline:
+                    flag, ratio = compare(result, baseline[name], args.threshold)
+                    line += f"  {ratio:5.2f}x {flag}"
+                    if flag == "REGRESSION":
+                        flagged.append(name)
+                print(line, flush=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    if args.list:
+        return 0
+
+    if not args.no_save and results:
+        commit = git_commit()
+        created = datetime.now(timezone.utc)
+        os.makedirs(args.results_dir, exist_ok=True)
+        path = os.path.join(args.results_dir, f"{created:%Y%m%dT%H%M%SZ}-{commit or 'nogit'}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": RESULTS_VERSION, "created": created.isoformat(timespec="seconds"),
+                       "commit": commit, "python": platform.python_version(), "machine": platform.machine(),
+                       "platform": platform.platform(), "cpus": os.cpu_count(), "threshold": args.threshold,
+                       "results": results}, f, indent=2)
+        print(f"results: {display_path(path)}")
+    if flagged:
+        print(f"{len(flagged)} regression(s) over {args.threshold:.0%}: {', '.join(flagged)}")
+    return 1 if flagged and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
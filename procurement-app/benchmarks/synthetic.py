@@ -0,0 +1,149 @@
+"""Synthetic respondents and organisations for the benchmarks.
+
+  * synthetic_org   - `users` Source-To-Pay and `users` Performance
+                      respondents answering every question uniformly at
+                      random (the scoring and record-format benchmarks)
+  * realistic_org   - an organisation as the app builds one: a mix of
+                      Source-To-Pay (a random subset of focused areas),
+                      Procurement Performance and combined assessments,
+                      with answers clustered around the organisation's
+                      maturity and each area's strengths, a spread of
+                      designations and submissions over a year
+  * write_org       - store an organisation through a storage backend, in
+                      batches, producing the same files the app writes
+
+Generated users are the dicts save_response stores; `as_records` converts
+them to the records.UserRecord form the backends return.
+"""
+import random
+from datetime import datetime, timedelta
+
+from procurement_core.question_bank import PERFORMANCE_THEME, STP_THEME, get_catalogue
+from procurement_core.records import get_codec
+
+DESIGNATIONS = (("Procurement Manager", 30), ("Buyer", 25), ("Category Manager", 15), ("Analyst", 15),
+                ("CPO", 5), ("Finance Controller", 5), ("Operations Lead", 5))
+# Share of respondents per assessment mode
+MODE_WEIGHTS = (("stp", 50), ("perf", 30), ("combined", 20))
+LAST_SUBMISSION = datetime(2025, 6, 30, 17, 0)
+
+
+def synthetic_org(users, seed=0):
+    """Org data with `users` Source-To-Pay and `users` Performance respondents,
+    as the app's submission dicts"""
+    rng = random.Random(seed)
+    catalogue = get_catalogue()
+    records = []
+    for i in range(users):
+        responses = []
+        for area in catalogue.focus_areas(STP_THEME):
+            for question in catalogue.questions(STP_THEME, area):
+                choice = rng.choice(question["responses"])
+                responses.append({"question": question["question"], "focused_area": area,
+                                  "selected_text": choice["text"], "score": choice["score"]})
+        records.append({"name": f"S{i}", "email": f"s{i}@example.com", "theme": STP_THEME,
+                        "responses": responses, "timestamp": "2025-01-01T00:00:00"})
+    for i in range(users):
+        responses = []
+        for question in catalogue.performance_questions.values():
+            score = rng.randint(1, len(question["options"]))
+            responses.append({"question": question["question"], "response": question["options"][score - 1],
+                              "score": score, "focus_area": question["focus_area"]})
+        records.append({"name": f"P{i}", "email": f"p{i}@example.com", "theme": PERFORMANCE_THEME,
+                        "responses": responses, "timestamp": "2025-01-01T00:00:00"})
+    return {"organization": "Bench Org", "users": records}
+
+
+def as_records(org_data):
+    """The same org data with users as records.UserRecord, as storage returns them"""
+    codec = get_codec()
+    return {"organization": org_data["organization"], "users": [codec.user_record(u) for u in org_data["users"]]}
+
+
+# -----------------------------
+# Realistic organisations
+# -----------------------------
+class _Respondent:
+    """Picks answers around an organisation's maturity, an area's offset and a personal bias"""
+
+    def __init__(self, rng, level, area_offsets):
+        self.rng = rng
+        self.level = level + rng.gauss(0, 0.4)
+        self.area_offsets = area_offsets
+
+    def pick(self, area, options):
+        """(text, score) nearest to this respondent's view of the area"""
+        target = self.level + self.area_offsets[area] + self.rng.gauss(0, 0.8)
+        best = min(abs(score - target) for _, score in options)
+        return self.rng.choice([option for option in options if abs(option[1] - target) == best])
+
+
+def _stp_responses(respondent, catalogue, areas):
+    responses = []
+    for area in areas:
+        for question in catalogue.questions(STP_THEME, area):
+            text, score = respondent.pick(area, [(r["text"], r["score"]) for r in question["responses"]])
+            responses.append({"question": question["question"], "focused_area": area,
+                              "selected_text": text, "score": score})
+    return responses
+
+
+def _performance_responses(respondent, catalogue):
+    responses = []
+    for question in catalogue.performance_questions.values():
+        options = [(text, number) for number, text in enumerate(question["options"], 1)]
+        text, score = respondent.pick(question["focus_area"], options)
+        responses.append({"question": question["question"], "response": text,
+                          "score": score, "focus_area": question["focus_area"]})
+    return responses
+
+
+def _combined_responses(respondent, catalogue):
+    responses = []
+    for section in catalogue.assessment_sections((STP_THEME, PERFORMANCE_THEME)):
+        for question in section.questions:
+            text, score = respondent.pick(section.area, question.options)
+            responses.append({"theme": section.theme, "focused_area": section.area, "question": question.text,
+                              "selected_text": text, "score": score})
+    return responses
+
+
+def realistic_org(users, seed=0, organization="Bench Org"):
+    """Org data with `users` respondents across all assessment modes, as the app's submission dicts"""
+    rng = random.Random(seed)
+    catalogue = get_catalogue()
+    stp_areas = catalogue.focus_areas(STP_THEME)
+    level = rng.uniform(1.5, 4.2)
+    area_offsets = {area: rng.gauss(0, 0.5)
+                    for theme in (STP_THEME, PERFORMANCE_THEME) for area in catalogue.focus_areas(theme)}
+    modes, mode_weights = zip(*MODE_WEIGHTS)
+    designations, designation_weights = zip(*DESIGNATIONS)
+
+    records = []
+    for i in range(users):
+        respondent = _Respondent(rng, level, area_offsets)
+        mode = rng.choices(modes, mode_weights)[0]
+        record = {
+            "name": f"Respondent {i}",
+            "email": f"respondent{i}@{seed}.example.com",
+            "designation": rng.choices(designations, designation_weights)[0],
+            "timestamp": (LAST_SUBMISSION - timedelta(minutes=rng.randrange(365 * 24 * 60))).isoformat()
+        }
+        if mode == "stp":
+            areas = [area for area in stp_areas if area in rng.sample(stp_areas, rng.randint(1, len(stp_areas)))]
+            record.update(theme=STP_THEME, responses=_stp_responses(respondent, catalogue, areas))
+        elif mode == "perf":
+            record.update(theme=PERFORMANCE_THEME, responses=_performance_responses(respondent, catalogue))
+        else:
+            record.update(theme="Combined Assessment", responses=_combined_responses(respondent, catalogue))
+            record["user_info"] = {"name": record["name"], "email": record["email"],
+                                   "designation": record["designation"], "organization": organization}
+        records.append(record)
+    return {"organization": organization, "users": records}
+
+
+def write_org(storage, org_data, batch=1000):
+    """Store an organisation's users through `storage`, `batch` users per write"""
+    users = org_data["users"]
+    for start in range(0, len(users), batch):
+        storage.save_users(org_data["organization"], users[start:start + batch])
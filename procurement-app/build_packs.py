@@ -0,0 +1,136 @@
+"""Build precomputed recommendation packs for every organisation.
+
+    python build_packs.py                       # all organisations in procurement_data
+    python build_packs.py --workers 8 --no-llm  # scores and static recommendations only
+    python build_packs.py --org "Acme Corp" --force
+
+Each organisation's scores, static recommendations and LLM recommendations
+are computed in a worker process and written to
+`<data dir>/packs/<org>.json` (see procurement_core/recommendations.py),
+which the results page reads instead of generating at render time.
+
+The job can be interrupted and re-run: organisations whose pack is already
+current (same pack version, model, options and stored responses, and no
+missing LLM sections) are skipped, and generations finished before the
+interruption are served from the shared LLM cache.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from llm_cache import get_llm_cache
+from llm_client import get_ollama
+from procurement_core import recommendations, scoring
+from procurement_core.question_bank import get_catalogue
+from procurement_core.storage import get_storage
+
+LLM_CACHE_FILE = "llm_cache.db"
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def _init_worker(data_dir, storage_kind, use_llm, model, options):
+    _worker.update(
+        data_dir=data_dir,
+        storage=get_storage(data_dir, storage_kind),
+        catalogue=get_catalogue(),
+        model=model,
+        options=options,
+        use_llm=use_llm
+    )
+    if use_llm:
+        _worker["client"] = get_ollama(probe=False)
+        _worker["cache"] = get_llm_cache(os.path.join(data_dir, LLM_CACHE_FILE))
+
+
+def _maturity(org_data, theme):
+    return scoring.stored_org_maturity(_worker["storage"], org_data, theme)
+
+
+def _generate(prompt):
+    """Cache-first generation, sharing the results page's LLM cache entries"""
+    model, options, cache = _worker["model"], _worker["options"], _worker["cache"]
+    full_prompt = recommendations.full_prompt(prompt)
+    cached = cache.get(model, full_prompt, options)
+    if cached is not None:
+        return cached
+    response = _worker["client"].generate(model=model, prompt=full_prompt, options=options)
+    text = response["response"].strip()
+    cache.put(model, full_prompt, text, options)
+    return text
+
+
+def is_current(pack, org_data, model, options, use_llm):
+    """Whether an existing pack can be kept as it is"""
+    return (pack is not None
+            and pack.get("model") == model
+            and pack.get("options") == options
+            and pack.get("source") == recommendations.source_fingerprint(org_data)
+            and (not use_llm or recommendations.pack_complete(pack)))
+
+
+def build_org(organization, force=False):
+    """Build and save one organisation's pack; returns (organization, status, seconds)"""
+    try:
+        start = time.perf_counter()
+        data_dir, model, options, use_llm = (_worker[k] for k in ("data_dir", "model", "options", "use_llm"))
+        org_data = _worker["storage"].get_org_data(organization)
+        if not org_data or not org_data.get("users"):
+            return organization, "empty", 0.0
+
+        if not force and is_current(recommendations.load_pack(data_dir, organization), org_data, model, options, use_llm):
+            return organization, "current", time.perf_counter() - start
+
+        pack = recommendations.build_pack(org_data, _worker["catalogue"], _maturity,
+                                          generate=_generate if use_llm else None, model=model, options=options)
+        recommendations.save_pack(data_dir, pack)
+        status = "built" if not use_llm or recommendations.pack_complete(pack) else "partial"
+        return organization, status, time.perf_counter() - start
+    finally:
+        # A worker sees many organisations: keep only the current one in memory
+        _worker["storage"].release(organization)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build precomputed recommendation packs")
+    parser.add_argument("--data-dir", default="procurement_data")
+    parser.add_argument("--storage", default=None, help="storage backend (default: $PROCUREMENT_STORAGE or jsonl)")
+    parser.add_argument("--org", action="append", help="only these organisations (repeatable)")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="worker processes; also the number of concurrent LLM calls")
+    parser.add_argument("--no-llm", action="store_true", help="skip LLM recommendations")
+    parser.add_argument("--model", default=recommendations.LLM_MODEL)
+    parser.add_argument("--force", action="store_true", help="rebuild packs that are already current")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.data_dir):
+        print(f"No data directory at {args.data_dir}")
+        return 1
+
+    organizations = args.org or get_storage(args.data_dir, args.storage).list_organizations()
+    init_args = (args.data_dir, args.storage, not args.no_llm, args.model, recommendations.LLM_OPTIONS)
+
+    start = time.perf_counter()
+    counts = {}
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=init_args) as pool:
+        futures = [pool.submit(build_org, organization, args.force) for organization in organizations]
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                organization, status, seconds = future.result()
+                counts[status] = counts.get(status, 0) + 1
+                print(f"[{done}/{len(futures)}] {organization}: {status} ({seconds:.1f}s)")
+        except KeyboardInterrupt:
+            pool.shutdown(wait=False, cancel_futures=True)
+            print("Interrupted - run again to resume; finished packs are kept")
+            return 130
+
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+    print(f"{len(organizations)} organisation(s) in {time.perf_counter() - start:.1f}s: {summary or 'nothing to do'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""Headless PNG/SVG rendering of the results charts with matplotlib.
+
+Reports and emails need the gauge, radar and per-area charts as static
+images, without a browser.  Figures are drawn with matplotlib's
+object-oriented API on the Agg/SVG canvases (no pyplot global state, so
+renderers are safe to use from threads and worker processes).
+
+Rendered images are cached by a hash of (chart kind, inputs, format,
+RENDER_VERSION): a per-process LRU in memory and, if `cache_dir` is given,
+one file per image on disk shared by every process.  Identical inputs -
+common, as scores are rounded to one decimal - are drawn once.
+"""
+import hashlib
+import io
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle, Wedge
+
+from procurement_core.maturity import MATURITY_COLORS, MATURITY_RANGES, get_maturity_label
+
+# Bump when drawing code changes so cached images are not reused
+RENDER_VERSION = 1
+FORMATS = ("png", "svg")
+DEFAULT_DPI = 110
+DEFAULT_MEMORY_SIZE = 128
+
+ORG_COLOR = "#1f4e9c"
+INDUSTRY_COLOR = "#f28e2b"
+
+
+# -----------------------------
+# Drawing
+# -----------------------------
+def draw_gauge(value, title, max_value=5.0):
+    """Semicircular maturity gauge with the five stage bands and a needle"""
+    fig = Figure(figsize=(5, 3.2))
+    ax = fig.add_subplot()
+    ax.set_aspect("equal")
+    ax.axis("off")
+
+    def angle(v):
+        return math.pi * (1 - min(max(v, 0), max_value) / max_value)
+
+    for stage, (low, high) in MATURITY_RANGES.items():
+        start, end = math.degrees(angle(high)), math.degrees(angle(low))
+        ax.add_patch(Wedge((0, 0), 1.0, start, end, width=0.35, facecolor=MATURITY_COLORS[stage], edgecolor="white"))
+        mid = angle((low + high) / 2)
+        ax.text(1.12 * math.cos(mid), 1.12 * math.sin(mid), stage, ha="center", va="center", fontsize=7)
+
+    a = angle(value)
+    ax.plot([0, 0.85 * math.cos(a)], [0, 0.85 * math.sin(a)], color="#333333", linewidth=3)
+    ax.add_patch(Circle((0, 0), 0.05, color="#333333"))
+    ax.text(0, -0.18, f"{value:.1f}", ha="center", va="center", fontsize=20, fontweight="bold")
+    ax.text(0, -0.38, get_maturity_label(value), ha="center", va="center", fontsize=10, color="gray")
+    ax.set_title(title, fontsize=11)
+    ax.set_xlim(-1.3, 1.3)
+    ax.set_ylim(-0.5, 1.25)
+    return fig
+
+
+def draw_radar(scores, benchmarks, title="Maturity Comparison"):
+    """Organisation vs industry polygon over the given themes / areas"""
+    labels = list(scores)
+    angles = [2 * math.pi * i / len(labels) for i in range(len(labels))]
+    closed = angles + angles[:1]
+
+    fig = Figure(figsize=(6, 6))
+    ax = fig.add_subplot(projection="polar")
+    for values, name, color, alpha in (
+        ([scores[label] for label in labels], "Your Organization", ORG_COLOR, 0.35),
+        ([benchmarks.get(label, 0) for label in labels], "Industry Standard", INDUSTRY_COLOR, 0.2),
+    ):
+        ax.plot(closed, values + values[:1], color=color, linewidth=2, marker="o", label=name)
+        ax.fill(closed, values + values[:1], color=color, alpha=alpha)
+
+    ax.set_xticks(angles)
+    ax.set_xticklabels(labels, fontsize=8)
+    ax.set_ylim(0, 5)
+    ax.set_yticks([1, 2, 3, 4, 5])
+    ax.set_title(title, fontsize=11, pad=20)
+    ax.legend(loc="upper center", bbox_to_anchor=(0.5, -0.06), ncol=2, fontsize=8, frameon=False)
+    fig.tight_layout()
+    return fig
+
+
+def draw_area_bars(scores, benchmarks, title="Focus Area Scores"):
+    """Horizontal bars of each area's score next to its industry benchmark"""
+    labels = list(scores)
+    positions = range(len(labels))
+    fig = Figure(figsize=(7, 0.55 * len(labels) + 1.4))
+    ax = fig.add_subplot()
+    ax.barh([p - 0.2 for p in positions], [scores[label] for label in labels], height=0.4,
+            color=ORG_COLOR, label="Your Organization")
+    ax.barh([p + 0.2 for p in positions], [benchmarks.get(label, 0) for label in labels], height=0.4,
+            color=INDUSTRY_COLOR, label="Industry Standard")
+    ax.set_yticks(list(positions))
+    ax.set_yticklabels(labels, fontsize=8)
+    ax.invert_yaxis()
+    ax.set_xlim(0, 5)
+    ax.set_title(title, fontsize=11)
+    ax.legend(loc="upper center", bbox_to_anchor=(0.5, -0.12), ncol=2, fontsize=8, frameon=False)
+    fig.tight_layout()
+    return fig
+
+
+DRAWERS = {"gauge": draw_gauge, "radar": draw_radar, "area_bars": draw_area_bars}
+
+
+def to_bytes(fig, fmt="png", dpi=DEFAULT_DPI):
+    """Serialise a matplotlib figure; metadata is fixed so output is reproducible"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported image format: {fmt}")
+    buffer = io.BytesIO()
+    metadata = {"Date": None} if fmt == "svg" else {"Software": None}
+    fig.savefig(buffer, format=fmt, dpi=dpi, metadata=metadata, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+# -----------------------------
+# Cached renderer
+# -----------------------------
+def image_key(kind, fmt, args):
+    """sha256 of the canonical JSON of a chart request"""
+    # Not key-sorted: the order of areas in a mapping is part of the chart
+    payload = json.dumps([RENDER_VERSION, kind, fmt, args], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ChartRenderer:
+    """Renders charts to image bytes through a memory LRU and optional disk cache"""
+
+    def __init__(self, cache_dir=None, memory_size=DEFAULT_MEMORY_SIZE, dpi=DEFAULT_DPI):
+        self.cache_dir = cache_dir
+        self.memory_size = memory_size
+        self.dpi = dpi
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def render(self, kind, fmt="png", **args):
+        """Image bytes of DRAWERS[kind](**args)"""
+        key = image_key(kind, fmt, args)
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+
+        path = os.path.join(self.cache_dir, f"{key}.{fmt}") if self.cache_dir else None
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+            hit = True
+        else:
+            data = to_bytes(DRAWERS[kind](**args), fmt, self.dpi)
+            hit = False
+            if path:
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self._memory[key] = data
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+        return data
+
+    def gauge(self, value, title, fmt="png"):
+        return self.render("gauge", fmt, value=round(float(value), 2), title=title)
+
+    def radar(self, scores, benchmarks, title="Maturity Comparison", fmt="png"):
+        return self.render("radar", fmt, scores=_floats(scores), benchmarks=_floats(benchmarks, scores), title=title)
+
+    def area_bars(self, scores, benchmarks, title="Focus Area Scores", fmt="png"):
+        return self.render("area_bars", fmt, scores=_floats(scores), benchmarks=_floats(benchmarks, scores), title=title)
+
+
+def _floats(values, keys=None):
+    """Plain-float copy of a score mapping (only `keys` if given), keeping order"""
+    return {k: float(values.get(k, 0)) for k in (keys if keys is not None else values)}
+
+
+def org_charts(renderer, theme, maturity, industry, fmt="png"):
+    """{chart name: image bytes} for one theme of an organisation's results"""
+    return {
+        "gauge": renderer.gauge(maturity["overall"], f"{theme}: Overall Maturity", fmt),
+        "radar": renderer.radar(maturity["by_area"], industry, f"{theme}: Comparison with Industry Standards", fmt),
+        "areas": renderer.area_bars(maturity["by_area"], industry, f"{theme}: Focus Area Scores", fmt)
+    }
+
+
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+
+def get_renderer(cache_dir=None, **kwargs):
+    """Process-wide ChartRenderer for `cache_dir` (created on first use)"""
+    key = os.path.abspath(cache_dir) if cache_dir else None
+    with _renderers_lock:
+        renderer = _renderers.get(key)
+        if renderer is None:
+            renderer = _renderers[key] = ChartRenderer(cache_dir, **kwargs)
+        return renderer
@@ -0,0 +1,169 @@
+"""Plotly chart builders for the results page.
+
+The builders are pure functions of their numeric inputs (no Streamlit
+calls).  `create_*_chart` return a new Figure; `*_chart_spec` return the
+figure serialised to Plotly JSON, memoised in bounded, process-wide LRU
+caches.  Scores are rounded to one decimal, so sessions showing the same
+organisation or the same score profile get the already-serialised spec
+instead of building, validating and serialising a figure on every rerun
+(the results page renders specs directly, see app6.show_chart_spec).
+"""
+from functools import lru_cache
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from procurement_core.instrumentation import timed
+from procurement_core.maturity import MATURITY_COLORS, MATURITY_RANGES, get_maturity_label
+
+# Distinct serialised figures kept per chart type
+CHART_CACHE_SIZE = 256
+
+# Shown with the radar chart
+MATURITY_LEVELS_CAPTION = """
+    **Maturity Levels:**  
+    • 1-2: Latent (Initial/Ad-hoc)  
+    • 2-3: Discovery (Developing)  
+    • 3-4: Reactive (Defined)  
+    • 4-5: Proactive (Managed/Optimized)
+    """
+
+
+def create_gauge_chart(value, title, max_value=5.0):
+    """Creates a Plotly Gauge Chart for overall maturity."""
+    return _gauge_chart(float(value), title, float(max_value))
+
+
+@timed("chart", chart="gauge")
+def gauge_chart_spec(value, title, max_value=5.0):
+    """Plotly JSON of create_gauge_chart (memoised)"""
+    return _gauge_chart_spec(float(value), title, float(max_value))
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _gauge_chart_spec(value, title, max_value):
+    return pio.to_json(_gauge_chart(value, title, max_value), validate=False)
+
+
+def _gauge_chart(value, title, max_value):
+    ranges = MATURITY_RANGES
+    colors = MATURITY_COLORS
+    
+    # Determine current stage and color
+    current_stage = get_maturity_label(value)
+    current_color = colors.get(current_stage, "#CCCCCC") # Default to grey if not found
+
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number+delta",
+        value = value,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': f"<span style='font-size:1.2em'>{title}</span><br><span style='font-size:0.9em;color:gray'>{current_stage}</span>"},
+        delta = {'reference': max_value / 2, 'decreasing': {'color': 'red'}, 'increasing': {'color': 'green'}},
+        gauge = {
+            'axis': {'range': [None, max_value], 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': current_color},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': ranges["Latent"], 'color': colors["Latent"], 'name': 'Latent'},
+                {'range': ranges["Discovery"], 'color': colors["Discovery"], 'name': 'Discovery'},
+                {'range': ranges["Reactive"], 'color': colors["Reactive"], 'name': 'Reactive'},
+                {'range': ranges["Proactive"], 'color': colors["Proactive"], 'name': 'Proactive'},
+                {'range': ranges["Strategic Value"], 'color': colors["Strategic Value"], 'name': 'Strategic Value'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': value
+            }}
+    ))
+
+    fig.update_layout(height=250, margin=dict(l=10, r=10, t=50, b=10))
+    return fig
+
+
+def _radar_inputs(theme_scores, theme_benchmarks):
+    themes = tuple(theme_scores)
+    return (themes,
+            tuple(float(theme_scores[theme]) for theme in themes),
+            tuple(float(theme_benchmarks.get(theme, 0)) for theme in themes))
+
+
+def create_radar_chart(theme_scores, theme_benchmarks):
+    """Creates a Plotly Radar Chart for theme-wise comparison."""
+    return _radar_chart(*_radar_inputs(theme_scores, theme_benchmarks))
+
+
+@timed("chart", chart="radar")
+def radar_chart_spec(theme_scores, theme_benchmarks):
+    """Plotly JSON of create_radar_chart (memoised)"""
+    return _radar_chart_spec(*_radar_inputs(theme_scores, theme_benchmarks))
+
+
+@lru_cache(maxsize=CHART_CACHE_SIZE)
+def _radar_chart_spec(themes, scores, benchmarks):
+    return pio.to_json(_radar_chart(themes, scores, benchmarks), validate=False)
+
+
+def _radar_chart(themes, scores, benchmarks):
+    # Add the first point again to close the loop in the radar chart
+    r_org = list(scores) + [scores[0]]
+    r_industry = list(benchmarks) + [benchmarks[0]]
+    theta_labels = list(themes) + [themes[0]] # Labels for theta axis
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatterpolar(
+          r=r_org,
+          theta=theta_labels,
+          fill='toself',
+          name='Your Organization',
+          line_color='blue',
+          opacity=0.7,
+          hoverinfo='text+name+r',
+          mode='lines+markers'
+    ))
+    fig.add_trace(go.Scatterpolar(
+          r=r_industry,
+          theta=theta_labels,
+          fill='toself',
+          name='Industry Standard',
+          line_color='orange',
+          opacity=0.4,
+          hoverinfo='text+name+r',
+          mode='lines+markers'
+    ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 5],
+                tickvals=[0, 1, 2, 3, 4, 5],
+                ticktext=['0', '1', '2', '3', '4', '5']  # Simplified labels
+            )),
+        showlegend=True,
+        title="Maturity Comparison by Theme",
+        height=550,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=-0.2,
+            xanchor="center",
+            x=0.5
+        )
+    )
+    
+    return fig
+
+
+def cache_info():
+    """Hit/miss statistics of both spec caches"""
+    return {"gauge": _gauge_chart_spec.cache_info(), "radar": _radar_chart_spec.cache_info()}
+
+
+def clear_cache():
+    """Drop all memoised specs"""
+    _gauge_chart_spec.cache_clear()
+    _radar_chart_spec.cache_clear()
@@ -0,0 +1,124 @@
+"""Export one self-contained report per organisation.
+
+    python export_reports.py                              # HTML for every organisation
+    python export_reports.py --format pdf --workers 8 --out exports/reports
+    python export_reports.py --org "Acme Corp" --format html --format pdf
+
+Reports are written to `<out>/<org>.<format>` (default out: `<data dir>/reports`).
+Organisations are read one at a time in worker processes, so memory stays
+bounded by `--workers` organisations however many there are: only a small
+window of organisations is queued at once, each worker is replaced after
+`--tasks-per-worker` organisations, and nothing but a status line comes
+back to the parent.  Reports include LLM recommendations where a current
+recommendation pack exists (run build_packs.py first).
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from chart_images import get_renderer
+from procurement_core import recommendations
+from procurement_core.question_bank import get_catalogue
+from procurement_core.storage import get_storage, org_key
+from reports import org_report, render_html, render_pdf
+
+CHART_CACHE_DIR = "chart_cache"
+FORMATS = ("html", "pdf")
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def _init_worker(data_dir, storage_kind, out_dir, formats):
+    _worker.update(
+        data_dir=data_dir,
+        storage=get_storage(data_dir, storage_kind),
+        catalogue=get_catalogue(),
+        renderer=get_renderer(os.path.join(data_dir, CHART_CACHE_DIR)),
+        out_dir=out_dir,
+        formats=formats
+    )
+
+
+def export_org(organization):
+    """Write one organisation's reports; returns (organization, files written, seconds)"""
+    try:
+        start = time.perf_counter()
+        org_data = _worker["storage"].get_org_data(organization)
+        if not org_data or not org_data.get("users"):
+            return organization, 0, 0.0
+
+        pack = recommendations.load_pack(_worker["data_dir"], organization)
+        report = org_report(org_data, _worker["storage"], _worker["catalogue"], pack)
+        base = os.path.join(_worker["out_dir"], org_key(organization))
+        for fmt in _worker["formats"]:
+            tmp = f"{base}.{fmt}.tmp"
+            if fmt == "html":
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(render_html(report, _worker["renderer"]))
+            else:
+                render_pdf(report, _worker["renderer"], tmp)
+            os.replace(tmp, f"{base}.{fmt}")
+        return organization, len(_worker["formats"]), time.perf_counter() - start
+    finally:
+        # A worker sees many organisations: keep only the current one in memory
+        _worker["storage"].release(organization)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export per-organisation maturity reports")
+    parser.add_argument("--data-dir", default="procurement_data")
+    parser.add_argument("--storage", default=None, help="storage backend (default: $PROCUREMENT_STORAGE or jsonl)")
+    parser.add_argument("--out", default=None, help="output directory (default: <data dir>/reports)")
+    parser.add_argument("--format", action="append", choices=FORMATS, help="report format (repeatable, default html)")
+    parser.add_argument("--org", action="append", help="only these organisations (repeatable)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--tasks-per-worker", type=int, default=200,
+                        help="organisations a worker exports before it is replaced")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.data_dir):
+        print(f"No data directory at {args.data_dir}")
+        return 1
+    out_dir = args.out or os.path.join(args.data_dir, "reports")
+    os.makedirs(out_dir, exist_ok=True)
+
+    organizations = args.org or get_storage(args.data_dir, args.storage).list_organizations()
+    init_args = (args.data_dir, args.storage, out_dir, tuple(args.format or ["html"]))
+    window = 2 * args.workers
+
+    start = time.perf_counter()
+    files = done = failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=init_args,
+                             max_tasks_per_child=args.tasks_per_worker) as pool:
+        queue = iter(organizations)
+        pending = set()
+        while True:
+            # Keep only a small window of organisations in flight
+            for organization in queue:
+                pending.add(pool.submit(export_org, organization))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done += 1
+                try:
+                    organization, written, seconds = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"[{done}/{len(organizations)}] export failed: {e}")
+                    continue
+                files += written
+                print(f"[{done}/{len(organizations)}] {organization}: {written} report(s) ({seconds:.2f}s)")
+
+    print(f"Wrote {files} report(s) for {len(organizations) - failed} organisation(s) into {out_dir} "
+          f"in {time.perf_counter() - start:.1f}s" + (f"; {failed} failed" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
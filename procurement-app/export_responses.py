@@ -0,0 +1,256 @@
+"""Export every stored response as flat CSV or Parquet for analytics.
+
+    python export_responses.py                          # Parquet, changed organisations only
+    python export_responses.py --format csv --out exports/responses
+    python export_responses.py --full                   # re-export everything
+
+One row per response in a single schema (COLUMNS).  Records of every
+version are decoded through procurement_core/records.py, so the Source-To-Pay
+(`focused_area` / `selected_text`) and Procurement Performance
+(`focus_area` / `response`) shapes come out as the same `area` / `answer`
+fields, and combined assessments keep their per-response theme.
+
+Response files are streamed record by record: a JSONL log is read twice,
+once to find each user's latest record and once to emit only those, so
+only an email -> offset index is held in memory, and rows are written in
+chunks of `--chunk-rows`.  Each organisation goes to its own
+`<out>/<org>.<format>` file (read the directory as one dataset, e.g.
+`pandas.read_parquet(out)`), and `<out>/_manifest.json` records the size and
+mtime of every source file exported, so later runs only rewrite files that
+changed and remove outputs whose source is gone.
+
+Parquet output needs pyarrow (`pip install pyarrow`).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from procurement_core.records import add_layout_dir, get_codec
+from procurement_core.storage import LAYOUT_DIR
+
+FORMATS = ("parquet", "csv")
+MANIFEST_FILE = "_manifest.json"
+# Bump when COLUMNS or the row normalisation changes, so outputs are rewritten
+SCHEMA_VERSION = 1
+DEFAULT_CHUNK_ROWS = 50_000
+
+COLUMNS = ("organization", "email", "name", "designation", "assessment", "submitted_at",
+           "theme", "area", "question", "answer", "score")
+
+
+# -----------------------------
+# Reading
+# -----------------------------
+def source_files(data_dir):
+    """{file name: path} of every JSONL log and every JSON file without a log"""
+    files = {}
+    for entry in sorted(os.listdir(data_dir)):
+        path = os.path.join(data_dir, entry)
+        if entry.endswith(".jsonl") or (entry.endswith(".json") and not os.path.exists(path + "l")):
+            files[entry] = path
+    return files
+
+
+def iter_users(path):
+    """Yield (organization, UserRecord) for the live users of one response file"""
+    codec = get_codec()
+    if path.endswith(".json"):
+        with open(path) as f:
+            data = json.load(f)
+        latest = {user["email"]: user for user in data.get("users", [])}
+        for user in latest.values():
+            yield data.get("organization"), codec.decode_user(user)
+        return
+
+    # Only complete lines: a writer may be appending while we read
+    size = os.path.getsize(path)
+    organization = None
+    live = {}  # email -> offset of its latest record
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            if offset + len(line) > size or not line.endswith(b"\n"):
+                break
+            if line.strip():
+                entry = json.loads(line)
+                if "_meta" in entry:
+                    organization = entry["_meta"].get("organization")
+                else:
+                    live.pop(entry["email"], None)
+                    live[entry["email"]] = offset
+            offset += len(line)
+
+        for offset in live.values():
+            f.seek(offset)
+            yield organization, codec.decode_user(json.loads(f.readline()))
+
+
+def response_rows(organization, user):
+    """One COLUMNS tuple per response of a UserRecord"""
+    head = (organization, user.email, user.name, user.designation, user.theme, user.timestamp)
+    for response in user.responses:
+        yield head + (response.theme or user.theme, response.area, response.question, response.answer,
+                      response.score)
+
+
+# -----------------------------
+# Writing
+# -----------------------------
+class CsvChunkWriter:
+    """CSV file with a header row, written a chunk of rows at a time"""
+
+    def __init__(self, path):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetChunkWriter:
+    """Parquet file with one row group per chunk of rows"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow (or use --format csv)")
+        self._pa = pa
+        self._schema = pa.schema([(name, pa.int16() if name == "score" else pa.string()) for name in COLUMNS])
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        self._writer.write_table(self._pa.Table.from_arrays(
+            [self._pa.array(values, type=field.type) for values, field in zip(columns, self._schema)],
+            schema=self._schema
+        ))
+
+    def close(self):
+        self._writer.close()
+
+
+WRITERS = {"csv": CsvChunkWriter, "parquet": ParquetChunkWriter}
+
+
+def export_file(source, target, fmt, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream one response file into `target`; returns the number of rows written"""
+    fallback = os.path.splitext(os.path.basename(source))[0]
+    tmp = f"{target}.tmp"
+    writer = WRITERS[fmt](tmp)
+    total = 0
+    chunk = []
+    try:
+        for organization, user in iter_users(source):
+            for row in response_rows(organization or fallback, user):
+                chunk.append(row)
+                if len(chunk) >= chunk_rows:
+                    writer.write(chunk)
+                    total += len(chunk)
+                    chunk = []
+        if chunk:
+            writer.write(chunk)
+            total += len(chunk)
+    finally:
+        writer.close()
+    os.replace(tmp, target)
+    return total
+
+
+# -----------------------------
+# Incremental export
+# -----------------------------
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def source_state(path, fmt):
+    """What a manifest entry must match for an export of `path` to be current"""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "format": fmt, "schema": SCHEMA_VERSION}
+
+
+def export_all(data_dir, out_dir, fmt="parquet", full=False, chunk_rows=DEFAULT_CHUNK_ROWS, log=print):
+    """Export changed response files; returns {"exported", "unchanged", "removed", "rows"}"""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    counts = {"exported": 0, "unchanged": 0, "removed": 0, "rows": 0}
+    sources = source_files(data_dir)
+    # Records written with an earlier question bank are decoded through its archived layout
+    add_layout_dir(os.path.join(data_dir, LAYOUT_DIR))
+    try:
+        for entry, path in sources.items():
+            state = source_state(path, fmt)
+            previous = manifest.get(entry)
+            target = os.path.join(out_dir, f"{os.path.splitext(entry)[0]}.{fmt}")
+            if (not full and previous and {k: previous.get(k) for k in state} == state
+                    and os.path.exists(target)):
+                counts["unchanged"] += 1
+                continue
+            rows = export_file(path, target, fmt, chunk_rows)
+            manifest[entry] = {**state, "output": os.path.basename(target), "rows": rows}
+            counts["exported"] += 1
+            counts["rows"] += rows
+            log(f"{entry}: {rows} row(s)")
+
+        # A legacy <org>.json replaced by its <org>.jsonl log shares the output
+        live_outputs = {manifest[entry]["output"] for entry in sources if entry in manifest}
+        for entry in [entry for entry in manifest if entry not in sources]:
+            output = manifest.pop(entry)["output"]
+            if output not in live_outputs and os.path.exists(os.path.join(out_dir, output)):
+                os.remove(os.path.join(out_dir, output))
+            counts["removed"] += 1
+            log(f"{entry}: removed")
+    finally:
+        # Keep progress so an interrupted run resumes where it stopped
+        save_manifest(out_dir, manifest)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export all responses as CSV or Parquet")
+    parser.add_argument("--data-dir", default="procurement_data")
+    parser.add_argument("--out", default=None, help="output directory (default: <data dir>/exports/<format>)")
+    parser.add_argument("--format", choices=FORMATS, default="parquet")
+    parser.add_argument("--full", action="store_true", help="re-export every file, not just changed ones")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="rows buffered per write (one Parquet row group)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.data_dir):
+        print(f"No data directory at {args.data_dir}")
+        return 1
+
+    out_dir = args.out or os.path.join(args.data_dir, "exports", args.format)
+    start = time.perf_counter()
+    try:
+        counts = export_all(args.data_dir, out_dir, args.format, args.full, args.chunk_rows)
+    except RuntimeError as e:
+        print(e)
+        return 1
+    print(f"Exported {counts['rows']} row(s) from {counts['exported']} file(s) into {out_dir} "
+          f"({counts['unchanged']} unchanged, {counts['removed']} removed) in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,347 @@
+"""Queued, concurrent execution of LLM generation calls.
+
+The results page needs several independent generations (holistic,
+role-specific and one per theme or focus area), and at the end of a
+workshop many people from one organisation reach it at once.  Every
+generation in the process goes through one `GenerationQueue`:
+
+  * single-flight - a job whose flight key (model, prompt, options) is
+    already queued or running joins that flight instead of calling the
+    model again, so identical prompts from different sessions share a call
+  * per-model limits - each model has its own worker threads, bounding how
+    many requests hit it at once (LLM_CONCURRENCY, or per model via
+    LLM_MODEL_CONCURRENCY="model=n,other=m")
+  * priorities - waiting jobs start holistic first, then role-specific,
+    then per-theme / per-area
+  * metrics - queue depth, running jobs, coalesced joins and queue wait
+    times, from `get_queue().metrics()` and as procurement_generation_*
+    series on the instrumentation /metrics endpoint
+
+`run_concurrently` yields whole results in completion order;
+`stream_concurrently` runs generator functions that yield tokens and
+reports partial text as it arrives, releasing abandoned flights.
+
+Worker threads must not touch Streamlit; callers render in the script
+thread from what `run_concurrently` / `stream_concurrently` yield.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from procurement_core.instrumentation import register_collector
+
+# Maximum generation calls in flight per model per process
+LLM_CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", "4"))
+# Per-model overrides: "llama3.2:latest=2,mistral:latest=4"
+LLM_MODEL_CONCURRENCY = os.environ.get("LLM_MODEL_CONCURRENCY", "")
+# Seconds a single call may run before the page gives up on it
+LLM_CALL_TIMEOUT = float(os.environ.get("LLM_CALL_TIMEOUT", "120"))
+
+# Lower values start first
+PRIORITY_HOLISTIC = 0
+PRIORITY_ROLES = 1
+PRIORITY_AREA = 2
+
+# How often to re-check deadlines while waiting for completions
+_POLL_INTERVAL = 0.25
+# Queue wait samples kept for the wait-time percentiles
+_WAIT_SAMPLES = 1000
+
+
+def parse_model_limits(spec):
+    """{"model": n} from "model=n,other=m" """
+    limits = {}
+    for item in spec.split(","):
+        if "=" in item:
+            model, _, n = item.rpartition("=")
+            limits[model.strip()] = int(n)
+    return limits
+
+
+class Flight:
+    """One queued or running generation, shared by every job that joined it"""
+
+    __slots__ = ("fn", "args", "model", "priority", "flight_key", "stream", "future",
+                 "cancel", "parts", "done", "error", "subscribers", "enqueued", "started")
+
+    def __init__(self, fn, args, model, priority, flight_key, stream):
+        self.fn = fn
+        self.args = args
+        self.model = model
+        self.priority = priority
+        self.flight_key = flight_key
+        self.stream = stream
+        self.future = Future()
+        self.cancel = threading.Event()
+        self.parts = []
+        self.done = False
+        self.error = None
+        self.subscribers = 1
+        self.enqueued = time.monotonic()
+        self.started = None
+
+    def run(self):
+        try:
+            if self.stream:
+                for piece in self.fn(*self.args, cancel=self.cancel):
+                    if self.cancel.is_set():
+                        break
+                    self.parts.append(piece)
+                result = "".join(self.parts)
+            else:
+                result = self.fn(*self.args)
+        except Exception as e:
+            self.error = e
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+        finally:
+            self.done = True
+
+
+class GenerationQueue:
+    """Process-wide prioritised, single-flight queue with per-model workers"""
+
+    def __init__(self, default_limit=LLM_CONCURRENCY, limits=None):
+        self.default_limit = default_limit
+        self.limits = dict(limits or {})
+        self._cond = threading.Condition()
+        self._waiting = {}     # model -> heap of (priority, seq, flight)
+        self._running = {}     # model -> running job count
+        self._workers = {}     # model -> worker threads
+        self._flights = {}     # (flight key, stream) -> queued or running flight
+        self._seq = itertools.count()
+        self._waits = deque(maxlen=_WAIT_SAMPLES)
+        self.submitted = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.abandoned = 0
+
+    def limit(self, model):
+        return self.limits.get(model, self.default_limit)
+
+    def submit(self, fn, args=(), model=None, priority=PRIORITY_AREA, flight_key=None, stream=False):
+        """Queue fn(*args) (a token generator if `stream`); returns its Flight"""
+        with self._cond:
+            self.submitted += 1
+            shared_key = (flight_key, stream) if flight_key is not None else None
+            flight = self._flights.get(shared_key)
+            if flight is not None:
+                flight.subscribers += 1
+                self.coalesced += 1
+                return flight
+
+            flight = Flight(fn, args, model, priority, flight_key, stream)
+            if shared_key is not None:
+                self._flights[shared_key] = flight
+            heapq.heappush(self._waiting.setdefault(model, []), (priority, next(self._seq), flight))
+            self._ensure_workers(model)
+            self._cond.notify_all()
+            return flight
+
+    def release(self, flight):
+        """Drop one job's interest in a flight; the last one out cancels it"""
+        with self._cond:
+            flight.subscribers -= 1
+            if flight.subscribers > 0 or flight.done:
+                return
+            flight.cancel.set()
+            self.abandoned += 1
+            # Later identical prompts must start afresh, not join a cancelled flight
+            self._forget(flight)
+
+    def _forget(self, flight):
+        shared_key = (flight.flight_key, flight.stream)
+        if self._flights.get(shared_key) is flight:
+            del self._flights[shared_key]
+
+    def _ensure_workers(self, model):
+        workers = self._workers.setdefault(model, [])
+        while len(workers) < self.limit(model):
+            worker = threading.Thread(target=self._work, args=(model,),
+                                      name=f"llm-{model}-{len(workers)}", daemon=True)
+            workers.append(worker)
+            worker.start()
+
+    def _next(self, model):
+        with self._cond:
+            while True:
+                heap = self._waiting.get(model)
+                while heap:
+                    _, _, flight = heapq.heappop(heap)
+                    if flight.cancel.is_set():
+                        flight.done = True
+                        flight.future.cancel()
+                        continue
+                    flight.started = time.monotonic()
+                    self._waits.append(flight.started - flight.enqueued)
+                    self._running[model] = self._running.get(model, 0) + 1
+                    return flight
+                self._cond.wait()
+
+    def _work(self, model):
+        while True:
+            flight = self._next(model)
+            try:
+                flight.run()
+            finally:
+                with self._cond:
+                    self._running[model] -= 1
+                    self.completed += 1
+                    self._forget(flight)
+
+    def metrics(self):
+        """Snapshot of queue depth, running jobs, counters and wait times (ms)"""
+        with self._cond:
+            waits = sorted(self._waits)
+            depth = {model: len(heap) for model, heap in self._waiting.items()}
+            running = dict(self._running)
+            counters = {"submitted": self.submitted, "coalesced": self.coalesced,
+                        "completed": self.completed, "abandoned": self.abandoned}
+
+        def percentile(q):
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 1) if waits else 0.0
+
+        return {
+            "depth": depth,
+            "running": running,
+            **counters,
+            "wait_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "max": percentile(1.0),
+                        "samples": len(waits)}
+        }
+
+    def collect(self):
+        """metrics() as Prometheus metric families (see instrumentation.register_collector)"""
+        metrics = self.metrics()
+        models = sorted(set(metrics["depth"]) | set(metrics["running"]), key=str)
+        return [
+            ("procurement_generation_queue_depth", "gauge", "Generation jobs waiting for a worker.",
+             [((("model", model or ""),), metrics["depth"].get(model, 0)) for model in models]),
+            ("procurement_generation_running", "gauge", "Generation jobs running.",
+             [((("model", model or ""),), metrics["running"].get(model, 0)) for model in models]),
+            ("procurement_generation_queue_wait_seconds", "gauge",
+             f"Queue wait of the last {_WAIT_SAMPLES} started jobs, by quantile.",
+             [((("quantile", q),), metrics["wait_ms"][key] / 1000)
+              for q, key in (("0.5", "p50"), ("0.95", "p95"), ("1", "max"))]),
+            ("procurement_generation_jobs_total", "counter", "Generation jobs by outcome.",
+             [((("event", event),), metrics[event]) for event in ("submitted", "coalesced", "completed", "abandoned")]),
+        ]
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    """Process-wide queue shared by every session"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = GenerationQueue(LLM_CONCURRENCY, parse_model_limits(LLM_MODEL_CONCURRENCY))
+            register_collector(_queue.collect)
+        return _queue
+
+
+def _job(spec):
+    """(fn, args) or (fn, args, {"model", "priority", "flight_key"}) -> (fn, args, options)"""
+    fn, args, options = (spec + ({},))[:3]
+    return fn, args, options
+
+
+def run_concurrently(jobs, timeout=LLM_CALL_TIMEOUT):
+    """Run `jobs` ({key: (fn, args[, options])}) through the shared queue.
+
+    `options` may set the model, priority and flight_key (see
+    GenerationQueue.submit).  Yields (key, result, error) tuples as calls
+    finish; `error` is the exception raised by the call, or a TimeoutError
+    once a call has been running for longer than `timeout` seconds (time
+    spent queued does not count).
+    """
+    queue = get_queue()
+    flights = {}
+    for key, spec in jobs.items():
+        fn, args, options = _job(spec)
+        flights[key] = queue.submit(fn, args, **options)
+    # Identical jobs within one call share a flight, hence a future
+    futures = {}
+    for key, flight in flights.items():
+        futures.setdefault(flight.future, []).append(key)
+    pending = set(futures)
+
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    result, error = None, RuntimeError("generation was cancelled")
+                else:
+                    error = future.exception()
+                    result = None if error else future.result()
+                for key in futures[future]:
+                    yield key, result, error
+
+            now = time.monotonic()
+            for future in list(pending):
+                keys = futures[future]
+                flight = flights[keys[0]]
+                if flight.started is not None and now - flight.started > timeout:
+                    pending.discard(future)
+                    for key in keys:
+                        queue.release(flight)
+                        yield key, None, TimeoutError(f"generation took longer than {timeout:.0f}s")
+    finally:
+        for future in pending:
+            for key in futures[future]:
+                queue.release(flights[key])
+
+
+def stream_concurrently(jobs, timeout=LLM_CALL_TIMEOUT, cancel=None, interval=0.1):
+    """Run streaming `jobs` ({key: (fn, args[, options])}) through the shared queue.
+
+    Each fn is a generator function called as fn(*args, cancel=event) that
+    yields text pieces and should stop early once `event` is set.  This
+    yields (key, text_so_far, finished, error) whenever a job has produced
+    new text or finished, polling every `interval` seconds.
+
+    Setting `cancel` - or closing this generator, which is what happens
+    when Streamlit abandons the script run - releases every unfinished
+    job; flights nobody else joined are told to stop.
+    """
+    queue = get_queue()
+    flights = {}
+    for key, spec in jobs.items():
+        fn, args, options = _job(spec)
+        flights[key] = queue.submit(fn, args, stream=True, **options)
+
+    seen = {key: 0 for key in jobs}
+    active = set(jobs)
+    try:
+        while active:
+            if cancel is not None and cancel.is_set():
+                return
+            time.sleep(interval)
+            now = time.monotonic()
+            for key in list(active):
+                flight = flights[key]
+                done = flight.done
+                count = len(flight.parts)
+                if done:
+                    active.discard(key)
+                    error = flight.error
+                    if error is None and flight.future.cancelled():
+                        error = RuntimeError("generation was cancelled")
+                    yield key, "".join(flight.parts), True, error
+                elif flight.started is not None and now - flight.started > timeout:
+                    active.discard(key)
+                    queue.release(flight)
+                    yield key, "".join(flight.parts), True, TimeoutError(f"generation took longer than {timeout:.0f}s")
+                elif count != seen[key]:
+                    seen[key] = count
+                    yield key, "".join(flight.parts[:count]), False, None
+    finally:
+        for key in active:
+            queue.release(flights[key])
@@ -0,0 +1,146 @@
+"""Content-addressed cache for LLM generations.
+
+Recommendation prompts depend only on rounded scores, gaps and the set of
+designations, so many users and organisations send byte-identical prompts.
+Entries are keyed by sha256 of (model, prompt, options) and live in two
+tiers:
+
+  * memory - a per-process LRU, bounded by `memory_size`
+  * disk   - a small SQLite table shared by all processes and surviving
+             restarts, bounded by `disk_size` (least recently used rows are
+             evicted first)
+
+Entries older than `ttl` seconds are treated as missing in both tiers.
+Empty texts are never stored: an empty generation is a failure, and
+caching it would serve the failure to every later request.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MEMORY_SIZE = 256
+DEFAULT_DISK_SIZE = 5000
+
+
+def cache_key(model, prompt, options=None):
+    """sha256 of the canonical JSON of (model, prompt, options)"""
+    payload = json.dumps({"model": model, "prompt": prompt, "options": options or {}},
+                         sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Two-tier (memory LRU + SQLite) TTL cache of generated texts"""
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, memory_size=DEFAULT_MEMORY_SIZE, disk_size=DEFAULT_DISK_SIZE):
+        self.path = path
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._memory = OrderedDict()   # key -> (created, text)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._connect().execute(
+                "CREATE TABLE IF NOT EXISTS generations ("
+                "key TEXT PRIMARY KEY, model TEXT, text TEXT NOT NULL, "
+                "created REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._connect().execute(
+                "CREATE INDEX IF NOT EXISTS idx_generations_access ON generations(last_access)"
+            )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, key, created, text):
+        with self._lock:
+            self._memory[key] = (created, text)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, model, prompt, options=None):
+        """Cached text for this generation, or None"""
+        key = cache_key(model, prompt, options)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+        if self.path:
+            conn = self._connect()
+            row = conn.execute("SELECT created, text FROM generations WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[0] < self.ttl:
+                conn.execute("UPDATE generations SET last_access = ? WHERE key = ?", (now, key))
+                self._remember(key, row[0], row[1])
+                with self._lock:
+                    self.hits += 1
+                return row[1]
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, model, prompt, text, options=None):
+        """Store a generated text in both tiers (empty texts are ignored)"""
+        if not text or text.isspace():
+            return
+        key = cache_key(model, prompt, options)
+        now = time.time()
+        self._remember(key, now, text)
+        if self.path:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO generations (key, model, text, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model, text, now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM generations WHERE created < ?", (now - self.ttl,))
+        conn.execute(
+            "DELETE FROM generations WHERE key IN ("
+            "SELECT key FROM generations ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.disk_size,)
+        )
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            self._connect().execute("DELETE FROM generations")
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_llm_cache(path, **kwargs):
+    """Process-wide LLMCache for `path` (created on first use)"""
+    key = os.path.abspath(path) if path else None
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = LLMCache(path, **kwargs)
+        return cache
@@ -0,0 +1,257 @@
+"""Process-wide Ollama client with health probing and a circuit breaker.
+
+Every session shares one `OllamaService` per host.  It owns a single
+`ollama.Client` (created on first use) whose underlying HTTP connection
+pool keeps connections alive between generations, so concurrent sections
+and reruns do not pay a TCP handshake each time.
+
+A daemon thread probes the server every `HEALTH_INTERVAL` seconds and
+publishes the result as `available`; page renders only read that flag and
+never wait on the network.  Generations go through a circuit breaker:
+after `FAILURE_THRESHOLD` consecutive outage errors (or a failed probe) it
+opens and calls fail immediately with `CircuitOpenError` until
+`RESET_TIMEOUT` seconds have passed, when one trial call is let through.
+
+A streamed generation given a `cancel` Event is read on a helper thread,
+so the caller returns within `CANCEL_POLL` seconds of a cancel even while
+the server has sent nothing; the helper closes the stream, dropping the
+connection, as soon as its blocking read returns.
+"""
+import os
+import queue
+import threading
+import time
+
+import httpx
+from ollama import Client, ResponseError
+
+# Seconds between background health probes
+HEALTH_INTERVAL = float(os.environ.get("OLLAMA_HEALTH_INTERVAL", "15"))
+# Seconds a probe may take before the server is considered down
+PROBE_TIMEOUT = 2.0
+# Connect / read timeouts for generation requests
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = float(os.environ.get("OLLAMA_READ_TIMEOUT", "120"))
+# Pooled connections kept open to the server
+POOL_SIZE = int(os.environ.get("OLLAMA_POOL_SIZE", "8"))
+KEEPALIVE_EXPIRY = 60.0
+# Consecutive failures that open the circuit, and how long it stays open
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 30.0
+# Seconds between cancel checks while waiting for the next streamed chunk
+CANCEL_POLL = 0.1
+
+_END = object()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a server that is known to be down"""
+
+
+def is_outage(error):
+    """Whether an error means the server is unreachable or broken (not a bad request)"""
+    if isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError)):
+        return True
+    return isinstance(error, ResponseError) and error.status_code >= 500
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open trial after a cool-down"""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go ahead now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Let exactly one trial call through
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+
+    def trip(self):
+        """Open the circuit immediately (e.g. the health probe failed)"""
+        with self._lock:
+            self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+
+
+class OllamaService:
+    """Shared client, health flag and circuit breaker for one Ollama host"""
+
+    def __init__(self, host=None, pool_size=POOL_SIZE, read_timeout=READ_TIMEOUT,
+                 health_interval=HEALTH_INTERVAL, breaker=None):
+        self.host = host
+        self.pool_size = pool_size
+        self.read_timeout = read_timeout
+        self.health_interval = health_interval
+        self.breaker = breaker or CircuitBreaker()
+        self.available = False
+        self.last_probe = None
+        self._client = None
+        self._lock = threading.Lock()
+        self._probe_thread = None
+        self._stop = threading.Event()
+
+    @property
+    def client(self):
+        """The pooled ollama.Client, created on first use"""
+        with self._lock:
+            if self._client is None:
+                self._client = Client(
+                    host=self.host,
+                    timeout=httpx.Timeout(self.read_timeout, connect=CONNECT_TIMEOUT),
+                    limits=httpx.Limits(max_connections=self.pool_size,
+                                        max_keepalive_connections=self.pool_size,
+                                        keepalive_expiry=KEEPALIVE_EXPIRY)
+                )
+            return self._client
+
+    # --- Health probing ---
+
+    def probe(self):
+        """Check the server once and update `available`; returns the new value"""
+        try:
+            # ollama.Client has no per-call timeout, so use its HTTP client directly
+            self.client._client.get("/api/tags", timeout=PROBE_TIMEOUT).raise_for_status()
+        except Exception:
+            self.available = False
+            self.breaker.trip()
+        else:
+            self.available = True
+            self.breaker.record_success()
+        self.last_probe = time.time()
+        return self.available
+
+    def _probe_loop(self):
+        while not self._stop.is_set():
+            self.probe()
+            self._stop.wait(self.health_interval)
+
+    def start_probe(self):
+        """Start the background health probe (idempotent)"""
+        with self._lock:
+            if self._probe_thread is None or not self._probe_thread.is_alive():
+                self._stop.clear()
+                self._probe_thread = threading.Thread(target=self._probe_loop, name="ollama-probe", daemon=True)
+                self._probe_thread.start()
+
+    def stop_probe(self):
+        self._stop.set()
+
+    # --- Generation ---
+
+    def _check_circuit(self):
+        if not self.breaker.allow():
+            raise CircuitOpenError("Ollama server is unavailable (circuit open)")
+
+    def _record(self, error):
+        if error is not None and is_outage(error):
+            self.available = False
+            self.breaker.record_failure()
+        else:
+            # The server answered, even if it rejected the request
+            self.breaker.record_success()
+
+    def generate(self, stream=False, cancel=None, **kwargs):
+        """ollama.Client.generate guarded by the circuit breaker; a stream stops once `cancel` is set"""
+        self._check_circuit()
+        if stream:
+            return self._stream(kwargs) if cancel is None else _cancellable(self._stream(kwargs), cancel)
+        try:
+            response = self.client.generate(stream=False, **kwargs)
+        except Exception as e:
+            self._record(e)
+            raise
+        self._record(None)
+        return response
+
+    def _stream(self, kwargs):
+        chunks = self.client.generate(stream=True, **kwargs)
+        answered = False
+        try:
+            for chunk in chunks:
+                if not answered:
+                    answered = True
+                    self._record(None)
+                yield chunk
+        except Exception as e:
+            self._record(e)
+            raise
+        finally:
+            chunks.close()
+
+
+def _cancellable(chunks, cancel):
+    """Yield from the generator `chunks`, run on a helper thread, until `cancel` is set"""
+    pending = queue.Queue()
+    stop = threading.Event()
+
+    def read():
+        try:
+            for chunk in chunks:
+                if stop.is_set():
+                    break
+                pending.put((chunk, None))
+        except Exception as e:
+            pending.put((_END, e))
+        else:
+            pending.put((_END, None))
+        finally:
+            # Also closes the HTTP response, so the server stops generating
+            chunks.close()
+
+    threading.Thread(target=read, name="ollama-stream", daemon=True).start()
+    try:
+        while not cancel.is_set():
+            try:
+                chunk, error = pending.get(timeout=CANCEL_POLL)
+            except queue.Empty:
+                continue
+            if error is not None:
+                raise error
+            if chunk is _END:
+                return
+            yield chunk
+    finally:
+        stop.set()
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def get_ollama(host=None, probe=True):
+    """Process-wide OllamaService for `host` (default: $OLLAMA_HOST), probing in the background"""
+    host = host or os.environ.get("OLLAMA_HOST")
+    with _services_lock:
+        service = _services.get(host)
+        if service is None:
+            service = _services[host] = OllamaService(host)
+    if probe:
+        service.start_probe()
+    return service
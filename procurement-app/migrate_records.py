@@ -0,0 +1,71 @@
+"""Rewrite stored responses in the current compact record format.
+
+    python migrate_records.py                        # backend from $PROCUREMENT_STORAGE (default jsonl)
+    python migrate_records.py --storage json --org "Acme Corp"
+    python migrate_records.py --storage sqlite
+
+Every organisation is read through its storage backend, which understands
+records of every version, and rewritten with `compact()` in the version
+records.RECORD_VERSION format: question and option ids instead of question
+and answer text.  Rewrites are atomic and hold the organisation's lock, so
+the app can keep running, and the migration can be re-run safely.  Legacy
+`<org>.json` files are converted to `<org>.jsonl` logs by the jsonl
+backend; the original file is left in place.
+"""
+import argparse
+import os
+import sys
+import time
+
+from procurement_core.storage import DEFAULT_BACKEND, STORAGE_ENV, get_storage, org_key
+
+FILE_EXTENSIONS = {"jsonl": (".jsonl", ".json"), "json": (".json",)}
+
+
+def stored_size(data_dir, kind, organization):
+    """Bytes of the file an organisation's records are read from (None for SQLite)"""
+    for extension in FILE_EXTENSIONS.get(kind, ()):
+        path = os.path.join(data_dir, f"{org_key(organization)}{extension}")
+        if os.path.exists(path):
+            return os.path.getsize(path)
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rewrite stored responses in the compact record format")
+    parser.add_argument("--data-dir", default="procurement_data")
+    parser.add_argument("--storage", default=None, help="storage backend (default: $PROCUREMENT_STORAGE or jsonl)")
+    parser.add_argument("--org", action="append", help="only these organisations (repeatable)")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.data_dir):
+        print(f"No data directory at {args.data_dir}")
+        return 1
+
+    storage = get_storage(args.data_dir, args.storage)
+    kind = args.storage or os.environ.get(STORAGE_ENV, DEFAULT_BACKEND)
+    organizations = args.org or storage.list_organizations()
+
+    start = time.perf_counter()
+    before_total = after_total = 0
+    for organization in organizations:
+        before = stored_size(args.data_dir, kind, organization)
+        storage.compact(organization)
+        after = stored_size(args.data_dir, kind, organization)
+        if before is None or after is None:
+            print(f"{organization}: rewritten")
+            continue
+        before_total += before
+        after_total += after
+        print(f"{organization}: {before / 1024:.1f} KB -> {after / 1024:.1f} KB")
+
+    summary = f"Migrated {len(organizations)} organisation(s) in {time.perf_counter() - start:.1f}s"
+    if before_total:
+        summary += (f": {before_total / 1024:.1f} KB -> {after_total / 1024:.1f} KB "
+                    f"({100 * (1 - after_total / before_total):.0f}% smaller)")
+    print(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
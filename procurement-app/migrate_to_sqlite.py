@@ -0,0 +1,70 @@
+"""Bulk-import existing JSON / JSONL response files into the SQLite store.
+
+    python migrate_to_sqlite.py                         # procurement_data -> procurement_data/procurement.db
+    python migrate_to_sqlite.py --data-dir other_dir --db other.db
+
+Each organisation is imported in a single transaction and users are upserted
+by email, so the migration can be re-run safely.  Afterwards start the app
+with PROCUREMENT_STORAGE=sqlite.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from procurement_core.storage import SQLITE_FILE, JsonlLogBackend, SqliteBackend
+
+
+def iter_org_data(data_dir):
+    """Yield org data from every JSONL log and every JSON file without a log"""
+    jsonl = JsonlLogBackend(data_dir)
+    for entry in sorted(os.listdir(data_dir)):
+        path = os.path.join(data_dir, entry)
+        if entry.endswith(".jsonl"):
+            with open(path) as f:
+                header = json.loads(f.readline() or "{}")
+            organization = header.get("_meta", {}).get("organization", entry[:-6])
+            try:
+                yield jsonl.get_org_data(organization)
+            finally:
+                # Keep one organisation's records in memory at a time
+                jsonl.release(organization)
+        elif entry.endswith(".json") and not os.path.exists(path + "l"):
+            with open(path) as f:
+                yield json.load(f)
+
+
+def migrate(data_dir, db_file=SQLITE_FILE):
+    """Import every organisation in `data_dir`; returns (orgs, users) imported"""
+    target = SqliteBackend(data_dir, db_file)
+
+    orgs = users = 0
+    for data in iter_org_data(data_dir):
+        if not data or not data.get("users"):
+            continue
+        target.save_users(data["organization"], data["users"])
+        orgs += 1
+        users += len(data["users"])
+    return orgs, users
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import JSON/JSONL response files into SQLite")
+    parser.add_argument("--data-dir", default="procurement_data")
+    parser.add_argument("--db", default=SQLITE_FILE, help="database file name inside --data-dir")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.data_dir):
+        print(f"No data directory at {args.data_dir}")
+        return 1
+
+    start = time.perf_counter()
+    orgs, users = migrate(args.data_dir, args.db)
+    print(f"Imported {users} user(s) from {orgs} organisation(s) into "
+          f"{os.path.join(args.data_dir, args.db)} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
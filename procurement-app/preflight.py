@@ -0,0 +1,88 @@
+"""Deploy-time dependency check for the Procurement Maturity app.
+
+Run once when a node is provisioned (or from the container entrypoint)
+before starting Streamlit:
+
+    python preflight.py            # verify requirements.txt, exit 1 on mismatch
+    python preflight.py --install  # pip install anything missing, then verify
+
+The Streamlit script itself never installs packages, so every rerun stays
+free of subprocess and network work.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from importlib import metadata
+
+REQUIREMENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "requirements.txt")
+
+_REQUIREMENT_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:==\s*([^\s;#]+))?")
+
+
+def read_requirements(path=REQUIREMENTS_FILE):
+    """Return (name, pinned_version_or_None) tuples from a requirements file"""
+    requirements = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if not line or line.startswith("-"):
+                continue
+            match = _REQUIREMENT_RE.match(line)
+            if match:
+                requirements.append((match.group(1), match.group(2)))
+    return requirements
+
+
+def check_requirements(requirements):
+    """Compare requirements against installed distributions.
+
+    Returns a list of (name, wanted, installed) tuples for every requirement
+    that is missing or installed at a different version than pinned.
+    """
+    problems = []
+    for name, wanted in requirements:
+        try:
+            installed = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            problems.append((name, wanted, None))
+            continue
+        if wanted and installed != wanted:
+            problems.append((name, wanted, installed))
+    return problems
+
+
+def install_requirements(path=REQUIREMENTS_FILE):
+    """Install requirements with pip (deploy time only)"""
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", path])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify the app's Python dependencies")
+    parser.add_argument("--requirements", default=REQUIREMENTS_FILE, help="Path to requirements.txt")
+    parser.add_argument("--install", action="store_true", help="pip install missing or mismatched packages first")
+    args = parser.parse_args(argv)
+
+    requirements = read_requirements(args.requirements)
+    problems = check_requirements(requirements)
+
+    if problems and args.install:
+        install_requirements(args.requirements)
+        problems = check_requirements(requirements)
+
+    if problems:
+        for name, wanted, installed in problems:
+            if installed is None:
+                print(f"MISSING   {name}" + (f"=={wanted}" if wanted else ""))
+            else:
+                print(f"MISMATCH  {name}: installed {installed}, required {wanted}")
+        print(f"Preflight failed: {len(problems)} of {len(requirements)} requirement(s) not satisfied.")
+        return 1
+
+    print(f"Preflight OK: {len(requirements)} requirement(s) satisfied.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
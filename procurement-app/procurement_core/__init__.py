@@ -0,0 +1,57 @@
+"""Scoring and storage core of the Procurement Maturity app, importable without Streamlit.
+
+  * question_bank   - questions, focus areas, benchmarks and recommendation tables
+  * records         - typed user / response records and their stored form
+  * maturity        - maturity stage ranges, colours and labels
+  * aggregates      - running per-area score statistics
+  * storage         - response stores (JSON, JSONL log, SQLite)
+  * scoring         - vectorised organisation and theme maturity
+  * recommendations - prompts and precomputed recommendation packs
+  * peer_benchmarks - cross-organisation score distributions
+  * drafts          - checkpoints of assessments in progress
+  * instrumentation - timing spans, metrics and sampling profiles
+
+Importing the package or any of its modules has no side effects: nothing
+is read, created, started or configured until a function is called
+(`get_catalogue()`, `get_storage(data_dir)`, ...).  numpy and pandas are
+imported on first use by scoring, and plotly, matplotlib, ollama and
+Streamlit are never imported here (they belong to charts.py,
+chart_images.py, llm_client.py and app6.py), so a batch job or worker
+that only scores stored responses starts in milliseconds.
+benchmarks/bench_imports.py checks both.
+
+Submodules and the registry functions below are loaded on first access:
+
+    import procurement_core as core
+    storage = core.get_storage("procurement_data")
+    maturity = core.scoring.stored_org_maturity(storage, {"organization": "Acme"}, core.STP_THEME)
+"""
+import importlib
+
+SUBMODULES = ("question_bank", "records", "maturity", "aggregates", "storage", "scoring", "recommendations",
+              "peer_benchmarks", "drafts", "instrumentation")
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "STP_THEME": "question_bank",
+    "PERFORMANCE_THEME": "question_bank",
+    "get_catalogue": "question_bank",
+    "get_codec": "records",
+    "get_storage": "storage",
+    "get_peer_benchmarks": "peer_benchmarks",
+    "get_draft_store": "drafts",
+}
+
+__all__ = list(SUBMODULES) + list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,84 @@
+"""Running maturity aggregates for one organisation.
+
+Instead of walking every user and response on each results view, storage
+backends keep a `OrgAggregates` per organisation and update it when a user
+is upserted: the replaced record's contribution is subtracted and the new
+one added, so an update costs O(responses in the submission).  For every
+(user theme, focus area) it tracks the score sum, count and sum of squares,
+which is enough for means and variances.  Users are records.UserRecords.
+"""
+
+
+class AreaStat:
+    """Sum, count and sum of squares of the scores in one focus area"""
+
+    __slots__ = ("total", "count", "total_sq")
+
+    def __init__(self, total=0.0, count=0, total_sq=0.0):
+        self.total = total
+        self.count = count
+        self.total_sq = total_sq
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def variance(self):
+        """Population variance of the scores"""
+        if not self.count:
+            return 0.0
+        mean = self.total / self.count
+        return max(0.0, self.total_sq / self.count - mean * mean)
+
+
+class OrgAggregates:
+    """Per-theme, per-area score aggregates of one organisation's users"""
+
+    def __init__(self):
+        # user theme -> focus area -> AreaStat (areas in first-seen order)
+        self.themes = {}
+
+    def _apply(self, user_record, sign):
+        areas = self.themes.setdefault(user_record.theme, {})
+        for response in user_record.responses:
+            area = response.area
+            score = response.score
+            stat = areas.get(area)
+            if stat is None:
+                stat = areas[area] = AreaStat()
+            stat.total += sign * score
+            stat.count += sign
+            stat.total_sq += sign * score * score
+            if stat.count <= 0:
+                del areas[area]
+
+    def add_user(self, user_record):
+        self._apply(user_record, 1)
+
+    def remove_user(self, user_record):
+        self._apply(user_record, -1)
+
+    def replace_user(self, old_record, new_record):
+        """Swap one user's contribution for another's (old may be None)"""
+        if old_record is not None:
+            self.remove_user(old_record)
+        self.add_user(new_record)
+
+    def area_stats(self, theme):
+        """{area: AreaStat} for users who assessed `theme`"""
+        return dict(self.themes.get(theme, {}))
+
+    def maturity(self, theme):
+        """Same shape as app6.calculate_org_maturity: {"overall", "by_area"} or None"""
+        return maturity_from_stats(self.themes.get(theme, {}))
+
+
+def maturity_from_stats(area_stats):
+    """Build {"overall", "by_area"} from an {area: AreaStat} mapping"""
+    total = sum(stat.total for stat in area_stats.values())
+    count = sum(stat.count for stat in area_stats.values())
+    if not count:
+        return None
+    return {
+        "overall": round(total / count, 1),
+        "by_area": {area: round(stat.mean(), 1) for area, stat in area_stats.items()}
+    }
@@ -0,0 +1,150 @@
+"""Server-side drafts of assessments in progress.
+
+Answers live in `st.session_state` until the assessment is submitted, so a
+dropped websocket or a restarted server used to lose them.  The app now
+checkpoints each assessment to a small SQLite database keyed by
+(organisation, email):
+
+  * drafts        - one row per respondent: where they are (stage, themes,
+                    focused areas) and when the draft was last touched
+  * draft_answers - one row per answered question, in answer order
+
+Each answer (or form of answers) is one small transaction of INSERTs plus a
+timestamp update, and resuming is a single joined SELECT.  Drafts are removed when the assessment is
+submitted; ones untouched for `ttl` seconds are garbage-collected, at most
+once per `gc_interval` per process.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from .storage import COMPACT_JSON, org_key
+
+DRAFT_DB = "drafts.db"
+DEFAULT_TTL = 14 * 24 * 3600
+DEFAULT_GC_INTERVAL = 3600
+
+# answers: [(slot, answer), ...] in answer order
+Draft = namedtuple("Draft", "state answers updated")
+
+
+def draft_key(organization, email):
+    return f"{org_key(organization.strip())}|{email.strip().lower()}"
+
+
+class DraftStore:
+    """Per-respondent assessment checkpoints shared by all processes"""
+
+    def __init__(self, path, ttl=DEFAULT_TTL, gc_interval=DEFAULT_GC_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.gc_interval = gc_interval
+        self._local = threading.local()
+        self._collected = 0.0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().executescript("""
+            CREATE TABLE IF NOT EXISTS drafts (
+                key TEXT PRIMARY KEY,
+                state TEXT NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_drafts_updated ON drafts(updated);
+            CREATE TABLE IF NOT EXISTS draft_answers (
+                draft TEXT NOT NULL REFERENCES drafts(key) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                slot TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                PRIMARY KEY (draft, position)
+            );
+        """)
+        self.collect_garbage()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def start(self, organization, email, state):
+        """Begin a new draft (dropping any previous one) at `state`"""
+        self.collect_garbage()
+        conn = self._connect()
+        key = draft_key(organization, email)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM drafts WHERE key = ?", (key,))
+            conn.execute("INSERT INTO drafts (key, state, updated) VALUES (?, ?, ?)",
+                         (key, json.dumps(state, **COMPACT_JSON), time.time()))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update(self, organization, email, state):
+        """Move an existing draft to `state`, keeping its answers"""
+        self._connect().execute("UPDATE drafts SET state = ?, updated = ? WHERE key = ?",
+                                (json.dumps(state, **COMPACT_JSON), time.time(), draft_key(organization, email)))
+
+    def put_answer(self, organization, email, position, slot, answer):
+        """Record the answer at `position`; a no-op without a started draft"""
+        self.put_answers(organization, email, position, [(slot, answer)])
+
+    def put_answers(self, organization, email, position, answers):
+        """Record consecutive (slot, answer) pairs from `position` in one transaction"""
+        conn = self._connect()
+        key = draft_key(organization, email)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("UPDATE drafts SET updated = ? WHERE key = ?", (time.time(), key)).rowcount:
+                conn.executemany("INSERT OR REPLACE INTO draft_answers (draft, position, slot, answer) VALUES (?, ?, ?, ?)",
+                                 [(key, position + offset, slot, json.dumps(answer, **COMPACT_JSON))
+                                  for offset, (slot, answer) in enumerate(answers)])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def load(self, organization, email):
+        """The respondent's Draft, or None"""
+        rows = self._connect().execute(
+            "SELECT d.state, d.updated, a.slot, a.answer FROM drafts d "
+            "LEFT JOIN draft_answers a ON a.draft = d.key "
+            "WHERE d.key = ? AND d.updated >= ? ORDER BY a.position",
+            (draft_key(organization, email), time.time() - self.ttl)
+        ).fetchall()
+        if not rows:
+            return None
+        answers = [(slot, json.loads(answer)) for _, _, slot, answer in rows if slot is not None]
+        return Draft(json.loads(rows[0][0]), answers, rows[0][1])
+
+    def discard(self, organization, email):
+        self._connect().execute("DELETE FROM drafts WHERE key = ?", (draft_key(organization, email),))
+
+    def collect_garbage(self, force=False):
+        """Delete drafts idle for longer than the TTL; returns how many"""
+        now = time.time()
+        if not force and now - self._collected < self.gc_interval:
+            return 0
+        self._collected = now
+        return self._connect().execute("DELETE FROM drafts WHERE updated < ?", (now - self.ttl,)).rowcount
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_draft_store(data_dir, **kwargs):
+    """Process-wide DraftStore for `data_dir` (created on first use)"""
+    path = os.path.abspath(os.path.join(data_dir, DRAFT_DB))
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = DraftStore(path, **kwargs)
+        return store
@@ -0,0 +1,368 @@
+"""Timing spans, structured timing logs, Prometheus metrics and sampling profiles.
+
+Every script run of app6.py is one `script_run(stage)` span, labelled with
+the stage it started in (user_info, theme_selection, ..., results) and how
+it ended (ok, rerun or error); the subsystems inside it - catalogue
+builds, storage reads and writes, org maturity, charts, LLM calls - are
+`span(name)` blocks or `@timed(name)` functions.  Spans may run on any
+thread (LLM calls run on generation workers).
+
+Each finished span is
+
+  * added to a process-wide histogram (`metrics_text()` renders them in
+    the Prometheus text format; PROCUREMENT_METRICS_PORT=9464 serves them
+    at http://host:9464/metrics from a background thread)
+  * logged as one JSON object per line on the "procurement.timing" logger
+    when it is enabled (PROCUREMENT_TIMING_LOG=stderr or a file path)
+
+Other subsystems export their own state (queue depths, running jobs, ...)
+next to the spans by registering a collector with `register_collector`;
+it is called on every scrape.
+
+With PROCUREMENT_PROFILE_RATE=0.05, about 5% of script runs also run under
+cProfile.  Samples are merged per stage; the hottest functions of each
+stage are served at /profile and written to PROCUREMENT_PROFILE_DIR
+(`<stage>.txt`) every PROFILE_DUMP_EVERY samples.
+
+Importing the module only defines the registry: cProfile, pstats and
+http.server are imported when profiling or the metrics server is enabled.
+"""
+import io
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+TIMING_LOG = os.environ.get("PROCUREMENT_TIMING_LOG", "")
+METRICS_PORT = int(os.environ.get("PROCUREMENT_METRICS_PORT", "0"))
+PROFILE_RATE = float(os.environ.get("PROCUREMENT_PROFILE_RATE", "0"))
+PROFILE_DIR = os.environ.get("PROCUREMENT_PROFILE_DIR", os.path.join("procurement_data", "profiles"))
+PROFILE_DUMP_EVERY = 20
+PROFILE_TOP = 25
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Streamlit ends a run early with these control-flow exceptions
+_RERUN_EXCEPTIONS = ("RerunException", "StopException")
+
+logger = logging.getLogger("procurement.timing")
+
+# Stage of the script run the current thread is executing
+_stage = ContextVar("stage", default=None)
+
+
+# -----------------------------
+# Span histograms
+# -----------------------------
+class SpanStats:
+    """Count, sum, max and bucket counts of one span series"""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+
+class SpanRegistry:
+    """Process-wide span histograms keyed by (name, sorted labels)"""
+
+    def __init__(self):
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, labels, seconds):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = SpanStats()
+            series.observe(seconds)
+
+    def snapshot(self):
+        """{(name, labels): (count, total, max, cumulative bucket counts)}"""
+        with self._lock:
+            items = [(key, (s.count, s.total, s.max, list(s.buckets))) for key, s in self._series.items()]
+        snapshot = {}
+        for key, (count, total, longest, buckets) in items:
+            cumulative, running = [], 0
+            for bucket in buckets:
+                running += bucket
+                cumulative.append(running)
+            snapshot[key] = (count, total, longest, cumulative)
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+_registry = SpanRegistry()
+
+
+def get_registry():
+    return _registry
+
+
+def _record(name, labels, seconds):
+    _registry.observe(name, labels, seconds)
+    if logger.isEnabledFor(logging.INFO):
+        entry = {"event": "span", "span": name, "ms": round(seconds * 1000, 3), "ts": round(time.time(), 3)}
+        stage = _stage.get()
+        if stage is not None and "stage" not in labels:
+            entry["stage"] = stage
+        entry.update(labels)
+        logger.info(json.dumps(entry, separators=(",", ":")))
+
+
+@contextmanager
+def span(name, **labels):
+    """Time the enclosed block as one `name` span (also recorded when it raises)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, labels, time.perf_counter() - start)
+
+
+def timed(name, **labels):
+    """Decorator: time every call of the function as a `name` span"""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# -----------------------------
+# Sampling profiler
+# -----------------------------
+class StageProfiler:
+    """cProfile samples of script runs, merged per stage"""
+
+    def __init__(self, rate=PROFILE_RATE, directory=PROFILE_DIR, dump_every=PROFILE_DUMP_EVERY):
+        self.rate = rate
+        self.directory = directory
+        self.dump_every = dump_every
+        self._stats = {}      # stage -> pstats.Stats
+        self._samples = {}    # stage -> samples merged
+        self._lock = threading.Lock()
+
+    def sample(self):
+        return self.rate > 0 and random.random() < self.rate
+
+    def add(self, stage, profile):
+        import pstats
+
+        with self._lock:
+            stats = self._stats.get(stage)
+            if stats is None:
+                self._stats[stage] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+            self._samples[stage] = self._samples.get(stage, 0) + 1
+            due = self._samples[stage] % self.dump_every == 0
+        if due and self.directory:
+            self.dump(stage)
+
+    def report(self, stage, top=PROFILE_TOP):
+        """Top functions of a stage by cumulative time, as text"""
+        with self._lock:
+            stats = self._stats.get(stage)
+            if stats is None:
+                return ""
+            out = io.StringIO()
+            stats.stream = out
+            out.write(f"stage {stage}: {self._samples[stage]} sampled run(s)\n")
+            stats.sort_stats("cumulative").print_stats(top)
+            return out.getvalue()
+
+    def stages(self):
+        with self._lock:
+            return sorted(self._stats)
+
+    def dump(self, stage):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{stage}.txt")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(self.report(stage))
+        os.replace(path + ".tmp", path)
+
+
+_profiler = StageProfiler()
+
+
+def get_profiler():
+    return _profiler
+
+
+@contextmanager
+def script_run(stage):
+    """Span (and, when sampled, cProfile) one script run that starts in `stage`"""
+    token = _stage.set(stage)
+    profile = None
+    if _profiler.sample():
+        import cProfile
+        profile = cProfile.Profile()
+    outcome = "error"
+    start = time.perf_counter()
+    if profile is not None:
+        profile.enable()
+    try:
+        yield
+        outcome = "ok"
+    except BaseException as e:
+        if type(e).__name__ in _RERUN_EXCEPTIONS:
+            outcome = "rerun"
+        raise
+    finally:
+        if profile is not None:
+            profile.disable()
+        _record("script_run", {"stage": stage, "outcome": outcome}, time.perf_counter() - start)
+        _stage.reset(token)
+        if profile is not None:
+            _profiler.add(stage, profile)
+
+
+# -----------------------------
+# Collectors
+# -----------------------------
+_collectors = []
+_collectors_lock = threading.Lock()
+
+
+def register_collector(collector):
+    """Also export `collector()` at /metrics (once per collector).
+
+    The collector returns metric families as (name, type, help, samples),
+    with type "gauge" or "counter" and samples [(labels, value)], labels
+    being ((label, value), ...).
+    """
+    with _collectors_lock:
+        if collector not in _collectors:
+            _collectors.append(collector)
+
+
+def _collected_lines():
+    with _collectors_lock:
+        collectors = list(_collectors)
+    lines = []
+    for collector in collectors:
+        for name, kind, help_text, samples in collector():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines += [f"{name}{_label_text(labels)} {value}" for labels, value in samples]
+    return lines
+
+
+# -----------------------------
+# Export
+# -----------------------------
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+def metrics_text():
+    """All span histograms and collected metrics in the Prometheus text exposition format"""
+    lines = [
+        "# HELP procurement_span_seconds Duration of instrumented spans.",
+        "# TYPE procurement_span_seconds histogram",
+    ]
+    longest_lines = [
+        "# HELP procurement_span_max_seconds Longest observed span.",
+        "# TYPE procurement_span_max_seconds gauge",
+    ]
+    for (name, labels), (count, total, longest, cumulative) in sorted(_registry.snapshot().items()):
+        series = (("span", name),) + labels
+        for bound, running in zip(BUCKETS, cumulative):
+            lines.append(f"procurement_span_seconds_bucket{_label_text(series, [('le', repr(bound))])} {running}")
+        lines.append(f"procurement_span_seconds_bucket{_label_text(series, [('le', '+Inf')])} {count}")
+        lines.append(f"procurement_span_seconds_sum{_label_text(series)} {total:.6f}")
+        lines.append(f"procurement_span_seconds_count{_label_text(series)} {count}")
+        longest_lines.append(f"procurement_span_max_seconds{_label_text(series)} {longest:.6f}")
+    return "\n".join(lines + longest_lines + _collected_lines()) + "\n"
+
+
+def _metrics_handler():
+    """Request handler class for the metrics server"""
+    from http.server import BaseHTTPRequestHandler
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, content_type = metrics_text(), "text/plain; version=0.0.4"
+            elif self.path == "/profile":
+                reports = [_profiler.report(stage) for stage in _profiler.stages()]
+                body = "\n".join(reports) or "No profiles sampled (set PROCUREMENT_PROFILE_RATE)\n"
+                content_type = "text/plain"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _MetricsHandler
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT, host="0.0.0.0"):
+    """Serve /metrics and /profile from a daemon thread (once per process; port 0 disables)"""
+    global _server
+    with _server_lock:
+        if _server is not None or not port:
+            return _server
+        from http.server import ThreadingHTTPServer
+
+        _server = ThreadingHTTPServer((host, port), _metrics_handler())
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
+
+
+def configure_logging(target=TIMING_LOG):
+    """Send span logs to stderr ("stderr") or a file; once per process"""
+    with _server_lock:
+        if not target or logger.handlers:
+            return
+        _add_log_handler(target)
+
+
+def _add_log_handler(target):
+    handler = logging.StreamHandler() if target == "stderr" else logging.FileHandler(target, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
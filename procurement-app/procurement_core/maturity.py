@@ -0,0 +1,31 @@
+"""Maturity stages: the score range, colour and label of each stage.
+
+Shared by the Plotly charts (charts.py) and the matplotlib renderer
+(chart_images.py), so neither needs the other's plotting library.
+"""
+
+# Maturity stages shown on the gauge
+MATURITY_RANGES = {
+    "Latent": [0, 1],
+    "Discovery": [1, 2],
+    "Reactive": [2, 3],
+    "Proactive": [3, 4],
+    "Strategic Value": [4, 5]
+}
+MATURITY_COLORS = {
+    "Latent": "#FF4B4B",       # Red
+    "Discovery": "#FFA500",    # Orange
+    "Reactive": "#FFD700",     # Gold
+    "Proactive": "#90EE90",    # Light Green
+    "Strategic Value": "#20B2AA" # Light Sea Green
+}
+
+
+def get_maturity_label(level):
+    """Get text label for maturity level for the gauge chart."""
+    if 0 <= level < 1: return "Latent"
+    elif 1 <= level < 2: return "Discovery"
+    elif 2 <= level < 3: return "Reactive"
+    elif 3 <= level < 4: return "Proactive"
+    elif 4 <= level <= 5: return "Strategic Value"
+    else: return "Unknown"
@@ -0,0 +1,282 @@
+"""Live cross-organisation benchmarks from the stored responses.
+
+Alongside the static industry standards, every assessed organisation's
+maturity - per theme overall and per focus area - is kept in a histogram
+of organisation scores, so a results page can say where an organisation
+stands among its peers.  Scores are org means rounded to one decimal, so
+a 0.1-wide bin per possible value (0.0 - 5.0) makes the histograms exact.
+
+Distributions live in a small SQLite database shared by every process:
+
+  * org_scores - the scores each organisation currently contributes
+  * bins       - (theme, area, bin) -> number of organisations
+
+`refresh_org` swaps an organisation's old scores for its new ones in one
+transaction after each submission, so updates cost O(areas).  It scores
+the organisation inside that write transaction, so concurrent
+submissions to one organisation commit in the order they read storage and
+an older score never overwrites a newer one.  Readers keep
+an in-memory snapshot with cumulative counts and quantiles per
+distribution, making `rank` O(1); the snapshot reloads when another
+connection commits (checked at most every CHECK_INTERVAL seconds, through
+one dedicated connection, since `PRAGMA data_version` only compares
+within a connection).
+`rebuild` recomputes everything from storage in one streaming pass
+(rebuild_benchmarks.py) without holding the write lock: scores are
+computed first and both tables replaced in one short transaction, keeping
+the scores of organisations that `refresh_org` changed during the pass
+(org_versions counts each organisation's updates).
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from . import scoring
+from .question_bank import PERFORMANCE_THEME, STP_THEME
+
+BENCHMARK_DB = "peer_benchmarks.db"
+BIN_WIDTH = 0.1
+BIN_COUNT = 51               # 0.0, 0.1, ..., 5.0
+MIN_ORGANIZATIONS = 5        # fewer peers than this gives no rank
+CHECK_INTERVAL = 2.0
+THEMES = (STP_THEME, PERFORMANCE_THEME)
+OVERALL = ""                 # area key of a theme's overall score
+
+PeerRank = namedtuple("PeerRank", "percentile organizations median p25 p75")
+
+
+def score_bin(score):
+    return min(BIN_COUNT - 1, max(0, int(round(score / BIN_WIDTH))))
+
+
+def org_scores(storage, organization):
+    """{(theme, area): score} an organisation contributes (area OVERALL for the theme)"""
+    # Backends with running aggregates need only the name, not the responses
+    org_data = {"organization": organization} if storage.supports_aggregates else storage.get_org_data(organization)
+    scores = {}
+    for theme in THEMES:
+        maturity = scoring.stored_org_maturity(storage, org_data, theme) if org_data else None
+        if not maturity:
+            continue
+        scores[(theme, OVERALL)] = maturity["overall"]
+        for area, score in maturity["by_area"].items():
+            scores[(theme, area)] = score
+    return scores
+
+
+class Distribution:
+    """Organisation counts per score bin, with cumulative counts for O(1) ranks"""
+
+    __slots__ = ("counts", "below", "total", "p25", "median", "p75")
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.below = []
+        running = 0
+        for count in counts:
+            self.below.append(running)
+            running += count
+        self.total = running
+        self.p25, self.median, self.p75 = (self.quantile(q) for q in (0.25, 0.5, 0.75))
+
+    def quantile(self, q):
+        """Score below which a fraction q of organisations fall (bin resolution)"""
+        if not self.total:
+            return None
+        target = q * self.total
+        for i, count in enumerate(self.counts):
+            if count and self.below[i] + count >= target:
+                return round(i * BIN_WIDTH, 1)
+        return round((BIN_COUNT - 1) * BIN_WIDTH, 1)
+
+    def percentile(self, score):
+        """Mid-rank percentile of `score`: ties count half"""
+        i = score_bin(score)
+        return 100.0 * (self.below[i] + 0.5 * self.counts[i]) / self.total
+
+
+class PeerBenchmarks:
+    """Shared per-theme / per-area histograms of organisation scores"""
+
+    def __init__(self, path, min_organizations=MIN_ORGANIZATIONS, check_interval=CHECK_INTERVAL):
+        self.path = path
+        self.min_organizations = min_organizations
+        self.check_interval = check_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._snapshot_conn = None   # checks data_version; used under self._lock
+        self._data_version = None
+        self._checked = 0.0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().executescript("""
+            CREATE TABLE IF NOT EXISTS org_scores (
+                org TEXT NOT NULL,
+                theme TEXT NOT NULL,
+                area TEXT NOT NULL,
+                score REAL NOT NULL,
+                PRIMARY KEY (org, theme, area)
+            );
+            CREATE TABLE IF NOT EXISTS bins (
+                theme TEXT NOT NULL,
+                area TEXT NOT NULL,
+                bin INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (theme, area, bin)
+            );
+            CREATE TABLE IF NOT EXISTS org_versions (
+                org TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            );
+        """)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # -----------------------------
+    # Writes
+    # -----------------------------
+    def _apply(self, conn, scores, sign):
+        conn.executemany(
+            "INSERT INTO bins (theme, area, bin, count) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(theme, area, bin) DO UPDATE SET count = count + excluded.count",
+            [(theme, area, score_bin(score), sign) for (theme, area), score in scores.items()]
+        )
+
+    def refresh_org(self, storage, organization):
+        """Replace an organisation's contribution with its current scores in `storage`"""
+        self._replace(organization, lambda: org_scores(storage, organization))
+
+    def update_org(self, organization, scores):
+        """Replace an organisation's contribution with `scores` ({(theme, area): score})"""
+        self._replace(organization, lambda: scores)
+
+    def _replace(self, organization, get_scores):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Scored under the write lock: a later writer reads storage later
+            scores = get_scores()
+            old = {(theme, area): score for theme, area, score in conn.execute(
+                "SELECT theme, area, score FROM org_scores WHERE org = ?", (organization,))}
+            removed = {key: score for key, score in old.items() if scores.get(key) != score}
+            added = {key: score for key, score in scores.items() if old.get(key) != score}
+            if removed or added:
+                self._apply(conn, removed, -1)
+                self._apply(conn, added, 1)
+                conn.execute("DELETE FROM bins WHERE count <= 0")
+                conn.execute("DELETE FROM org_scores WHERE org = ?", (organization,))
+                conn.executemany("INSERT INTO org_scores (org, theme, area, score) VALUES (?, ?, ?, ?)",
+                                 [(organization, theme, area, score) for (theme, area), score in scores.items()])
+            # Tells a concurrent rebuild that these scores are newer than the ones it read
+            conn.execute("INSERT INTO org_versions (org, version) VALUES (?, 1) "
+                         "ON CONFLICT(org) DO UPDATE SET version = version + 1", (organization,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        if removed or added:
+            with self._lock:
+                self._snapshot = None
+
+    def rebuild(self, storage, organizations=None, progress=None):
+        """Recompute every distribution from `storage` in one pass; returns the org count.
+
+        Organisations are scored outside any transaction, so submissions
+        (`refresh_org`) continue meanwhile; one whose scores they changed
+        during the pass keeps those newer scores.
+        """
+        organizations = storage.list_organizations() if organizations is None else organizations
+        conn = self._connect()
+        versions = dict(conn.execute("SELECT org, version FROM org_versions"))
+        scanned = {}
+        for done, organization in enumerate(organizations, 1):
+            scanned[organization] = org_scores(storage, organization)
+            storage.release(organization)
+            if progress:
+                progress(done, organization)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for organization, version in conn.execute("SELECT org, version FROM org_versions").fetchall():
+                if versions.get(organization) != version:
+                    scanned[organization] = {(theme, area): score for theme, area, score in conn.execute(
+                        "SELECT theme, area, score FROM org_scores WHERE org = ?", (organization,))}
+            counts = {}
+            for scores in scanned.values():
+                for (theme, area), score in scores.items():
+                    key = (theme, area, score_bin(score))
+                    counts[key] = counts.get(key, 0) + 1
+            conn.execute("DELETE FROM org_scores")
+            conn.execute("DELETE FROM bins")
+            conn.executemany("INSERT INTO org_scores (org, theme, area, score) VALUES (?, ?, ?, ?)",
+                             [(organization, theme, area, score) for organization, scores in scanned.items()
+                              for (theme, area), score in scores.items()])
+            conn.executemany("INSERT INTO bins (theme, area, bin, count) VALUES (?, ?, ?, ?)",
+                             [key + (count,) for key, count in counts.items()])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._snapshot = None
+        return len(organizations)
+
+    # -----------------------------
+    # Reads
+    # -----------------------------
+    def _load(self, conn):
+        bins = {}
+        for theme, area, index, count in conn.execute("SELECT theme, area, bin, count FROM bins"):
+            bins.setdefault((theme, area), [0] * BIN_COUNT)[index] = count
+        return {key: Distribution(counts) for key, counts in bins.items()}
+
+    def snapshot(self):
+        """{(theme, area): Distribution}, reloaded after commits by any connection"""
+        now = time.monotonic()
+        with self._lock:
+            if self._snapshot is not None and now - self._checked < self.check_interval:
+                return self._snapshot
+            if self._snapshot_conn is None:
+                self._snapshot_conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                                      check_same_thread=False)
+            version = self._snapshot_conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._snapshot is None or version != self._data_version:
+                self._snapshot = self._load(self._snapshot_conn)
+                self._data_version = version
+            self._checked = now
+            return self._snapshot
+
+    def distribution(self, theme, area=OVERALL):
+        return self.snapshot().get((theme, area))
+
+    def rank(self, theme, area, score):
+        """PeerRank of `score` among organisations' (theme, area) scores, or None
+        when fewer than `min_organizations` have one"""
+        distribution = self.distribution(theme, area or OVERALL)
+        if distribution is None or distribution.total < self.min_organizations:
+            return None
+        return PeerRank(distribution.percentile(score), distribution.total,
+                        distribution.median, distribution.p25, distribution.p75)
+
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_peer_benchmarks(data_dir, **kwargs):
+    """Process-wide PeerBenchmarks for `data_dir` (created on first use)"""
+    path = os.path.abspath(os.path.join(data_dir, BENCHMARK_DB))
+    with _instances_lock:
+        instance = _instances.get(path)
+        if instance is None:
+            instance = _instances[path] = PeerBenchmarks(path, **kwargs)
+        return instance
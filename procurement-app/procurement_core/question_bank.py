@@ -0,0 +1,659 @@
+"""Process-wide question bank for the Procurement Maturity app.
+
+Streamlit re-executes app6.py on every widget interaction, but imported
+modules stay resident, so the question bank is built here once per process
+and shared by every session.  `get_catalogue()` returns an immutable
+`Catalogue`; it is rebuilt only when one of the JSON source files changes
+(detected by mtime/size, confirmed by content hash), and the staleness check
+itself runs at most once every `CHECK_INTERVAL` seconds.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from itertools import combinations
+from types import MappingProxyType
+
+from .instrumentation import timed
+
+# The question bank JSON files live in the app directory, next to app6.py
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RECOMMENDATIONS_FILE = os.path.join(BASE_DIR, "Recommendations.json")
+PERFORMANCE_QUESTIONS_FILE = os.path.join(BASE_DIR, "slas_kpis_questions_final.json")
+PERFORMANCE_RECOMMENDATIONS_FILE = os.path.join(BASE_DIR, "deepseek_json_20250720_551af9.json")
+SOURCE_FILES = (RECOMMENDATIONS_FILE, PERFORMANCE_QUESTIONS_FILE, PERFORMANCE_RECOMMENDATIONS_FILE)
+
+# Seconds between staleness checks of the source files
+CHECK_INTERVAL = 2.0
+
+STP_THEME = "Source-To-Pay Process"
+PERFORMANCE_THEME = "Procurement Performance"
+
+# Themes with questions, in the order a combined assessment asks them
+QUESTIONNAIRE_THEMES = (STP_THEME, PERFORMANCE_THEME)
+
+# One focus area of a combined assessment; `start` is the position of its
+# first question in the whole sequence
+# labels: option texts in order; scores: option text -> score
+AssessmentQuestion = namedtuple("AssessmentQuestion", "question_id text options labels scores")
+AssessmentSection = namedtuple("AssessmentSection", "theme area start questions")
+
+# -----------------------------
+# Static Question Data
+# -----------------------------
+# Source-To-Pay Process Theme Data
+FOCUSED_AREAS = {
+    "Strategic Sourcing": [
+        {
+            "number": 1,
+            "question": "To what extent are preferred vendors documented and used in sourcing decisions?",
+            "responses": [
+                {"score": 5, "text": "Preferred vendors are maintained centrally, regularly updated, and integrated into sourcing strategy"},
+                {"score": 4, "text": "Preferred vendors are defined for key categories and referenced in sourcing events"},
+                {"score": 3, "text": "Some category-level vendor preferences exist, but usage is inconsistent"},
+                {"score": 2, "text": "Limited category planning, with ad-hoc supplier preference"},
+                {"score": 1, "text": "No defined preferred vendors used"}
+            ]
+        },
+        {
+            "number": 2,
+            "question": "How well-defined and consistently followed is your strategic sourcing process?",
+            "responses": [
+                {"score": 5, "text": "End-to-end strategic sourcing process is documented, digitized, and consistently followed"},
+                {"score": 4, "text": "Most sourcing events follow a structured and repeatable process"},
+                {"score": 3, "text": "Sourcing process is documented but applied selectively"},
+                {"score": 2, "text": "Ad-hoc sourcing with minimal process adherence"},
+                {"score": 1, "text": "No defined sourcing process or documentation"}
+            ]
+        },
+        {
+            "number": 3,
+            "question": "How comprehensive is your approach in evaluating suppliers during sourcing?",
+            "responses": [
+                {"score": 5, "text": "Supplier selection includes total cost of ownership, risk, sustainability, and performance history"},
+                {"score": 4, "text": "Evaluations include cost and quality, with limited use of additional criteria"},
+                {"score": 3, "text": "Evaluation focuses mainly on cost and delivery"},
+                {"score": 2, "text": "Evaluation is informal and varies by event"},
+                {"score": 1, "text": "No structured supplier evaluation"}
+            ]
+        },
+        {
+            "number": 4,
+            "question": "What tools or approaches are used to identify and engage new suppliers?",
+            "responses": [
+                {"score": 5, "text": "Dedicated tools or platforms (e.g., supplier discovery portals, AI scouting tools) used globally"},
+                {"score": 4, "text": "Category managers actively scout using databases or networks"},
+                {"score": 3, "text": "New supplier identification is done manually on a case-by-case basis"},
+                {"score": 2, "text": "Limited to existing supplier base with rare exploration"},
+                {"score": 1, "text": "No effort or process to identify new suppliers"}
+            ]
+        },
+        {
+            "number": 5,
+            "question": "How structured and efficient is your RFx (RFI/RFP/RFQ) process?",
+            "responses": [
+                {"score": 5, "text": "Fully automated and standardized RFx process with clear scoring and audit trail"},
+                {"score": 4, "text": "RFx templates and evaluation criteria are used consistently"},
+                {"score": 3, "text": "RFx processes are in place but vary by category or manager"},
+                {"score": 2, "text": "RFx events are run manually with limited structure"},
+                {"score": 1, "text": "No formal RFx process in place"}
+            ]
+        },
+        {
+            "number": 6,
+            "question": "How structured is your approach to preparing for and conducting negotiations with suppliers?",
+            "responses": [
+                {"score": 5, "text": "Highly Structured & Institutionalized"},
+                {"score": 4, "text": "Structured"},
+                {"score": 3, "text": "Moderately Structured"},
+                {"score": 2, "text": "Somewhat Unstructured"},
+                {"score": 1, "text": "Very Unstructured"}
+            ]
+        }
+    ],
+    "Procurement Process": [
+        {
+            "number": 1,
+            "question": "How standardized and compliant is your requisition process across the organization?",
+            "responses": [
+                {"score": 5, "text": "Fully standardized and automated requisition process across all units; high compliance monitored and enforced via tools"},
+                {"score": 4, "text": "Well-documented, consistently followed process with automated compliance validation in most areas"},
+                {"score": 3, "text": "Standardized requisition process exists in most departments; basic compliance checks are in place"},
+                {"score": 2, "text": "Some standard templates exist, but processes are loosely followed; compliance is ad hoc and not enforced"},
+                {"score": 1, "text": "Requisition processes are manual, inconsistent, and vary across departments; no compliance checks in place"}
+            ]
+        },
+        {
+            "number": 2,
+            "question": "How mature is your PO management in terms of accuracy, control, and compliance?",
+            "responses": [
+                {"score": 5, "text": "Advanced PO automation with full audit trails, real-time validation, and strong control mechanisms"},
+                {"score": 4, "text": "PO system is integrated with procurement tools, ensuring high accuracy and compliance tracking"},
+                {"score": 3, "text": "PO process is largely digitized with some accuracy and approval controls in place"},
+                {"score": 2, "text": "Basic PO system in place, but accuracy is inconsistent and control measures are minimal"},
+                {"score": 1, "text": "PO creation is mostly manual with frequent errors and lack of oversight or control"}
+            ]
+        },
+        {
+            "number": 3,
+            "question": "How effectively do you leverage technology in your procurement process?",
+            "responses": [
+                {"score": 5, "text": "Fully digitized and automated procurement using advanced tools (e-sourcing, AI, analytics)"},
+                {"score": 4, "text": "Good use of integrated tools (e.g., ERP, e-procurement platforms); moderate automation"},
+                {"score": 3, "text": "Use of basic procurement systems for POs or requisitions; partial process automation"},
+                {"score": 2, "text": "Limited use of technology (e.g., Excel, email); no integrated procurement platform"},
+                {"score": 1, "text": "Procurement is primarily manual with minimal use of digital tools or technology"}
+            ]
+        },
+        {
+            "number": 4,
+            "question": "How well-defined are your procurement governance and risk mitigation frameworks?",
+            "responses": [
+                {"score": 5, "text": "Robust governance structure with real-time risk monitoring and mitigation strategies embedded in processes"},
+                {"score": 4, "text": "Governance frameworks and risk registers are well-defined and regularly reviewed"},
+                {"score": 3, "text": "Some policies exist; basic risk assessments are conducted periodically"},
+                {"score": 2, "text": "Ad hoc risk handling; limited policies or governance documentation"},
+                {"score": 1, "text": "No formal governance or risk mitigation practices in procurement"}
+            ]
+        },
+        {
+            "number": 5,
+            "question": "How do you track and measure procurement performance?",
+            "responses": [
+                {"score": 5, "text": "Advanced analytics and dashboards provide real-time performance visibility; continuous improvement is data-driven"},
+                {"score": 4, "text": "Comprehensive KPIs regularly tracked and reported with insights for decision-making"},
+                {"score": 3, "text": "Basic KPIs (e.g., savings, supplier count) tracked; reports generated periodically"},
+                {"score": 2, "text": "Some metrics (e.g., spend) tracked manually; limited insight into performance"},
+                {"score": 1, "text": "No performance metrics tracked; lack of visibility into procurement outcome"}
+            ]
+        },
+        {
+            "number": 6,
+            "question": "How embedded are sustainability and ethical practices in your procurement process?",
+            "responses": [
+                {"score": 5, "text": "Sustainability and ethical sourcing are core procurement principles with enforced compliance and transparent tracking"},
+                {"score": 4, "text": "Formal sustainability policies in place; supplier assessments are conducted"},
+                {"score": 3, "text": "Basic sustainability/ethics criteria applied in some sourcing decisions"},
+                {"score": 2, "text": "Some awareness, but no formal practices or criteria in place"},
+                {"score": 1, "text": "No consideration of sustainability or ethics in procurement decisions"}
+            ]
+        }
+    ],
+    "Category Management": [
+        {
+            "number": 1,
+            "question": "How frequently do you perform spend analysis?",
+            "responses": [
+                {"score": 5, "text": "Real-time or monthly"},
+                {"score": 4, "text": "Quarterly"},
+                {"score": 3, "text": "Annually"},
+                {"score": 2, "text": "Ad-hoc or only when requested"},
+                {"score": 1, "text": "Rarely or not at all"}
+            ]
+        },
+        {
+            "number": 2,
+            "question": "How systematic is your spend analysis process?",
+            "responses": [
+                {"score": 5, "text": "Fully automated with dashboards and coverage across all categories"},
+                {"score": 4, "text": "Partially automated with good visibility and structured templates"},
+                {"score": 3, "text": "Mostly manual with basic categorization"},
+                {"score": 2, "text": "Inconsistent methods; depends on team/initiative"},
+                {"score": 1, "text": "No standardized process; lacks repeatability"}
+            ]
+        },
+        {
+            "number": 3,
+            "question": "To what extent are category strategies documented and action-oriented?",
+            "responses": [
+                {"score": 5, "text": "Documented for all categories with KPIs, reviews, and alignment to business strategy"},
+                {"score": 4, "text": "Documented for key categories with basic objectives"},
+                {"score": 3, "text": "Some informal strategies without measurable goals"},
+                {"score": 2, "text": "Very limited strategy documents; mostly reactive"},
+                {"score": 1, "text": "No documented category strategies"}
+            ]
+        },
+        {
+            "number": 4,
+            "question": "How are sourcing savings tracked and validated?",
+            "responses": [
+                {"score": 5, "text": "Centralized system with real-time tracking, finance-aligned validation, and reporting"},
+                {"score": 4, "text": "System-based tracking, with periodic finance review"},
+                {"score": 3, "text": "Spreadsheet-based tracking with irregular validation"},
+                {"score": 2, "text": "Only tracked during sourcing events"},
+                {"score": 1, "text": "No standard methodology or tracking"}
+            ]
+        },
+        {
+            "number": 5,
+            "question": "How do you monitor and manage supplier performance?",
+            "responses": [
+                {"score": 5, "text": "Formal process with KPIs, scorecards, reviews, and improvement plans"},
+                {"score": 4, "text": "KPIs tracked for key suppliers, but no formal reviews"},
+                {"score": 3, "text": "Informal evaluations without clear KPIs"},
+                {"score": 2, "text": "Evaluations based on issues/escalations only"},
+                {"score": 1, "text": "No structured supplier performance evaluation"}
+            ]
+        },
+        {
+            "number": 6,
+            "question": "How do you manage supplier and market risks?",
+            "responses": [
+                {"score": 5, "text": "Formal framework with real-time risk dashboards and proactive mitigation"},
+                {"score": 4, "text": "Risk register and monitoring in place, with periodic assessments"},
+                {"score": 3, "text": "Basic risk identification, reactive handling only"},
+                {"score": 2, "text": "Limited visibility into supplier risks"},
+                {"score": 1, "text": "No structured risk management"}
+            ]
+        }
+    ],
+    "Payment Process": [
+        {
+            "number": 1,
+            "question": "How efficient and automated is your invoice receipt and processing workflow?",
+            "responses": [
+                {"score": 5, "text": "Fully automated invoice capture, 3-way match, touchless processing"},
+                {"score": 4, "text": "Mostly system-based with minimal manual effort and 2/3-way match"},
+                {"score": 3, "text": "Mix of manual and digital steps; partial automation"},
+                {"score": 2, "text": "Mostly manual; email and spreadsheet-based tracking"},
+                {"score": 1, "text": "Entirely manual, paper-based invoice handling"}
+            ]
+        },
+        {
+            "number": 2,
+            "question": "What level of visibility do suppliers have into their invoice and payment status?",
+            "responses": [
+                {"score": 5, "text": "Supplier portal with real-time invoice/payment tracking and support tools"},
+                {"score": 4, "text": "Automated email updates and self-service options"},
+                {"score": 3, "text": "Basic visibility through AP responses or manual reports"},
+                {"score": 2, "text": "Suppliers must frequently follow up for updates"},
+                {"score": 1, "text": "No structured visibility or support mechanisms for suppliers"}
+            ]
+        },
+        {
+            "number": 3,
+            "question": "How are payments reviewed, approved, and controlled?",
+            "responses": [
+                {"score": 5, "text": "Fully digital, role-based approval workflows with audit trails"},
+                {"score": 4, "text": "Mostly digital approvals with some manual oversight"},
+                {"score": 3, "text": "Manual approvals supported by standard templates"},
+                {"score": 2, "text": "Ad-hoc approval methods; inconsistent documentation"},
+                {"score": 1, "text": "No formal approval process; payments made without structured review"}
+            ]
+        },
+        {
+            "number": 4,
+            "question": "How well does your organization ensure payments are made on time and accurately?",
+            "responses": [
+                {"score": 5, "text": "Payments are made on time >95% of the time, with automated scheduling"},
+                {"score": 4, "text": "Mostly on-time with minimal delays and errors"},
+                {"score": 3, "text": "Occasional delays or duplicate/incorrect payments"},
+                {"score": 2, "text": "Frequent issues in timing or mismatched amounts"},
+                {"score": 1, "text": "Regular payment delays, errors, and supplier escalations"}
+            ]
+        },
+        {
+            "number": 5,
+            "question": "How optimized and digitized are your payment methods?",
+            "responses": [
+                {"score": 5, "text": "Majority of payments via secure digital methods (ACH, virtual cards, etc.)"},
+                {"score": 4, "text": "High usage of ACH/digital methods; checks rarely used"},
+                {"score": 3, "text": "Balanced mix of digital and manual payment methods"},
+                {"score": 2, "text": "Predominantly check/wire based, with limited digital adoption"},
+                {"score": 1, "text": "Manual, paper-based payment handling only"}
+            ]
+        },
+        {
+            "number": 6,
+            "question": "What controls are in place to ensure compliance and prevent fraud in payments?",
+            "responses": [
+                {"score": 5, "text": "Proactive risk controls, segregation of duties, automated fraud detection"},
+                {"score": 4, "text": "Strong approval controls and periodic audits"},
+                {"score": 3, "text": "Basic compliance checks during processing"},
+                {"score": 2, "text": "Minimal compliance processes; relies on trust"},
+                {"score": 1, "text": "No formal compliance or anti-fraud mechanisms"}
+            ]
+        }
+    ]
+}
+
+# Industry Benchmarks
+INDUSTRY_STANDARDS = {
+    "Source-To-Pay Process": {
+        "Strategic Sourcing": 3.7,
+        "Procurement Process": 3.5,
+        "Category Management": 3.6,
+        "Payment Process": 3.8
+    },
+    "Procurement Performance": {
+        "Performance Review": 3,
+        "Savings Tracking": 4,
+        "Procurement KPIs": 3,
+        "Compliance KPIs": 4,
+        "Reporting": 5
+    }
+}
+
+# Theme benchmarks (for combined view)
+THEME_BENCHMARKS = {
+    "Source-To-Pay Process": 3.6,
+    "Procurement Performance": 3.8,
+    "Strategy and Vision": 3.5,
+    "People and Organization": 3.4,
+    "Technology and Enablers": 3.7
+}
+
+# Source for Industry Standards
+INDUSTRY_STANDARD_SOURCES = [
+    "Deloitte Global Chief Procurement Officer Survey 2024",
+    "Kearney Procurement Study 2023",
+    "Gartner Magic Quadrant for Strategic Sourcing Suites 2023",
+    "IBM Institute for Business Value: The CPO Study 2023"
+]
+
+# Theme definitions (question data is attached when the catalogue is built)
+THEME_DEFINITIONS = {
+    "Strategy and Vision": {
+        "status": "under_development",
+        "description": "Strategic planning, governance, and procurement alignment with business objectives"
+    },
+    "Technology and Enablers": {
+        "status": "under_development",
+        "description": "Digital tools, automation, and technology infrastructure supporting procurement"
+    },
+    "People and Organization": {
+        "status": "under_development",
+        "description": "Organizational structure, skills development, and talent management"
+    },
+    STP_THEME: {
+        "status": "active",
+        "description": "End-to-end procurement process from sourcing to payment"
+    },
+    PERFORMANCE_THEME: {
+        "status": "active",
+        "description": "Performance measurement, analytics, and continuous improvement"
+    }
+}
+
+# -----------------------------
+# Catalogue
+# -----------------------------
+def freeze(value):
+    """Recursively convert dicts/lists into read-only mappings/tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def stp_question_id(area, number):
+    """Stable id for a Source-To-Pay question, e.g. 'strategic_sourcing_q1'"""
+    return f"{re.sub(r'[^a-z0-9]+', '_', area.lower()).strip('_')}_q{number}"
+
+
+class Catalogue:
+    """Immutable snapshot of all questions, recommendations and benchmarks.
+
+    Besides the raw structures used by the app (`themes`, `focused_areas`,
+    `performance_questions`, ...) it carries indexes for O(1) lookup:
+
+    * `focus_areas(theme)`          -> tuple of area names
+    * `questions(theme, area)`      -> tuple of question dicts
+    * `question(question_id)`       -> question dict
+    * `question_meta(question_id)`  -> (theme, area) of the question
+    * `question_id(theme, area, text)` -> id of a question by its text
+    * `options(question_id)`        -> ((option text, score), ...)
+    * `question_recommendations(question_id)` -> recommendations by level
+    * `area_recommendations(theme, area)`     -> recommendations by level
+    * `assessment_sections(themes)` -> focus-area sections of a combined assessment
+
+    The recommendation index is validated when the catalogue is built, so a
+    question without a matching recommendation table fails at load time
+    rather than silently rendering "No recommendation available".
+    """
+
+    __slots__ = (
+        "content_hash", "recommendations", "focused_areas", "performance_questions",
+        "deepseek_data", "industry_standards", "theme_benchmarks",
+        "industry_standard_sources", "themes", "_areas_by_theme",
+        "_questions_by_area", "_questions_by_id", "_question_meta",
+        "_question_ids", "_options_by_id", "_assessment_sections",
+        "_recommendations_by_question", "_recommendations_by_area", "_frozen",
+    )
+
+    def __init__(self, recommendations, performance_questions, deepseek_data, content_hash=""):
+        self.content_hash = content_hash
+        self.recommendations = freeze(recommendations)
+        self.focused_areas = freeze(FOCUSED_AREAS)
+        self.performance_questions = freeze(performance_questions)
+        self.deepseek_data = freeze(deepseek_data)
+        self.industry_standards = freeze(INDUSTRY_STANDARDS)
+        self.theme_benchmarks = freeze(THEME_BENCHMARKS)
+        self.industry_standard_sources = freeze(INDUSTRY_STANDARD_SOURCES)
+
+        themes = {}
+        for name, definition in THEME_DEFINITIONS.items():
+            theme = dict(definition)
+            if name == STP_THEME:
+                theme["focused_areas"] = self.focused_areas
+            elif name == PERFORMANCE_THEME:
+                theme["questions"] = self.performance_questions
+            themes[name] = MappingProxyType(theme)
+        self.themes = MappingProxyType(themes)
+
+        areas_by_theme = {name: () for name in themes}
+        questions_by_area = {}
+        questions_by_id = {}
+        question_meta = {}
+
+        areas_by_theme[STP_THEME] = tuple(self.focused_areas)
+        for area, questions in self.focused_areas.items():
+            questions_by_area[(STP_THEME, area)] = questions
+            for question in questions:
+                qid = stp_question_id(area, question["number"])
+                questions_by_id[qid] = question
+                question_meta[qid] = (STP_THEME, area)
+
+        perf_ids_by_area = {}
+        for qid, question in self.performance_questions.items():
+            perf_ids_by_area.setdefault(question["focus_area"], []).append(qid)
+            questions_by_id[qid] = question
+            question_meta[qid] = (PERFORMANCE_THEME, question["focus_area"])
+        areas_by_theme[PERFORMANCE_THEME] = tuple(perf_ids_by_area)
+        for area, qids in perf_ids_by_area.items():
+            questions_by_area[(PERFORMANCE_THEME, area)] = tuple(self.performance_questions[qid] for qid in qids)
+
+        self._areas_by_theme = MappingProxyType(areas_by_theme)
+        self._questions_by_area = MappingProxyType(questions_by_area)
+        self._questions_by_id = MappingProxyType(questions_by_id)
+        self._question_meta = MappingProxyType(question_meta)
+        self._question_ids = MappingProxyType({
+            (theme, area, questions_by_id[qid]["question"]): qid for qid, (theme, area) in question_meta.items()
+        })
+        self._options_by_id = MappingProxyType({
+            qid: tuple((option["text"], option["score"]) for option in question["responses"])
+            if "responses" in question else
+            tuple((text, number) for number, text in enumerate(question["options"], 1))
+            for qid, question in questions_by_id.items()
+        })
+
+        self._build_recommendation_index(perf_ids_by_area)
+        self._build_assessment_sections()
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("Catalogue is immutable")
+        object.__setattr__(self, name, value)
+
+    def _build_recommendation_index(self, perf_ids_by_area):
+        """Map question ids and focus areas to their recommendation tables"""
+        by_question = {}
+        by_area = {}
+        missing = []
+
+        for area in self.focused_areas:
+            table = self.recommendations.get(area)
+            if table is None:
+                missing.append(f"{STP_THEME} / {area}")
+                continue
+            by_area[(STP_THEME, area)] = table
+            for question in self.focused_areas[area]:
+                by_question[stp_question_id(area, question["number"])] = table
+
+        # deepseek entries are keyed Q1..Qn; match them to questions by text
+        by_text = {
+            entry["question"].strip().lower(): entry["recommendations"]
+            for entry in self.deepseek_data.values()
+        }
+        for qid, question in self.performance_questions.items():
+            table = by_text.get(question["question"].strip().lower())
+            if table is None:
+                missing.append(f"{PERFORMANCE_THEME} / {qid}")
+                continue
+            by_question[qid] = table
+        for area, qids in perf_ids_by_area.items():
+            # The area-level recommendation comes from its first question
+            if qids[0] in by_question:
+                by_area[(PERFORMANCE_THEME, area)] = by_question[qids[0]]
+
+        if missing:
+            raise ValueError("No recommendation table for: " + ", ".join(missing))
+
+        self._recommendations_by_question = MappingProxyType(by_question)
+        self._recommendations_by_area = MappingProxyType(by_area)
+
+    def _build_assessment_sections(self):
+        """Precompute the section sequence of every combination of questionnaire themes"""
+        sequences = {}
+        for size in range(1, len(QUESTIONNAIRE_THEMES) + 1):
+            for themes in combinations(QUESTIONNAIRE_THEMES, size):
+                sections = []
+                start = 0
+                for theme in themes:
+                    for area in self.focus_areas(theme):
+                        questions = []
+                        for question in self.questions(theme, area):
+                            qid = self.question_id(theme, area, question["question"])
+                            options = self._options_by_id[qid]
+                            questions.append(AssessmentQuestion(qid, question["question"], options,
+                                                                tuple(text for text, _ in options),
+                                                                MappingProxyType(dict(options))))
+                        sections.append(AssessmentSection(theme, area, start, tuple(questions)))
+                        start += len(questions)
+                sequences[frozenset(themes)] = tuple(sections)
+        self._assessment_sections = MappingProxyType(sequences)
+
+    def theme(self, name):
+        """Theme definition (status, description and question data)"""
+        return self.themes[name]
+
+    def focus_areas(self, theme):
+        """Focus area names of a theme, in question order"""
+        return self._areas_by_theme.get(theme, ())
+
+    def questions(self, theme, area):
+        """Questions of one focus area of a theme"""
+        return self._questions_by_area.get((theme, area), ())
+
+    def question(self, question_id):
+        """Question dict by id (performance key or `stp_question_id`)"""
+        return self._questions_by_id[question_id]
+
+    def question_meta(self, question_id):
+        """(theme, focus area) a question belongs to"""
+        return self._question_meta[question_id]
+
+    def question_id(self, theme, area, text):
+        """Id of the question with this text in a theme's focus area, or None"""
+        return self._question_ids.get((theme, area, text))
+
+    def options(self, question_id):
+        """(option text, score) pairs of a question, in display order"""
+        return self._options_by_id[question_id]
+
+    def question_recommendations(self, question_id):
+        """Recommendation texts keyed by level ('1'..'5') for a question"""
+        return self._recommendations_by_question.get(question_id, MappingProxyType({}))
+
+    def area_recommendations(self, theme, area):
+        """Recommendation texts keyed by level ('1'..'5') for a focus area"""
+        return self._recommendations_by_area.get((theme, area), MappingProxyType({}))
+
+    def assessment_sections(self, themes):
+        """AssessmentSections of a combined assessment of `themes`, one per focus area"""
+        return self._assessment_sections.get(frozenset(themes) & frozenset(QUESTIONNAIRE_THEMES), ())
+
+
+def _stat_key(paths):
+    key = []
+    for path in paths:
+        st = os.stat(path)
+        key.append((st.st_mtime_ns, st.st_size))
+    return tuple(key)
+
+
+def _read_sources(paths):
+    """Read source files, returning (raw bytes per file, combined sha256)"""
+    digest = hashlib.sha256()
+    contents = []
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest.update(data)
+        contents.append(data)
+    return contents, digest.hexdigest()
+
+
+@timed("catalogue_build")
+def build_catalogue(paths=SOURCE_FILES):
+    """Load the JSON sources and build a new Catalogue"""
+    contents, content_hash = _read_sources(paths)
+    recommendations = json.loads(contents[0])
+    performance_questions = json.loads(contents[1])["questions"]
+    deepseek_data = json.loads(contents[2])["questions"]
+    return Catalogue(recommendations, performance_questions, deepseek_data, content_hash)
+
+
+_lock = threading.Lock()
+_cached = None
+_cached_stat = None
+_last_check = 0.0
+
+
+def get_catalogue(force_check=False):
+    """Return the process-wide Catalogue, rebuilding it if the sources changed"""
+    global _cached, _cached_stat, _last_check
+
+    now = time.monotonic()
+    if _cached is not None and not force_check and now - _last_check < CHECK_INTERVAL:
+        return _cached
+
+    with _lock:
+        _last_check = now
+        stat_key = _stat_key(SOURCE_FILES)
+        if _cached is not None and stat_key == _cached_stat:
+            return _cached
+        if _cached is not None:
+            # mtime changed; only rebuild if the content really did
+            _, content_hash = _read_sources(SOURCE_FILES)
+            if content_hash == _cached.content_hash:
+                _cached_stat = stat_key
+                return _cached
+        _cached = build_catalogue(SOURCE_FILES)
+        _cached_stat = stat_key
+        return _cached
+
+
+def clear_cache():
+    """Drop the cached catalogue so the next call reloads from disk"""
+    global _cached, _cached_stat, _last_check
+    with _lock:
+        _cached = None
+        _cached_stat = None
+        _last_check = 0.0
@@ -0,0 +1,230 @@
+"""Recommendation prompts and precomputed per-organisation recommendation packs.
+
+The single-theme results page is organisation level: its scores, static
+recommendations and LLM prompts depend only on the organisation's stored
+responses.  `build_packs.py` runs that pipeline offline and saves one
+versioned pack per organisation under `<data dir>/packs/`; the results page
+reads the pack and only generates what it does not cover.
+
+A pack section is reused only when its prompt, model and options are
+identical to what the page would send now, so a pack never shows text for
+scores that have since changed - those sections are generated live.
+"""
+import json
+import os
+import time
+
+from .question_bank import PERFORMANCE_THEME, STP_THEME
+from .storage import org_key
+
+# Bump when the pack layout changes; older packs are ignored and rebuilt
+PACK_VERSION = 1
+PACKS_DIR = "packs"
+
+LLM_MODEL = "llama3.2:latest"
+LLM_OPTIONS = {"temperature": 0.6}
+
+
+# -----------------------------
+# Prompts
+# -----------------------------
+def full_prompt(prompt, context=""):
+    """Text actually sent to the model"""
+    return f"{context}\n\n{prompt}"
+
+
+def holistic_prompt(overall_score, maturity_gap):
+    """Prompt for holistic organization-level recommendations"""
+    return f"""
+    As a procurement consultant, provide holistic recommendations for an organization 
+    with overall procurement maturity at {overall_score}/5.0. 
+    
+    The organization is {abs(maturity_gap):.1f} points below industry standard.
+    Focus on strategic priorities that would have the most significant impact on 
+    improving overall procurement maturity. Include both short-term quick wins and 
+    long-term transformation initiatives.
+    """
+
+
+def role_actions_prompt(designations, maturity_gap):
+    """Prompt for role-specific action items"""
+    return f"""
+    Generate specific action items for different roles in procurement to improve 
+    procurement maturity. Current maturity gap: {maturity_gap:.1f} below industry standard.
+    
+    Roles: {', '.join(sorted(designations))}
+    
+    For each role, provide 2-3 concrete, executable action items that align with 
+    their responsibilities and will contribute to improving overall procurement maturity.
+    """
+
+
+def theme_prompt(theme, score, benchmark):
+    """Prompt for theme-level recommendations"""
+    return f"""
+    As a procurement consultant, provide recommendations for improving the {theme} capability.
+    The organization's current maturity level is {score}/5.0 (industry benchmark: {benchmark}/5.0).
+    Focus on strategic priorities that would have the most significant impact.
+    Provide 2-3 actionable recommendations.
+    """
+
+
+def org_designations(org_data):
+    """Unique, title-cased designations of all users in an organisation"""
+    designations = set()
+    for user in (org_data or {}).get("users", []):
+        # Check multiple possible locations for designation
+        designation = ""
+        if user.designation:
+            designation = user.designation
+        elif user.user_info and user.user_info.get("designation"):
+            designation = user.user_info["designation"]
+        if designation and designation.strip():
+            designations.add(designation.strip().title())
+    return designations
+
+
+def industry_average(benchmarks):
+    """Mean of a theme's industry benchmark scores (0 if there are none)"""
+    return sum(benchmarks.values()) / len(benchmarks) if benchmarks else 0
+
+
+def role_gap(maturity_gap):
+    """Gap magnitude used in the role-specific prompt"""
+    return abs(maturity_gap) if maturity_gap < 0 else 0.5
+
+
+def area_score_level(theme, score):
+    """Recommendation level ("1".."5") for a focus-area score"""
+    if theme == STP_THEME:
+        return str(min(5, max(1, int(round(score)))))
+    return str(int(round(score)))
+
+
+def section_id(key):
+    """Pack key for a results-page AI section key ("holistic", ("area", name), ...)"""
+    return key if isinstance(key, str) else ":".join(key)
+
+
+# -----------------------------
+# Pack building
+# -----------------------------
+def source_fingerprint(org_data):
+    """Identifies the stored responses a pack was built from"""
+    users = (org_data or {}).get("users", [])
+    return {"users": len(users), "last_timestamp": max((u.timestamp or "" for u in users), default="")}
+
+
+def theme_pack(org_data, theme, maturity, catalogue):
+    """Scores, static recommendations and LLM prompts of one theme's results page"""
+    industry = catalogue.industry_standards.get(theme, {})
+    average = industry_average(industry)
+    maturity_gap = maturity["overall"] - average
+    designations = sorted(org_designations(org_data))
+
+    sections = {"holistic": {"prompt": holistic_prompt(maturity["overall"], maturity_gap)}}
+    if designations:
+        sections["roles"] = {"prompt": role_actions_prompt(designations, role_gap(maturity_gap))}
+
+    areas = {}
+    for area, score in maturity["by_area"].items():
+        level = area_score_level(theme, score)
+        benchmark = industry.get(area, 3.0)
+        areas[area] = {
+            "score": score,
+            "industry": benchmark,
+            "level": level,
+            "static": catalogue.area_recommendations(theme, area).get(level, "No recommendation available")
+        }
+        sections[section_id(("area", area))] = {"prompt": theme_prompt(area, score, benchmark)}
+
+    return {
+        "maturity": maturity,
+        "industry_average": average,
+        "designations": designations,
+        "areas": areas,
+        "sections": sections
+    }
+
+
+def build_pack(org_data, catalogue, maturity_fn, generate=None, model=LLM_MODEL, options=LLM_OPTIONS):
+    """Pack for every theme the organisation has responses for.
+
+    `maturity_fn(org_data, theme)` returns the org maturity (or None);
+    `generate(prompt)` returns the LLM text for a prompt or raises, in which
+    case the section is stored without text and left to the page.
+    """
+    pack = {
+        "version": PACK_VERSION,
+        "organization": org_data["organization"],
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "model": model,
+        "options": options,
+        "source": source_fingerprint(org_data),
+        "themes": {}
+    }
+    for theme in (STP_THEME, PERFORMANCE_THEME):
+        maturity = maturity_fn(org_data, theme)
+        if not maturity:
+            continue
+        themed = pack["themes"][theme] = theme_pack(org_data, theme, maturity, catalogue)
+        if generate is None:
+            continue
+        for section in themed["sections"].values():
+            try:
+                section["text"] = generate(section["prompt"])
+            except Exception as e:
+                section["error"] = str(e)
+    return pack
+
+
+def pack_complete(pack):
+    """Whether every section of the pack has generated text"""
+    return all("text" in section
+               for themed in pack["themes"].values()
+               for section in themed["sections"].values())
+
+
+# -----------------------------
+# Pack storage
+# -----------------------------
+def pack_path(data_dir, organization):
+    return os.path.join(data_dir, PACKS_DIR, f"{org_key(organization)}.json")
+
+
+def save_pack(data_dir, pack):
+    """Atomically write an organisation's pack"""
+    path = pack_path(data_dir, pack["organization"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(pack, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_pack(data_dir, organization):
+    """The organisation's pack, or None if missing, unreadable or of another version"""
+    try:
+        with open(pack_path(data_dir, organization)) as f:
+            pack = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return pack if pack.get("version") == PACK_VERSION else None
+
+
+def section_text(pack, theme, key, prompt, model=LLM_MODEL, options=LLM_OPTIONS):
+    """Pack text for a results-page AI section, if built from the identical request"""
+    if not pack or pack.get("model") != model or pack.get("options") != options:
+        return None
+    section = pack["themes"].get(theme, {}).get("sections", {}).get(section_id(key))
+    if section and section.get("prompt") == prompt:
+        return section.get("text")
+    return None
+
+
+def static_recommendation(pack, theme, area, level):
+    """Pack's static recommendation for an area, if built for the same score level"""
+    area_pack = pack["themes"].get(theme, {}).get("areas", {}).get(area) if pack else None
+    if area_pack and area_pack.get("level") == level:
+        return area_pack["static"]
+    return None
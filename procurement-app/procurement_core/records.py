@@ -0,0 +1,274 @@
+"""Typed user and response records, and their compact on-disk form.
+
+In memory a submission is a `UserRecord` holding `Response`s: `__slots__`
+dataclasses with one schema for every theme (`area` / `answer` rather
+than Source-To-Pay's `focused_area` / `selected_text` and Procurement
+Performance's `focus_area` / `response`, and a `theme` on every response).
+
+On disk (RECORD_VERSION 2) a user is
+
+    {"v": 2, "c": layout, "email": ..., "name": ..., "designation": ...,
+     "theme": ..., "timestamp": ..., "r": [[question id, option index, score], ...]}
+
+and question, answer, theme and area text are resolved from the question
+bank when the record is read.  A response whose question or answer is not
+in the bank is kept in full as {"theme", "area", "question", "answer",
+"score"}, as is one whose answer the bank now scores differently.
+
+The bank may change after a record was written (options reordered,
+inserted or removed, questions renumbered), so ids are only meaningful
+against the bank they were written with.  `layout` is a hash of the
+bank's questions and options, stamped on every record, and storage
+archives each layout it writes with (`archive_layout`, found again
+through `add_layout_dir`).  A record with another stamp is decoded
+through its archived bank to question and answer text, then matched to
+the current bank by text.  Without an archive (records written before
+stamps, or a missing file) an id whose option is gone or no longer has the
+stored score is not trusted: the response keeps theme, area and score,
+its question becomes the id and its answer None, and from then on it is
+stored in full.  Decoded responses are immutable and interned per catalogue, so
+the thousands of identical answers in an organisation share a few hundred
+objects.
+
+Version 1 records (the original free-form dicts) are still read, so
+existing files keep working; migrate_records.py rewrites them.
+"""
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+from .question_bank import PERFORMANCE_THEME, STP_THEME, get_catalogue
+
+RECORD_VERSION = 2
+
+# Characters of the sha256 kept as a layout stamp
+LAYOUT_HASH_LENGTH = 12
+
+
+@dataclass(slots=True, frozen=True)
+class Response:
+    """One answered question"""
+
+    theme: str
+    area: str
+    question: str
+    answer: str
+    score: int
+    # Catalogue question id and option index, when the answer is in the bank
+    question_id: str = None
+    option: int = None
+
+
+@dataclass(slots=True)
+class UserRecord:
+    """One respondent's latest submission"""
+
+    email: str
+    name: str = ""
+    designation: str = ""
+    theme: str = None
+    timestamp: str = ""
+    responses: tuple = ()
+    user_info: dict = None
+
+
+class RecordCodec:
+    """Converts records to and from their stored form against one Catalogue"""
+
+    def __init__(self, catalogue):
+        self.catalogue = catalogue
+        self._interned = {}
+        self._restamped = {}
+        self._option_indexes = {}
+        # question id -> [theme, area, question, [[option text, score], ...]]
+        self.layout_table = {}
+        for theme in (STP_THEME, PERFORMANCE_THEME):
+            for area in catalogue.focus_areas(theme):
+                for question in catalogue.questions(theme, area):
+                    question_id = catalogue.question_id(theme, area, question["question"])
+                    self.layout_table[question_id] = [theme, area, question["question"],
+                                                      [list(option) for option in catalogue.options(question_id)]]
+        digest = hashlib.sha256(json.dumps(self.layout_table, sort_keys=True).encode())
+        self.layout = digest.hexdigest()[:LAYOUT_HASH_LENGTH]
+
+    def response(self, question_id, option, score):
+        """Interned Response for an answer given by question id and option index"""
+        key = (question_id, option, score)
+        response = self._interned.get(key)
+        if response is None:
+            try:
+                theme, area = self.catalogue.question_meta(question_id)
+                question = self.catalogue.question(question_id)["question"]
+                options = self.catalogue.options(question_id)
+            except KeyError:
+                # Question since removed from the bank: keep the ids so it round-trips
+                response = Response(None, None, question_id, None, score, question_id, option)
+            else:
+                if 0 <= option < len(options) and options[option][1] == score:
+                    response = Response(theme, area, question, options[option][0], score, question_id, option)
+                else:
+                    # The bank changed under this record: the index no longer names its answer
+                    response = Response(theme, area, question_id, None, score)
+            response = self._interned.setdefault(key, response)
+        return response
+
+    def _option_index(self, question_id, answer):
+        index = self._option_indexes.get(question_id)
+        if index is None:
+            index = self._option_indexes[question_id] = {
+                text: i for i, (text, _) in enumerate(self.catalogue.options(question_id))
+            }
+        return index.get(answer)
+
+    def response_from_dict(self, data, user_theme=None):
+        """Response from a full dict: either version 1 shape or the unified keys"""
+        theme = data.get("theme") or user_theme
+        area = data.get("area", data.get("focused_area", data.get("focus_area")))
+        question = data.get("question")
+        answer = data.get("answer", data.get("selected_text", data.get("response")))
+        score = data.get("score")
+        question_id = self.catalogue.question_id(theme, area, question)
+        if question_id is not None:
+            option = self._option_index(question_id, answer)
+            if option is not None and self.catalogue.options(question_id)[option][1] == score:
+                return self.response(question_id, option, score)
+        return Response(theme, area, question, answer, score)
+
+    def restamped_response(self, stamp, table, item, user_theme=None):
+        """Response from an item written with another (archived) layout, matched by text"""
+        if not isinstance(item, list):
+            return self.response_from_dict(item, user_theme)
+        key = (stamp, *item)
+        response = self._restamped.get(key)
+        if response is None:
+            question_id, option, score = item
+            written = table.get(question_id)
+            if written is None or not 0 <= option < len(written[3]):
+                response = self.response(question_id, option, score)
+            else:
+                theme, area, question, options = written
+                response = self.response_from_dict({"theme": theme, "area": area, "question": question,
+                                                    "answer": options[option][0], "score": score})
+            response = self._restamped.setdefault(key, response)
+        return response
+
+    def decode_response(self, item, user_theme=None):
+        """Response from its stored form ([id, option, score] or a dict)"""
+        if isinstance(item, list):
+            return self.response(*item)
+        return self.response_from_dict(item, user_theme)
+
+    def decode_user(self, entry):
+        """UserRecord from a stored user entry of any version"""
+        theme = entry.get("theme")
+        stamp = entry.get("c")
+        table = archived_layout(stamp) if stamp is not None and stamp != self.layout else None
+        if table is not None:
+            responses = tuple(self.restamped_response(stamp, table, item, theme) for item in entry["r"])
+        else:
+            items = entry["r"] if entry.get("v", 1) >= 2 else entry.get("responses", [])
+            responses = tuple(self.decode_response(item, theme) for item in items)
+        return UserRecord(
+            email=entry["email"],
+            name=entry.get("name", ""),
+            designation=entry.get("designation", ""),
+            theme=theme,
+            timestamp=entry.get("timestamp", ""),
+            responses=responses,
+            user_info=entry.get("user_info")
+        )
+
+    def encode_response(self, response):
+        if response.question_id is not None and response.option is not None:
+            return [response.question_id, response.option, response.score]
+        return {"theme": response.theme, "area": response.area, "question": response.question,
+                "answer": response.answer, "score": response.score}
+
+    def encode_user(self, user):
+        """Stored (version RECORD_VERSION) form of a UserRecord"""
+        entry = {
+            "v": RECORD_VERSION,
+            "c": self.layout,
+            "email": user.email,
+            "name": user.name,
+            "designation": user.designation,
+            "theme": user.theme,
+            "timestamp": user.timestamp,
+            "r": [self.encode_response(response) for response in user.responses]
+        }
+        if user.user_info is not None:
+            entry["user_info"] = user.user_info
+        return entry
+
+    def user_record(self, value):
+        """`value` as a UserRecord (stored entries and app dicts are converted)"""
+        return value if isinstance(value, UserRecord) else self.decode_user(value)
+
+    def archive_layout(self, directory):
+        """Write the layout to `directory`/<layout>.json, unless it is already there"""
+        path = os.path.join(directory, f"{self.layout}.json")
+        if os.path.exists(path):
+            return
+        os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.layout_table, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+
+
+# -----------------------------
+# Archived layouts
+# -----------------------------
+_layout_dirs = []
+_layouts = {}       # stamp -> layout table, or None when no directory has it
+_layouts_lock = threading.Lock()
+
+
+def add_layout_dir(directory):
+    """Also look for archived layouts in `directory`"""
+    directory = os.path.abspath(directory)
+    with _layouts_lock:
+        if directory not in _layout_dirs:
+            _layout_dirs.append(directory)
+            for stamp in [stamp for stamp, table in _layouts.items() if table is None]:
+                del _layouts[stamp]
+
+
+def archived_layout(stamp):
+    """Layout table archived under `stamp`, or None"""
+    with _layouts_lock:
+        if stamp in _layouts:
+            return _layouts[stamp]
+        directories = list(_layout_dirs)
+    table = None
+    for directory in directories:
+        try:
+            with open(os.path.join(directory, f"{stamp}.json")) as f:
+                table = json.load(f)
+            break
+        except FileNotFoundError:
+            continue
+    with _layouts_lock:
+        _layouts[stamp] = table
+    return table
+
+
+_codec = None
+_codec_lock = threading.Lock()
+
+
+def get_codec():
+    """Process-wide RecordCodec for the current catalogue"""
+    global _codec
+    catalogue = get_catalogue()
+    codec = _codec
+    if codec is None or codec.catalogue is not catalogue:
+        with _codec_lock:
+            if _codec is None or _codec.catalogue is not catalogue:
+                _codec = RecordCodec(catalogue)
+            codec = _codec
+    return codec
@@ -0,0 +1,281 @@
+"""Vectorised scoring engine for organisation and theme maturity.
+
+An organisation's responses are flattened once into rows, and every
+statistic the results page needs - means, medians, dispersion and
+participation counts, overall, per theme and per area - comes out of
+numpy counts and grouped pandas aggregations instead of Python loops over
+nested dicts.
+
+Decoded responses are interned (records.py), so an organisation of
+thousands of respondents holds only a few hundred distinct Response
+objects.  Rows are kept as codes into a table of those (`_Rows`), and
+text and score are read once per distinct response.  Maturity is a
+count of each code among a theme's rows; the columnar frame (user,
+user_theme, theme, area, question, score, text as categoricals) that
+`summarize` and the reports group is only built when asked for.
+
+Rows and frames are memoised per organisation (bounded LRU).  Every
+upsert moves the saved user to the end of the org's user list with a
+fresh timestamp, so (organisation, user count, last email, last
+timestamp) identifies an organisation's contents, and (email, timestamp)
+a submission's: the rebuild after a save reuses the previous build's
+codes for every submission it already held and only codes the new one.
+Cached frames are shared: treat them as read-only.
+
+numpy and pandas are imported by the functions that build rows, so
+importing this module costs nothing until they are needed (workers that
+read maturity from stored aggregates never load them).
+"""
+import threading
+from collections import OrderedDict
+from itertools import chain
+
+from .records import get_codec
+
+FRAME_CACHE_SIZE = 32
+
+_frame_cache = OrderedDict()   # fingerprint -> frame
+_rows_cache = OrderedDict()    # organisation -> (fingerprint, _Rows)
+_frame_cache_lock = threading.Lock()
+
+
+class _Rows:
+    """Response rows of a list of users as codes into a table of distinct responses"""
+
+    __slots__ = ("codec", "users", "counts", "table", "positions", "codes")
+
+    def __init__(self, codec, users):
+        self.codec = codec
+        self.users = users     # UserRecords with responses, in row order
+        self.counts = None     # rows per user
+        self.table = []        # distinct Response objects
+        self.positions = {}    # id(response) -> index in table
+        self.codes = None      # table index of every row
+
+    def runs(self):
+        """(email, timestamp) -> (first row, responses) of every submission held"""
+        starts = (self.counts.cumsum() - self.counts).tolist()
+        return {(user.email, user.timestamp): (start, user.responses) for user, start in zip(self.users, starts)}
+
+
+def _code(rows, responses):
+    """Table positions of `responses`, adding unseen distinct ones to rows.table"""
+    import numpy as np
+    import pandas as pd
+
+    # Equal interned responses are the same object, so factorising their
+    # ids numbers the distinct ones in order of first appearance
+    local, distinct_ids = pd.factorize(np.fromiter(map(id, responses), dtype=np.int64, count=len(responses)))
+    first_rows = np.flatnonzero(~pd.Series(local).duplicated().to_numpy())
+    to_table = np.empty(len(distinct_ids), dtype=np.int64)
+    for code, row in enumerate(first_rows.tolist()):
+        response = responses[row]
+        position = rows.positions.get(id(response))
+        if position is None:
+            position = rows.positions[id(response)] = len(rows.table)
+            rows.table.append(response)
+        to_table[code] = position
+    return to_table[local]
+
+
+def _flatten(users, codec, previous=None):
+    """_Rows of `users` (with responses), reusing `previous`'s codes of the submissions it holds"""
+    import numpy as np
+
+    rows = _Rows(codec, users)
+    rows.counts = np.fromiter(map(len, (user.responses for user in users)), dtype=np.int64, count=len(users))
+    # The table only grows, so start afresh once superseded responses dominate it
+    if previous is None or previous.codec is not codec or len(previous.table) > len(previous.codes):
+        rows.codes = _code(rows, list(chain.from_iterable(user.responses for user in users)))
+        return rows
+
+    rows.table, rows.positions = list(previous.table), dict(previous.positions)
+    held = previous.runs()
+    # Each user's rows are either a run of previous.codes or appended to `new`
+    starts = []
+    new = []
+    for user in users:
+        run = held.get((user.email, user.timestamp))
+        # Interned responses make this an identity check per response
+        if run is not None and run[1] == user.responses:
+            starts.append(run[0])
+        else:
+            starts.append(len(previous.codes) + len(new))
+            new.extend(user.responses)
+    all_codes = np.concatenate([previous.codes, _code(rows, new)])
+
+    # Row i of a user whose run starts at `start` is all_codes[start + i]
+    offsets = rows.counts.cumsum() - rows.counts
+    run_starts = np.repeat(np.array(starts, dtype=np.int64) - offsets, rows.counts)
+    rows.codes = all_codes[run_starts + np.arange(len(run_starts))]
+    return rows
+
+
+def _frame(rows):
+    import numpy as np
+    import pandas as pd
+
+    users, counts, codes, table = rows.users, rows.counts, rows.codes, rows.table
+
+    # Per-user columns are factorised once per user and repeated per response
+    user_codes, user_uniques = pd.factorize(np.asarray([user.email for user in users], dtype=object))
+    theme_codes, theme_uniques = pd.factorize(np.asarray([user.theme for user in users], dtype=object))
+    user_theme_codes = np.repeat(theme_codes, counts)
+
+    def column(values):
+        value_codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        return pd.Categorical.from_codes(value_codes[codes], uniques)
+
+    # Responses carry their own theme (which splits combined assessments);
+    # ones whose question is no longer in the bank inherit the user's
+    value_codes, themes = pd.factorize(np.asarray([r.theme for r in table] + list(theme_uniques), dtype=object))
+    response_themes = value_codes[:len(table)][codes]
+    missing = response_themes == -1
+    if missing.any():
+        inherited = np.append(value_codes[len(table):], -1)  # -1: the user has no theme either
+        response_themes[missing] = inherited[user_theme_codes[missing]]
+
+    return pd.DataFrame({
+        "user": pd.Categorical.from_codes(np.repeat(user_codes, counts), user_uniques),
+        "user_theme": pd.Categorical.from_codes(user_theme_codes, theme_uniques),
+        "theme": pd.Categorical.from_codes(response_themes, themes),
+        "area": column([r.area for r in table]),
+        "question": column([r.question for r in table]),
+        "score": np.array([r.score for r in table], dtype=float)[codes]
+    })
+
+
+def _records(users):
+    """Users (UserRecords or stored / app dicts) with responses, as UserRecords"""
+    codec = get_codec()
+    return [user for user in map(codec.user_record, users) if user.responses]
+
+
+def responses_frame(users):
+    """Flatten users (records.UserRecord or stored / app dicts) into one row per response"""
+    return _frame(_flatten(_records(users), get_codec()))
+
+
+def _fingerprint(org_data):
+    users = org_data["users"]
+    last = get_codec().user_record(users[-1]) if users else None
+    return (org_data.get("organization"), len(users), last and last.email, last and last.timestamp)
+
+
+def _org_rows(org_data):
+    """(fingerprint, _Rows) for an organisation's data, memoised"""
+    key = _fingerprint(org_data)
+    organization = key[0]
+    with _frame_cache_lock:
+        cached = _rows_cache.get(organization)
+        if cached is not None:
+            _rows_cache.move_to_end(organization)
+            if cached[0] == key:
+                return cached
+    rows = _flatten(_records(org_data["users"]), get_codec(), cached and cached[1])
+    with _frame_cache_lock:
+        _rows_cache[organization] = (key, rows)
+        _rows_cache.move_to_end(organization)
+        while len(_rows_cache) > FRAME_CACHE_SIZE:
+            _rows_cache.popitem(last=False)
+    return key, rows
+
+
+def org_frame(org_data):
+    """Responses frame for an organisation's data ({"users": [...]} of
+    UserRecords or stored / app dicts), memoised"""
+    if not org_data or not org_data.get("users"):
+        return responses_frame([])
+    key, rows = _org_rows(org_data)
+    with _frame_cache_lock:
+        frame = _frame_cache.get(key)
+        if frame is not None:
+            _frame_cache.move_to_end(key)
+            return frame
+    frame = _frame(rows)
+    with _frame_cache_lock:
+        _frame_cache[key] = frame
+        while len(_frame_cache) > FRAME_CACHE_SIZE:
+            _frame_cache.popitem(last=False)
+    return frame
+
+
+def clear_cache():
+    """Drop all memoised frames and rows"""
+    with _frame_cache_lock:
+        _frame_cache.clear()
+        _rows_cache.clear()
+
+
+def _describe(grouped):
+    stats = grouped.agg(
+        mean=("score", "mean"),
+        median=("score", "median"),
+        std=("score", "std"),
+        responses=("score", "size"),
+        participants=("user", "nunique")
+    )
+    stats["std"] = stats["std"].fillna(0.0)
+    return stats
+
+
+def summarize(frame, by="theme"):
+    """Per-theme and per-area statistics in one grouped pass.
+
+    `by` selects the theme column: "theme" (the theme each response belongs
+    to, which splits combined assessments) or "user_theme" (the theme the
+    user selected, as the single-theme results page uses).
+
+    Returns {"overall": DataFrame indexed by theme,
+             "by_area": DataFrame indexed by (theme, area)}; both have mean,
+    median, std, responses and participants columns.
+    """
+    return {
+        "overall": _describe(frame.groupby(by, sort=False, observed=True)),
+        "by_area": _describe(frame.groupby([by, "area"], sort=False, observed=True))
+    }
+
+
+def org_maturity(org_data, theme):
+    """Same result as the original calculate_org_maturity, computed vectorised"""
+    import numpy as np
+    import pandas as pd
+
+    if not org_data or not org_data.get("users"):
+        return None
+    _, rows = _org_rows(org_data)
+    selected = np.fromiter((user.theme == theme for user in rows.users), dtype=bool, count=len(rows.users))
+    if not selected.any():
+        return None
+    codes = rows.codes[np.repeat(selected, rows.counts)]
+    hits = np.bincount(codes, minlength=len(rows.table))
+    # Distinct responses in order of first appearance, so areas come out in
+    # the order the loop met them (a removed question's area is None, as it was)
+    totals = {}
+    for code in pd.unique(codes).tolist():
+        response = rows.table[code]
+        total = totals.setdefault(response.area, [0, 0])
+        total[0] += response.score * int(hits[code])
+        total[1] += int(hits[code])
+    return {
+        "overall": round(sum(total[0] for total in totals.values()) / len(codes), 1),
+        "by_area": {area: round(score / count, 1) for area, (score, count) in totals.items()}
+    }
+
+
+def stored_org_maturity(storage, org_data, theme):
+    """Org maturity the way the results page gets it: backend aggregates when available"""
+    if storage.supports_aggregates:
+        return storage.org_maturity(org_data["organization"], theme)
+    return org_maturity(org_data, theme)
+
+
+def theme_scores(responses, themes=None):
+    """Average score per theme of one user's combined responses, rounded to 1 dp"""
+    totals = {}
+    for response in responses:
+        total = totals.setdefault(response["theme"], [0, 0])
+        total[0] += response["score"]
+        total[1] += 1
+    order = themes if themes is not None else list(totals)
+    return {theme: round(totals[theme][0] / totals[theme][1], 1) for theme in order if theme in totals}
@@ -0,0 +1,769 @@
+"""Response storage backends for the Procurement Maturity app.
+
+All backends share one small interface:
+
+    backend.save_user(organization, user_record)   # upsert by email
+    backend.get_org_data(organization)             # {"organization", "users"}
+    backend.list_organizations()
+    backend.compact(organization)                  # rewrite in the current format
+
+Users come back as records.UserRecord instances and are stored in the
+compact, versioned record format of records.py (question and option ids
+rather than text); `save_user` also accepts the app's plain dicts, and
+records written by older versions are still read.
+
+`JsonlLogBackend` (the default) keeps one append-only JSON Lines log per
+organisation.  A submission is a single fsync'd append under a per-org file
+lock, so concurrent submitters never lose each other's updates and the write
+cost does not grow with the size of the organisation.  Readers replay the
+log (last record per email wins) and remember how far they got, so a later
+read only parses lines appended since.  When superseded records outnumber
+live ones the log is compacted into a fresh snapshot.  Each snapshot's
+header carries a new random id, which is how readers in other processes
+notice a compaction (inode numbers are reused across replaces).  An
+organisation still in the original `<org>.json` format is read from that
+file in memory; it becomes a log on its first write, or when
+migrate_records.py compacts it, so reading never changes the data
+directory.
+
+`JsonFileBackend` is the original whole-file `<org>.json` format, now with
+the same per-org locking.
+
+`SqliteBackend` keeps every organisation in one WAL-mode SQLite database
+with one row per response and indexes on organisation, email, theme and
+timestamp, so cross-organisation queries and aggregates run as SQL.  Use
+migrate_to_sqlite.py to import existing JSON/JSONL files.
+
+Both the JSONL and SQLite backends keep running per-area score aggregates
+(see aggregates.py), so results pages need not rescan every response.
+
+The JSON and JSONL backends archive the question bank layout their
+records are written with under `question_banks/` (see records.py), so
+records stay readable after the bank changes; SQLite keeps the answered
+text in its columns instead.
+
+Select a backend with the PROCUREMENT_STORAGE environment variable
+("jsonl", "json" or "sqlite").
+
+Time spent waiting for the per-org locks, and for SQLite's write lock, is
+recorded as "storage_lock_wait" spans (see instrumentation.py).
+"""
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+
+from .aggregates import AreaStat, OrgAggregates, maturity_from_stats
+from .instrumentation import span
+from .records import RECORD_VERSION, UserRecord, add_layout_dir, get_codec
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+STORAGE_ENV = "PROCUREMENT_STORAGE"
+DEFAULT_BACKEND = "jsonl"
+
+# Compact once the log holds at least this many records ...
+COMPACT_MIN_RECORDS = 64
+# ... and more than this many records per live user
+COMPACT_RATIO = 2.0
+
+# 2: users in the compact record format (records.py)
+LOG_VERSION = 2
+
+# Stored records are written without whitespace
+COMPACT_JSON = {"separators": (",", ":")}
+
+SQLITE_FILE = "procurement.db"
+
+# Archived question bank layouts, under the data directory
+LAYOUT_DIR = "question_banks"
+
+
+def org_key(organization):
+    """File-system safe key for an organisation name"""
+    return organization.replace(" ", "_").replace("/", "-")
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive inter-process lock held on `path` for the duration of the block"""
+    with open(path, "a+b") as f:
+        with span("storage_lock_wait", lock="file"):
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def timed_lock(lock):
+    """Hold a threading lock, recording the wait for it as a storage_lock_wait span"""
+    with span("storage_lock_wait", lock="thread"):
+        lock.acquire()
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def _fsync_dir(path):
+    """Persist a rename in `path` (no-op where directories can't be opened)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class StorageBackend:
+    """Interface shared by all response stores"""
+
+    # Backends that maintain running aggregates set this and implement
+    # area_stats(organization, theme) and org_maturity(organization, theme)
+    supports_aggregates = False
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self._archived_layout = None
+        os.makedirs(data_dir, exist_ok=True)
+        add_layout_dir(os.path.join(data_dir, LAYOUT_DIR))
+
+    def save_user(self, organization, user_record):
+        """Insert or replace the record (UserRecord or dict) of the user's email"""
+        raise NotImplementedError
+
+    def save_users(self, organization, user_records):
+        """Upsert several users of one organisation (backends batch the writes where they can)"""
+        for user_record in user_records:
+            self.save_user(organization, user_record)
+
+    def get_org_data(self, organization):
+        """Return {"organization": ..., "users": [UserRecord, ...]} or None"""
+        raise NotImplementedError
+
+    def compact(self, organization):
+        """Rewrite an organisation's stored records in the current format"""
+        raise NotImplementedError
+
+    def list_organizations(self):
+        """Names of all organisations with stored responses"""
+        raise NotImplementedError
+
+    def release(self, organization):
+        """Drop anything cached in memory for an organisation (streaming passes)"""
+
+    def _lock_path(self, organization):
+        return os.path.join(self.data_dir, f"{org_key(organization)}.lock")
+
+    def _archive_layout(self, codec):
+        """Archive the layout records are about to be written with (once per process)"""
+        if self._archived_layout != codec.layout:
+            codec.archive_layout(os.path.join(self.data_dir, LAYOUT_DIR))
+            self._archived_layout = codec.layout
+
+
+class JsonFileBackend(StorageBackend):
+    """One `<org>.json` document per organisation, rewritten on every save"""
+
+    def _path(self, organization):
+        return os.path.join(self.data_dir, f"{org_key(organization)}.json")
+
+    def _write(self, organization, users):
+        org_file = self._path(organization)
+        codec = get_codec()
+        self._archive_layout(codec)
+        data = {
+            "organization": organization,
+            "version": RECORD_VERSION,
+            "users": [codec.encode_user(user) for user in users]
+        }
+        tmp_file = org_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(data, f, **COMPACT_JSON)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, org_file)
+
+    def save_user(self, organization, user_record):
+        self.save_users(organization, [user_record])
+
+    def save_users(self, organization, user_records):
+        """Upsert several users with a single rewrite of the document"""
+        codec = get_codec()
+        user_records = [codec.user_record(user_record) for user_record in user_records]
+        with file_lock(self._lock_path(organization)):
+            data = self.get_org_data(organization) or {"organization": organization, "users": []}
+            users = {user.email: user for user in data["users"]}
+            for user_record in user_records:
+                # A replaced user moves to the end, as with one save_user per record
+                users.pop(user_record.email, None)
+                users[user_record.email] = user_record
+            self._write(data["organization"], users.values())
+
+    def compact(self, organization):
+        with file_lock(self._lock_path(organization)):
+            data = self.get_org_data(organization)
+            if data is not None:
+                self._write(data["organization"], data["users"])
+
+    def get_org_data(self, organization):
+        org_file = self._path(organization)
+        if os.path.exists(org_file):
+            with open(org_file, "r") as f:
+                data = json.load(f)
+            codec = get_codec()
+            return {
+                "organization": data.get("organization", organization),
+                "users": [codec.decode_user(user) for user in data.get("users", [])]
+            }
+        return None
+
+    def list_organizations(self):
+        names = []
+        for entry in sorted(os.listdir(self.data_dir)):
+            if entry.endswith(".json"):
+                with open(os.path.join(self.data_dir, entry)) as f:
+                    names.append(json.load(f).get("organization", entry[:-5]))
+        return names
+
+
+class _LogState:
+    """What a process has replayed so far from one organisation's log"""
+
+    __slots__ = ("lock", "snapshot", "offset", "organization", "users", "records", "aggregates")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.snapshot = None  # header id of the replayed snapshot; None until a log was read
+        self.offset = 0
+        self.organization = None
+        self.users = {}      # email -> latest UserRecord (insertion ordered)
+        self.records = 0     # user records in the log, including superseded ones
+        self.aggregates = OrgAggregates()
+
+
+class JsonlLogBackend(StorageBackend):
+    """Append-only `<org>.jsonl` log per organisation with periodic compaction"""
+
+    supports_aggregates = True
+
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self._states = {}
+        self._states_lock = threading.Lock()
+
+    def _path(self, organization):
+        return os.path.join(self.data_dir, f"{org_key(organization)}.jsonl")
+
+    def _state(self, key):
+        with self._states_lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _LogState()
+            return state
+
+    def _refresh(self, organization):
+        """Replay any records appended since the last read; returns the state.
+
+        Must be called with the state's lock held.
+        """
+        log_file = self._path(organization)
+        state = self._state(org_key(organization))
+        try:
+            f = open(log_file, "rb")
+        except FileNotFoundError:
+            self._read_legacy(organization, state)
+            return state
+
+        with f:
+            # Snapshots are renamed into place whole, so the header line is complete
+            header = f.readline()
+            meta = json.loads(header).get("_meta", {})
+            snapshot = meta.get("snapshot", "")  # logs written before snapshot ids
+            size = os.fstat(f.fileno()).st_size
+            if snapshot != state.snapshot or size < state.offset:
+                # New file or compacted since we last looked: replay from scratch
+                state.reset()
+                state.snapshot = snapshot
+                state.organization = meta.get("organization")
+                state.offset = len(header)
+            if size == state.offset:
+                return state
+            f.seek(state.offset)
+            chunk = f.read(size - state.offset)
+        # A writer may be mid-append; only consume complete lines
+        end = chunk.rfind(b"\n") + 1
+        codec = get_codec()
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "_meta" in entry:
+                state.organization = entry["_meta"].get("organization")
+                continue
+            user = codec.decode_user(entry)
+            previous = state.users.pop(user.email, None)
+            state.users[user.email] = user
+            state.aggregates.replace_user(previous, user)
+            state.records += 1
+        state.offset += end
+        return state
+
+    def _read_legacy(self, organization, state):
+        """Load an unconverted `<org>.json` into `state`, without writing anything"""
+        legacy_file = os.path.join(self.data_dir, f"{org_key(organization)}.json")
+        try:
+            st = os.stat(legacy_file)
+        except FileNotFoundError:
+            state.reset()
+            return
+        # Never a log's snapshot id, so the log replaces it once written
+        snapshot = f"legacy:{st.st_mtime_ns}:{st.st_size}"
+        if snapshot == state.snapshot:
+            return
+        with open(legacy_file) as f:
+            legacy = json.load(f)
+        state.reset()
+        state.snapshot = snapshot
+        state.organization = legacy.get("organization", organization)
+        codec = get_codec()
+        for user in map(codec.decode_user, legacy.get("users", [])):
+            previous = state.users.pop(user.email, None)
+            state.users[user.email] = user
+            state.aggregates.replace_user(previous, user)
+            state.records += 1
+
+    def _import_legacy(self, organization):
+        """Seed the log from an existing `<org>.json` file, if there is one"""
+        legacy_file = os.path.join(self.data_dir, f"{org_key(organization)}.json")
+        if os.path.exists(self._path(organization)) or not os.path.exists(legacy_file):
+            return
+        with open(legacy_file) as f:
+            legacy = json.load(f)
+        codec = get_codec()
+        users = {user.email: user for user in map(codec.decode_user, legacy.get("users", []))}
+        self._write_snapshot(legacy.get("organization", organization), users.values())
+
+    def _write_snapshot(self, organization, users):
+        log_file = self._path(organization)
+        tmp_file = log_file + ".tmp"
+        codec = get_codec()
+        self._archive_layout(codec)
+        with open(tmp_file, "w") as f:
+            meta = {"organization": organization, "version": LOG_VERSION, "snapshot": uuid.uuid4().hex}
+            f.write(json.dumps({"_meta": meta}) + "\n")
+            for user in users:
+                f.write(json.dumps(codec.encode_user(user), **COMPACT_JSON) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, log_file)
+        _fsync_dir(self.data_dir)
+
+    def save_user(self, organization, user_record):
+        self.save_users(organization, [user_record])
+
+    def save_users(self, organization, user_records):
+        """Append several users' records in one write and fsync"""
+        log_file = self._path(organization)
+        codec = get_codec()
+        self._archive_layout(codec)
+        lines = "".join(json.dumps(codec.encode_user(codec.user_record(user_record)), **COMPACT_JSON) + "\n"
+                        for user_record in user_records)
+        state = self._state(org_key(organization))
+        with timed_lock(state.lock), file_lock(self._lock_path(organization)):
+            self._import_legacy(organization)
+            if not os.path.exists(log_file):
+                self._write_snapshot(organization, [])
+            with open(log_file, "a") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._refresh(organization)
+            if state.records >= COMPACT_MIN_RECORDS and state.records > COMPACT_RATIO * len(state.users):
+                self._compact_locked(organization, state)
+
+    def compact(self, organization):
+        """Rewrite the log keeping only the latest record per user, in the current format"""
+        state = self._state(org_key(organization))
+        with state.lock, file_lock(self._lock_path(organization)):
+            self._import_legacy(organization)
+            self._refresh(organization)
+            if state.snapshot is not None:
+                self._compact_locked(organization, state)
+
+    def _compact_locked(self, organization, state):
+        self._write_snapshot(state.organization or organization, list(state.users.values()))
+
+    def release(self, organization):
+        with self._states_lock:
+            self._states.pop(org_key(organization), None)
+
+    def get_org_data(self, organization):
+        state = self._state(org_key(organization))
+        with state.lock:
+            self._refresh(organization)
+            if state.snapshot is None:
+                return None
+            return {
+                "organization": state.organization or organization,
+                "users": list(state.users.values())
+            }
+
+    def area_stats(self, organization, theme):
+        """{area: AreaStat} from the running aggregates"""
+        state = self._state(org_key(organization))
+        with state.lock:
+            self._refresh(organization)
+            return state.aggregates.area_stats(theme)
+
+    def org_maturity(self, organization, theme):
+        """Organisation maturity from the running aggregates"""
+        state = self._state(org_key(organization))
+        with state.lock:
+            self._refresh(organization)
+            return state.aggregates.maturity(theme)
+
+    def list_organizations(self):
+        names = []
+        for entry in sorted(os.listdir(self.data_dir)):
+            if entry.endswith(".jsonl"):
+                with open(os.path.join(self.data_dir, entry)) as f:
+                    first = json.loads(f.readline() or "{}")
+                names.append(first.get("_meta", {}).get("organization", entry[:-6]))
+            elif entry.endswith(".json") and not os.path.exists(os.path.join(self.data_dir, entry + "l")):
+                with open(os.path.join(self.data_dir, entry)) as f:
+                    names.append(json.load(f).get("organization", entry[:-5]))
+        return names
+
+
+class SqliteBackend(StorageBackend):
+    """Single SQLite database (WAL mode) with one row per response.
+
+    Users are upserted by (organisation, email); their responses are stored
+    both in their record form (records.py, so `get_org_data` round-trips
+    exactly) and as indexed columns, so aggregates and cross-organisation lookups run as SQL
+    instead of loading every record into Python.  The columns keep the text
+    answered, so a response whose ids no longer match the question bank
+    is read back from them.  The `area_aggregates`
+    table is adjusted in the same transaction as each upsert.
+    """
+
+    supports_aggregates = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS organizations (
+            id INTEGER PRIMARY KEY,
+            key TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY,
+            org_id INTEGER NOT NULL REFERENCES organizations(id),
+            email TEXT NOT NULL,
+            name TEXT,
+            designation TEXT,
+            theme TEXT,
+            timestamp TEXT,
+            user_info TEXT,
+            UNIQUE (org_id, email)
+        );
+        CREATE TABLE IF NOT EXISTS responses (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            org_id INTEGER NOT NULL,
+            user_theme TEXT,
+            theme TEXT,
+            focus_area TEXT,
+            question TEXT,
+            selected_text TEXT,
+            score REAL,
+            timestamp TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS area_aggregates (
+            org_id INTEGER NOT NULL,
+            user_theme TEXT NOT NULL,
+            focus_area TEXT NOT NULL,
+            total REAL NOT NULL,
+            count INTEGER NOT NULL,
+            total_sq REAL NOT NULL,
+            PRIMARY KEY (org_id, user_theme, focus_area)
+        );
+        CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+        CREATE INDEX IF NOT EXISTS idx_users_timestamp ON users(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_responses_user ON responses(user_id);
+        CREATE INDEX IF NOT EXISTS idx_responses_org_theme ON responses(org_id, user_theme, focus_area);
+        CREATE INDEX IF NOT EXISTS idx_responses_theme ON responses(theme, focus_area);
+        CREATE INDEX IF NOT EXISTS idx_responses_timestamp ON responses(timestamp);
+    """
+
+    def __init__(self, data_dir, db_file=SQLITE_FILE):
+        super().__init__(data_dir)
+        self.db_path = os.path.join(data_dir, db_file)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.executescript(self.SCHEMA)
+        self._backfill_aggregates(conn)
+
+    def _connect(self):
+        """One connection per thread (Streamlit serves sessions on threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _backfill_aggregates(self, conn):
+        """Populate area_aggregates for databases created before it existed"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM area_aggregates LIMIT 1").fetchone() is None:
+                conn.execute(
+                    "INSERT INTO area_aggregates (org_id, user_theme, focus_area, total, count, total_sq) "
+                    "SELECT org_id, user_theme, focus_area, SUM(score), COUNT(*), SUM(score * score) "
+                    "FROM responses WHERE user_theme IS NOT NULL AND focus_area IS NOT NULL "
+                    "GROUP BY org_id, user_theme, focus_area ORDER BY MIN(id)"
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def save_user(self, organization, user_record):
+        self.save_users(organization, [user_record])
+
+    def save_users(self, organization, user_records):
+        """Upsert several users of one organisation in a single transaction"""
+        codec = get_codec()
+        user_records = [codec.user_record(user_record) for user_record in user_records]
+        conn = self._connect()
+        with span("storage_lock_wait", lock="sqlite"):
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO organizations (key, name) VALUES (?, ?) ON CONFLICT(key) DO NOTHING",
+                (org_key(organization), organization)
+            )
+            org_id = conn.execute(
+                "SELECT id FROM organizations WHERE key = ?", (org_key(organization),)
+            ).fetchone()[0]
+            for user_record in user_records:
+                self._upsert_user(conn, org_id, user_record)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _apply_aggregates(self, conn, org_id, rows, sign):
+        """Add (sign=1) or subtract (sign=-1) (user_theme, focus_area, score) rows"""
+        deltas = {}
+        for user_theme, area, score in rows:
+            if user_theme is None or area is None or score is None:
+                continue
+            stat = deltas.get((user_theme, area))
+            if stat is None:
+                stat = deltas[(user_theme, area)] = AreaStat()
+            stat.total += sign * score
+            stat.count += sign
+            stat.total_sq += sign * score * score
+        for (user_theme, area), stat in deltas.items():
+            conn.execute(
+                "INSERT INTO area_aggregates (org_id, user_theme, focus_area, total, count, total_sq) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(org_id, user_theme, focus_area) DO UPDATE SET "
+                "total = total + excluded.total, count = count + excluded.count, "
+                "total_sq = total_sq + excluded.total_sq",
+                (org_id, user_theme, area, stat.total, stat.count, stat.total_sq)
+            )
+        if sign < 0 and deltas:
+            conn.execute("DELETE FROM area_aggregates WHERE org_id = ? AND count <= 0", (org_id,))
+
+    def _upsert_user(self, conn, org_id, user_record):
+        old = conn.execute(
+            "SELECT r.user_theme, r.focus_area, r.score FROM responses r JOIN users u ON u.id = r.user_id "
+            "WHERE u.org_id = ? AND u.email = ?",
+            (org_id, user_record.email)
+        ).fetchall()
+        self._apply_aggregates(conn, org_id, old, -1)
+        # Replacing the user row cascades to the old responses
+        conn.execute("DELETE FROM users WHERE org_id = ? AND email = ?", (org_id, user_record.email))
+        user_info = user_record.user_info
+        user_id = conn.execute(
+            "INSERT INTO users (org_id, email, name, designation, theme, timestamp, user_info) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                org_id,
+                user_record.email,
+                user_record.name,
+                user_record.designation,
+                user_record.theme,
+                user_record.timestamp,
+                json.dumps(user_info) if user_info is not None else None,
+            )
+        ).lastrowid
+        theme = user_record.theme
+        codec = get_codec()
+        rows = [
+            (
+                user_id,
+                org_id,
+                theme,
+                response.theme or theme,
+                response.area,
+                response.question,
+                response.answer,
+                response.score,
+                user_record.timestamp,
+                json.dumps(codec.encode_response(response), **COMPACT_JSON),
+            )
+            for response in user_record.responses
+        ]
+        conn.executemany(
+            "INSERT INTO responses (user_id, org_id, user_theme, theme, focus_area, question, "
+            "selected_text, score, timestamp, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        self._apply_aggregates(conn, org_id, [(row[2], row[4], row[7]) for row in rows], 1)
+
+    def _org_id(self, organization):
+        row = self._connect().execute(
+            "SELECT id FROM organizations WHERE key = ?", (org_key(organization),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _users(self, where, params):
+        conn = self._connect()
+        users = conn.execute(
+            "SELECT u.id, u.email, u.name, u.designation, u.theme, u.timestamp, u.user_info, o.name "
+            f"FROM users u JOIN organizations o ON o.id = u.org_id WHERE {where} ORDER BY u.id",
+            params
+        ).fetchall()
+        if not users:
+            return []
+        codec = get_codec()
+        themes = {row[0]: row[4] for row in users}
+        responses = defaultdict(list)
+        ids = list(themes)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = conn.execute(
+                "SELECT user_id, data, theme, focus_area, question, selected_text, score FROM responses "
+                f"WHERE user_id IN ({','.join('?' * len(chunk))}) ORDER BY id",
+                chunk
+            )
+            for user_id, data, theme, area, question, answer, score in rows:
+                response = codec.decode_response(json.loads(data), themes[user_id])
+                if answer is not None and response.answer != answer:
+                    # The question bank changed since this was saved; the columns keep the original text
+                    response = codec.response_from_dict({"theme": theme, "area": area, "question": question,
+                                                         "answer": answer, "score": response.score})
+                responses[user_id].append(response)
+
+        return [
+            (org_name, UserRecord(
+                email=email,
+                name=name,
+                designation=designation,
+                theme=theme,
+                timestamp=timestamp,
+                responses=tuple(responses[user_id]),
+                user_info=json.loads(user_info) if user_info is not None else None
+            ))
+            for user_id, email, name, designation, theme, timestamp, user_info, org_name in users
+        ]
+
+    def get_org_data(self, organization):
+        org_id = self._org_id(organization)
+        if org_id is None:
+            return None
+        name = self._connect().execute("SELECT name FROM organizations WHERE id = ?", (org_id,)).fetchone()[0]
+        return {"organization": name, "users": [user for _, user in self._users("u.org_id = ?", (org_id,))]}
+
+    def compact(self, organization):
+        data = self.get_org_data(organization)
+        if data is not None:
+            self.save_users(data["organization"], data["users"])
+
+    def list_organizations(self):
+        return [row[0] for row in self._connect().execute("SELECT name FROM organizations ORDER BY key")]
+
+    def find_users(self, email=None, since=None, until=None):
+        """(organisation name, UserRecord) pairs across all organisations,
+        filtered by email and/or timestamp range"""
+        clauses, params = [], []
+        if email is not None:
+            clauses.append("u.email = ?")
+            params.append(email)
+        if since is not None:
+            clauses.append("u.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("u.timestamp < ?")
+            params.append(until)
+        return self._users(" AND ".join(clauses) or "1 = 1", params)
+
+    def area_stats(self, organization, theme):
+        """{area: AreaStat} from the maintained aggregates table"""
+        org_id = self._org_id(organization)
+        if org_id is None:
+            return {}
+        rows = self._connect().execute(
+            "SELECT focus_area, total, count, total_sq FROM area_aggregates "
+            "WHERE org_id = ? AND user_theme = ? ORDER BY rowid",
+            (org_id, theme)
+        )
+        return {area: AreaStat(total, count, total_sq) for area, total, count, total_sq in rows}
+
+    def org_maturity(self, organization, theme):
+        """Same result as app6.calculate_org_maturity, read from the aggregates table"""
+        return maturity_from_stats(self.area_stats(organization, theme))
+
+
+BACKENDS = {
+    "jsonl": JsonlLogBackend,
+    "json": JsonFileBackend,
+    "sqlite": SqliteBackend,
+}
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_storage(data_dir, kind=None):
+    """Process-wide backend instance for `data_dir` (kind defaults to $PROCUREMENT_STORAGE)"""
+    kind = kind or os.environ.get(STORAGE_ENV, DEFAULT_BACKEND)
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown storage backend {kind!r}; expected one of {', '.join(BACKENDS)}")
+    key = (kind, os.path.abspath(data_dir))
+    with _backends_lock:
+        backend = _backends.get(key)
+        if backend is None:
+            backend = _backends[key] = BACKENDS[kind](data_dir)
+        return backend
@@ -0,0 +1,51 @@
+"""Recompute the cross-organisation peer benchmarks from stored responses.
+
+    python rebuild_benchmarks.py                     # backend from $PROCUREMENT_STORAGE (default jsonl)
+    python rebuild_benchmarks.py --storage sqlite
+
+The app keeps the distributions in procurement_core/peer_benchmarks.py
+up to date as responses are saved; run this after importing or migrating
+data, after changing the question bank, or whenever the database is
+missing.  Every organisation is read once and released before the next,
+without holding the database's write lock, and the new distributions
+then replace the old ones in one short transaction, so the app can keep
+running; organisations that submit during the pass keep their new scores.
+"""
+import argparse
+import os
+import sys
+import time
+
+from procurement_core.peer_benchmarks import get_peer_benchmarks
+from procurement_core.storage import get_storage
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute the cross-organisation peer benchmarks")
+    parser.add_argument("--data-dir", default="procurement_data")
+    parser.add_argument("--storage", default=None, help="storage backend (default: $PROCUREMENT_STORAGE or jsonl)")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.data_dir):
+        print(f"No data directory at {args.data_dir}")
+        return 1
+
+    storage = get_storage(args.data_dir, args.storage)
+    benchmarks = get_peer_benchmarks(args.data_dir)
+
+    def progress(done, organization):
+        if not args.quiet:
+            print(f"[{done}] {organization}")
+
+    start = time.perf_counter()
+    count = benchmarks.rebuild(storage, progress=progress)
+    print(f"Rebuilt peer benchmarks from {count} organisation(s) in {time.perf_counter() - start:.1f}s")
+    for (theme, area), distribution in sorted(benchmarks.snapshot().items()):
+        if area == "":
+            print(f"  {theme}: {distribution.total} organisation(s), median {distribution.median}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
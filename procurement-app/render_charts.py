@@ -0,0 +1,106 @@
+"""Render every organisation's result charts to PNG/SVG files.
+
+    python render_charts.py                          # PNGs for all organisations
+    python render_charts.py --format png --format svg --workers 8
+    python render_charts.py --org "Acme Corp" --out exports/charts
+
+For each theme an organisation has responses for, writes the gauge, radar
+and per-area charts to `<out>/<org>/<theme>-<chart>.<format>` (default out:
+`<data dir>/charts`).  Organisations are spread over a process pool and
+images go through chart_images' content-addressed cache in
+`<data dir>/chart_cache`, so identical charts are drawn once across runs
+and workers.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from chart_images import FORMATS, get_renderer, org_charts
+from procurement_core import scoring
+from procurement_core.question_bank import PERFORMANCE_THEME, STP_THEME, get_catalogue
+from procurement_core.storage import get_storage, org_key
+
+CHART_CACHE_DIR = "chart_cache"
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+
+def _init_worker(data_dir, storage_kind, out_dir, formats):
+    _worker.update(
+        storage=get_storage(data_dir, storage_kind),
+        catalogue=get_catalogue(),
+        renderer=get_renderer(os.path.join(data_dir, CHART_CACHE_DIR)),
+        out_dir=out_dir,
+        formats=formats
+    )
+
+
+def slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def render_org(organization):
+    """Write one organisation's chart images; returns (organization, files written, seconds)"""
+    try:
+        start = time.perf_counter()
+        org_data = _worker["storage"].get_org_data(organization)
+        if not org_data or not org_data.get("users"):
+            return organization, 0, 0.0
+
+        target = os.path.join(_worker["out_dir"], org_key(organization))
+        os.makedirs(target, exist_ok=True)
+        written = 0
+        for theme in (STP_THEME, PERFORMANCE_THEME):
+            maturity = scoring.stored_org_maturity(_worker["storage"], org_data, theme)
+            if not maturity:
+                continue
+            industry = _worker["catalogue"].industry_standards.get(theme, {})
+            for fmt in _worker["formats"]:
+                for name, data in org_charts(_worker["renderer"], theme, maturity, industry, fmt).items():
+                    with open(os.path.join(target, f"{slug(theme)}-{name}.{fmt}"), "wb") as f:
+                        f.write(data)
+                    written += 1
+        return organization, written, time.perf_counter() - start
+    finally:
+        # A worker sees many organisations: keep only the current one in memory
+        _worker["storage"].release(organization)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render result charts to image files")
+    parser.add_argument("--data-dir", default="procurement_data")
+    parser.add_argument("--storage", default=None, help="storage backend (default: $PROCUREMENT_STORAGE or jsonl)")
+    parser.add_argument("--out", default=None, help="output directory (default: <data dir>/charts)")
+    parser.add_argument("--format", action="append", choices=FORMATS, help="image format (repeatable, default png)")
+    parser.add_argument("--org", action="append", help="only these organisations (repeatable)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.data_dir):
+        print(f"No data directory at {args.data_dir}")
+        return 1
+
+    out_dir = args.out or os.path.join(args.data_dir, "charts")
+    organizations = args.org or get_storage(args.data_dir, args.storage).list_organizations()
+    init_args = (args.data_dir, args.storage, out_dir, tuple(args.format or ["png"]))
+
+    start = time.perf_counter()
+    files = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=init_args) as pool:
+        futures = [pool.submit(render_org, organization) for organization in organizations]
+        for future in as_completed(futures):
+            organization, written, seconds = future.result()
+            files += written
+            print(f"{organization}: {written} image(s) ({seconds:.2f}s)")
+
+    print(f"Rendered {files} image(s) for {len(organizations)} organisation(s) into {out_dir} "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""Self-contained per-organisation reports (HTML or PDF).
+
+`org_report` gathers everything the results page shows for an
+organisation - maturity per theme, industry benchmarks, per-question
+response statistics, static recommendations and, when a recommendation
+pack (build_packs.py) covers them, the LLM recommendations - into a plain
+dict.  `render_html` turns it into a single HTML file with the charts
+embedded as SVG data URIs; `render_pdf` lays it out on A4 pages with
+matplotlib's PDF backend, so no extra dependency or browser is needed.
+"""
+import base64
+import html
+import io
+import textwrap
+import time
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from matplotlib.image import imread
+
+from chart_images import org_charts
+from procurement_core import recommendations, scoring
+from procurement_core.question_bank import PERFORMANCE_THEME, STP_THEME
+
+A4 = (8.27, 11.69)
+TABLE_ROWS_PER_PAGE = 32
+
+
+# -----------------------------
+# Report model
+# -----------------------------
+def question_stats(org_data):
+    """{theme: [(area, question, responses, mean score)]} for the org's users"""
+    frame = scoring.responses_frame(org_data["users"])
+    stats = {}
+    if frame.empty:
+        return stats
+    grouped = frame.groupby(["theme", "area", "question"], observed=True, sort=False)["score"].agg(["size", "mean"])
+    for (theme, area, question), row in grouped.iterrows():
+        stats.setdefault(theme, []).append((area, question, int(row["size"]), round(float(row["mean"]), 2)))
+    return stats
+
+
+def org_report(org_data, storage, catalogue, pack=None):
+    """Everything a report shows for one organisation"""
+    questions = question_stats(org_data)
+    themes = []
+    for theme in (STP_THEME, PERFORMANCE_THEME):
+        maturity = scoring.stored_org_maturity(storage, org_data, theme)
+        if not maturity:
+            continue
+        themed = recommendations.theme_pack(org_data, theme, maturity, catalogue)
+        ai = {key: recommendations.section_text(pack, theme, key, section["prompt"])
+              for key, section in themed["sections"].items()}
+        themes.append({
+            "theme": theme,
+            "maturity": maturity,
+            "industry": dict(catalogue.industry_standards.get(theme, {})),
+            "industry_average": themed["industry_average"],
+            "areas": themed["areas"],
+            "questions": questions.get(theme, []),
+            "ai": ai
+        })
+    return {
+        "organization": org_data["organization"],
+        "generated_at": time.strftime("%Y-%m-%d %H:%M"),
+        "participants": [
+            {"name": user.name or "", "designation": user.designation or "",
+             "theme": user.theme or "", "submitted": (user.timestamp or "")[:10],
+             "answers": [(r.question or "", r.answer or "", r.score) for r in user.responses]}
+            for user in org_data["users"]
+        ],
+        "designations": sorted(recommendations.org_designations(org_data)),
+        "themes": themes
+    }
+
+
+# -----------------------------
+# HTML
+# -----------------------------
+STYLE = """
+body { font-family: Helvetica, Arial, sans-serif; margin: 2em auto; max-width: 60em; color: #222; }
+h1 { margin-bottom: 0; } .meta { color: #666; margin-top: 0.2em; }
+table { border-collapse: collapse; width: 100%; margin: 0.8em 0; font-size: 0.9em; }
+th, td { border: 1px solid #ddd; padding: 4px 6px; text-align: left; vertical-align: top; }
+th { background: #f3f5f8; } td.num { text-align: right; white-space: nowrap; }
+.charts img { max-width: 49%; } .wide img { max-width: 100%; }
+.ai { background: #f7f9fc; border-left: 3px solid #1f4e9c; padding: 0.4em 0.8em; white-space: pre-wrap; }
+section { page-break-before: always; }
+"""
+
+
+def _img(data):
+    return f'<img alt="" src="data:image/svg+xml;base64,{base64.b64encode(data).decode("ascii")}">'
+
+
+def _text(value):
+    return html.escape(str(value))
+
+
+def render_html(report, renderer):
+    """Single-file HTML report; charts are inline SVG data URIs"""
+    out = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>",
+        f"<title>Procurement Maturity Report - {_text(report['organization'])}</title>",
+        f"<style>{STYLE}</style></head><body>",
+        f"<h1>{_text(report['organization'])}</h1>",
+        f"<p class='meta'>Procurement maturity report, generated {report['generated_at']} - "
+        f"{len(report['participants'])} participant(s)</p>"
+    ]
+    for themed in report["themes"]:
+        theme, maturity = themed["theme"], themed["maturity"]
+        images = org_charts(renderer, theme, maturity, themed["industry"], "svg")
+        out.append(f"<section><h2>{_text(theme)}</h2>")
+        out.append(f"<p><b>Organization's Overall Maturity:</b> {maturity['overall']:.1f}/5.0 &nbsp; "
+                   f"<b>Industry Standard Average:</b> {themed['industry_average']:.1f}/5.0</p>")
+        out.append(f"<div class='charts'>{_img(images['gauge'])}{_img(images['radar'])}</div>")
+        out.append(f"<div class='wide'>{_img(images['areas'])}</div>")
+
+        out.append("<h3>Benchmarking</h3><table><tr><th>Focus area</th><th>Your org</th>"
+                   "<th>Industry</th><th>Gap</th><th>Recommendation</th></tr>")
+        for area, row in themed["areas"].items():
+            out.append(f"<tr><td>{_text(area)}</td><td class='num'>{row['score']:.1f}</td>"
+                       f"<td class='num'>{row['industry']:.1f}</td>"
+                       f"<td class='num'>{row['score'] - row['industry']:+.1f}</td>"
+                       f"<td>{_text(row['static'])}</td></tr>")
+        out.append("</table>")
+
+        ai = themed["ai"]
+        if any(ai.values()):
+            out.append("<h3>Strategic Recommendations</h3>")
+            for key, label in [("holistic", "Strategic priorities"), ("roles", "Role-specific action items")]:
+                if ai.get(key):
+                    out.append(f"<h4>{label}</h4><div class='ai'>{_text(ai[key])}</div>")
+            for area in themed["areas"]:
+                text = ai.get(recommendations.section_id(("area", area)))
+                if text:
+                    out.append(f"<h4>{_text(area)}</h4><div class='ai'>{_text(text)}</div>")
+
+        out.append("<h3>Detailed Responses</h3><table><tr><th>Focus area</th><th>Question</th>"
+                   "<th>Responses</th><th>Average score</th></tr>")
+        for area, question, count, mean in themed["questions"]:
+            out.append(f"<tr><td>{_text(area)}</td><td>{_text(question)}</td>"
+                       f"<td class='num'>{count}</td><td class='num'>{mean:.2f}</td></tr>")
+        out.append("</table></section>")
+
+    out.append("<section><h2>Participants</h2><table><tr><th>Name</th><th>Designation</th>"
+               "<th>Theme</th><th>Submitted</th></tr>")
+    for person in report["participants"]:
+        out.append("<tr>" + "".join(f"<td>{_text(person[k])}</td>"
+                                    for k in ("name", "designation", "theme", "submitted")) + "</tr>")
+    out.append("</table>")
+    for person in report["participants"]:
+        out.append(f"<details><summary>{_text(person['name'])} - {_text(person['theme'])}</summary>"
+                   "<table><tr><th>Question</th><th>Answer</th><th>Score</th></tr>")
+        for question, answer, score in person["answers"]:
+            out.append(f"<tr><td>{_text(question)}</td><td>{_text(answer)}</td><td class='num'>{_text(score)}</td></tr>")
+        out.append("</table></details>")
+    out.append("</section></body></html>")
+    return "\n".join(out)
+
+
+# -----------------------------
+# PDF
+# -----------------------------
+def _page(title=None):
+    fig = Figure(figsize=A4)
+    if title:
+        fig.text(0.07, 0.95, title, fontsize=15, fontweight="bold")
+    return fig
+
+
+def _place_image(fig, data, rect):
+    ax = fig.add_axes(rect)
+    ax.imshow(imread(io.BytesIO(data), format="png"))
+    ax.axis("off")
+
+
+def _wrap(value, width):
+    return "\n".join(textwrap.wrap(str(value), width)) or ""
+
+
+def _table_pages(pdf, title, header, rows, widths):
+    """Add as many pages as the rows need, each with a wrapped-text table"""
+    for start in range(0, max(len(rows), 1), TABLE_ROWS_PER_PAGE):
+        fig = _page(title if start == 0 else f"{title} (continued)")
+        ax = fig.add_axes([0.07, 0.05, 0.86, 0.86])
+        ax.axis("off")
+        chunk = rows[start:start + TABLE_ROWS_PER_PAGE] or [[""] * len(header)]
+        table = ax.table(cellText=chunk, colLabels=header, colWidths=widths, loc="upper left", cellLoc="left")
+        table.auto_set_font_size(False)
+        table.set_fontsize(6.5)
+        for (row, _), cell in table.get_celld().items():
+            cell.set_height(0.028 if row else 0.022)
+        pdf.savefig(fig)
+
+
+def _text_pages(pdf, title, blocks):
+    """Headed, wrapped paragraphs flowed line by line over pages"""
+    fig, y = _page(title), 0.91
+    for heading, body in blocks:
+        if y < 0.15:
+            pdf.savefig(fig)
+            fig, y = _page(f"{title} (continued)"), 0.91
+        fig.text(0.07, y, heading, fontsize=10, fontweight="bold", va="top")
+        y -= 0.025
+        for paragraph in str(body).replace("**", "").splitlines():
+            for line in textwrap.wrap(paragraph, 125) or [""]:
+                if y < 0.05:
+                    pdf.savefig(fig)
+                    fig, y = _page(f"{title} (continued)"), 0.91
+                fig.text(0.07, y, line, fontsize=7.5, va="top")
+                y -= 0.016
+        y -= 0.015
+    pdf.savefig(fig)
+
+
+def render_pdf(report, renderer, path):
+    """Write the report as an A4 PDF at `path`"""
+    with PdfPages(path, metadata={"Title": f"Procurement Maturity Report - {report['organization']}"}) as pdf:
+        for themed in report["themes"]:
+            theme, maturity = themed["theme"], themed["maturity"]
+            images = org_charts(renderer, theme, maturity, themed["industry"], "png")
+            fig = _page(f"{report['organization']} - {theme}")
+            fig.text(0.07, 0.92, f"Overall maturity {maturity['overall']:.1f}/5.0, industry average "
+                                 f"{themed['industry_average']:.1f}/5.0 - generated {report['generated_at']}",
+                     fontsize=9, color="gray")
+            _place_image(fig, images["gauge"], [0.05, 0.64, 0.42, 0.26])
+            _place_image(fig, images["radar"], [0.5, 0.56, 0.46, 0.36])
+            _place_image(fig, images["areas"], [0.07, 0.08, 0.86, 0.44])
+            pdf.savefig(fig)
+
+            _table_pages(pdf, f"{theme}: Benchmarking",
+                         ["Focus area", "Your org", "Industry", "Gap", "Recommendation"],
+                         [[_wrap(area, 28), f"{row['score']:.1f}", f"{row['industry']:.1f}",
+                           f"{row['score'] - row['industry']:+.1f}", _wrap(row["static"], 70)]
+                          for area, row in themed["areas"].items()],
+                         [0.22, 0.08, 0.08, 0.07, 0.55])
+
+            ai = themed["ai"]
+            blocks = [(label, ai[key]) for key, label in [("holistic", "Strategic priorities"),
+                                                          ("roles", "Role-specific action items")] if ai.get(key)]
+            blocks += [(area, ai[recommendations.section_id(("area", area))]) for area in themed["areas"]
+                       if ai.get(recommendations.section_id(("area", area)))]
+            if blocks:
+                _text_pages(pdf, f"{theme}: Strategic Recommendations", blocks)
+
+            _table_pages(pdf, f"{theme}: Detailed Responses",
+                         ["Focus area", "Question", "Responses", "Average"],
+                         [[_wrap(area, 24), _wrap(question, 80), str(count), f"{mean:.2f}"]
+                          for area, question, count, mean in themed["questions"]],
+                         [0.2, 0.6, 0.1, 0.1])
+
+        _table_pages(pdf, "Participants", ["Name", "Designation", "Theme", "Submitted"],
+                     [[p["name"], p["designation"], p["theme"], p["submitted"]] for p in report["participants"]],
+                     [0.3, 0.3, 0.25, 0.15])